@@ -0,0 +1,80 @@
+"""
+Load-balanced assignment of merged expedientes to proveyentes.
+
+Every expediente weighs the escritos merged into it (optionally plus a share of
+its age in days, so old causes count for more). Expedientes are dealt heaviest
+first to whichever proveyente has the least load so far (greedy LPT with a
+min-heap of loads): sorting costs O(n log n) and each placement O(log k), for n
+expedientes and k proveyentes. Inside a listado expedientes keep their order
+in the file.
+"""
+import heapq
+from collections import Counter
+
+
+def expediente_weights(records, ages=None, age_weight=0.0):
+    """
+    Weight of each expediente of `records` (Título, Expte, ...) rows, in order of
+    first appearance: number of escritos, plus age_weight * its oldest age in days.
+    ages, when given, has one entry (days, None if unknown) per row.
+    """
+    counts = Counter(row[1] for row in records)
+    weights = [float(count) for count in counts.values()]
+    if ages is not None and age_weight:
+        oldest = {}
+        for row, age in zip(records, ages):
+            if age is not None and age == age and age > oldest.get(row[1], 0):
+                oldest[row[1]] = age
+        weights = [w + age_weight * oldest.get(expte, 0) for w, expte in zip(weights, counts)]
+    return weights
+
+
+def balance(weights, n_bins):
+    """
+    Split item positions into n_bins lists with loads as even as greedy LPT gets
+    them (max load within 4/3 of the optimum). Each list is in ascending position.
+    """
+    heap = [(0.0, b) for b in range(n_bins)]
+    bins = [[] for _ in range(n_bins)]
+    # Heaviest first; ties keep file order, and equal loads go to the lowest bin
+    for i in sorted(range(len(weights)), key=lambda i: -weights[i]):
+        load, b = heap[0]
+        bins[b].append(i)
+        heapq.heapreplace(heap, (load + weights[i], b))
+    for items in bins:
+        items.sort()
+    return bins
+
+
+def round_robin(n_items, n_bins):
+    """
+    The previous assignment: item i to bin i % n_bins.
+    """
+    return [list(range(b, n_items, n_bins)) for b in range(n_bins)]
+
+
+def load_report(weights, bins):
+    """
+    Per-proveyente load and fairness of an assignment:
+    imbalance is max / mean load (1.0 is perfect), spread is max - min,
+    cv the coefficient of variation and jain Jain's index (1.0 is perfect).
+    """
+    loads = [sum(weights[i] for i in items) for items in bins]
+    n = len(loads)
+    total = sum(loads)
+    mean = total / n if n else 0.0
+    if not total:
+        return {"loads": loads, "items": [len(b) for b in bins], "mean": mean,
+                "max": 0.0, "min": 0.0, "spread": 0.0, "imbalance": 1.0, "cv": 0.0, "jain": 1.0}
+    variance = sum((load - mean) ** 2 for load in loads) / n
+    return {
+        "loads": loads,
+        "items": [len(b) for b in bins],
+        "mean": mean,
+        "max": max(loads),
+        "min": min(loads),
+        "spread": max(loads) - min(loads),
+        "imbalance": max(loads) / mean,
+        "cv": variance ** 0.5 / mean,
+        "jain": total ** 2 / (n * sum(load * load for load in loads)),
+    }
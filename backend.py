@@ -1,75 +1,149 @@
 # from tinydb import TinyDB
+import importlib
+import json
+import logging
 import os
 import subprocess
 import sys
-import pandas as pd
+import threading
+import uuid
+from collections import OrderedDict
 import base64
-import tempfile
-from datetime import datetime, timedelta
-from openpyxl import Workbook
-from io import StringIO, BytesIO
-import webview
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
+from datetime import datetime
+from io import BytesIO
+from dataset_cache import DatasetCache, content_key
+from jobs import JobManager, JobCancelled, report
+from assignment import expediente_weights, balance, load_report
+from export_history import ExportHistory, default_history_path
+from perf import PerfRecorder
+# pandas/numpy and the modules built on them are imported inside the methods
+# that use them: ingest (openpyxl) on the first read, pdf_render (ReportLab) on
+# the first PDF. The window opens without waiting for them; see prewarm().
+
+log = logging.getLogger(__name__)
+
+# (output key, projected column) pairs for the records sent to the frontend
+RECORD_FIELDS = (
+    ('expte', 'expte'),
+    ('titulo', 'titulo'),
+    ('tipo', 'tipo'),
+    ('tipo_class', 'tipo_class'),
+    ('presentante', 'presentante'),
+    ('fecha', 'fecha'),
+)
+# Columns with a hash index (value -> row positions) for drill-down lookups;
+# 'Recibido' is indexed by day label (dd/mm/YYYY)
+INDEXED_COLUMNS = ('Recibido', 'Título', 'Expte')
+# Text columns kept dictionary-encoded (category dtype) in self.data
+CATEGORY_COLUMNS = ('Expte', 'Título', 'Tipo', 'Apellido', 'Archivo')
+RECORDS_CACHE_SIZE = 256
+RECORDS_PAGE_SIZE = 5000
+# sort_by values accepted by get_all_records -> column they order by
+SORT_COLUMNS = {'recibido': 'Recibido', 'expte': 'Expte', 'titulo': 'Título'}
+# File name prefix of each PDF export mode
+PDF_PREFIXES = {'repartidas': 'proveyentes', 'continuas': 'proveyentes_continuo'}
+# What the first read needs, imported by prewarm() (ReportLab waits for the first PDF)
+PREWARM_MODULES = ('numpy', 'pandas', 'ingest', 'summary', 'search_index', 'delta', 'listados', 'batch_ingest')
+# Record shape of the pages streamed to the dashboard (get_records_page)
+RAW_RECORD_FIELDS = (
+    ('expte', 'expte'),
+    ('titulo', 'titulo'),
+    ('tipo', 'tipo'),
+    ('presentante', 'presentante'),
+    ('fecha', 'fecha_or_na'),
+    ('recibido', 'recibido'),
+)
 
 class Api:
     def __init__(self):
         self.data = None
         self.last_split_index = 0
         self.last_assigned_date = None
-        self.raw_records = []  # Store processed records for quick access
+        self.export_version = 0  # Bumped by every committed export (cursor and assigned rows)
+        self.dataset_id = None  # Handle of the loaded dataset, changes on every load
+        self._indexes = {}  # column -> {value: row positions}
+        self._records_cache = OrderedDict()  # (dataset_id, column, value) -> serialized records
+        self._cache_lock = threading.Lock()  # Guards _records_cache, shared by the server's threads
+        self._search_index = None
+        self._sort_orders = {}  # (sort_by, descending) -> (permutation, rank of each row)
+        self.date_parse_stats = {}  # Recibido values parsed per date format
+        self.dataset_cache = DatasetCache()  # Parsed files by content hash; None disables it
+        self.jobs = JobManager(notify=self._push_job_update)  # Background reads and exports
+        self._lock = threading.RLock()  # Guards the loaded dataset and the split cursor; held briefly
+        self._export_lock = threading.Lock()  # One cursor-moving PDF export at a time, held while it renders
+        self._listados = None  # ((dataset_id, day), listados table) of the last export
+        self.pdf_workers = None  # Processes for large PDF exports; None = pdf_render.default_workers()
+        self.ingest_workers = None  # Processes for multi-file loads; None = batch_ingest.default_workers()
+        self.export_history = ExportHistory()  # Past exports, to resume across restarts; None disables it
+        self.file_key = None  # Content hash of the loaded file
+        self._row_keys = None  # Key per row recorded in the export history, see delta.row_keys
+        self._assigned = None  # Rows already assigned by this or an earlier export
+        self.incremental_load = True  # Apply a newer export of the same backlog as a delta
+        self._delta_keys = None  # Unique key per row of self.data, see delta.row_keys
+        self._summary_counts = None  # SummaryCounts of self.data
+        self.age_weight = 0.0  # Extra load per day of age of an expediente when assigning proveyentes
+        self.perf = PerfRecorder()  # Stage timings for get_perf_stats; perf.enabled = False turns them off
+
+    def prewarm(self):
+        """
+        Import the read pipeline ahead of the first file; main.py runs this in a
+        background thread once the window is up. A read started meanwhile just
+        waits for the import in progress.
+        """
+        with self.perf.stage('prewarm'):
+            for name in PREWARM_MODULES:
+                importlib.import_module(name)
 
     def _parse_recibido_column(self, df):
-        # Try robust parsing with dayfirst and fallback formats
+        from ingest import parse_dates
+        # Dominant format inferred from a sample, per-format fallback only on the rest
         if 'Recibido' not in df.columns:
             return df
-        parsed = pd.to_datetime(df['Recibido'], dayfirst=True, errors='coerce')
-        # Try some common explicit formats for any NaT
-        if parsed.isna().any():
-            def try_formats(val):
-                if pd.isna(val):
-                    return pd.NaT
-                for fmt in ("%d/%m/%Y", "%d/%m/%y", "%Y-%m-%d", "%m/%d/%Y"):
-                    try:
-                        return datetime.strptime(str(val), fmt)
-                    except Exception:
-                        continue
-                try:
-                    return pd.to_datetime(val, dayfirst=True, errors='coerce')
-                except:
-                    return pd.NaT
-            parsed = df['Recibido'].apply(try_formats)
-        df['Recibido'] = pd.to_datetime(parsed)
+        with self.perf.stage('date_parse', len(df)):
+            df['Recibido'], self.date_parse_stats = parse_dates(df['Recibido'])
+        if self.date_parse_stats.get('sin fecha'):
+            log.warning("%s fechas de Recibido no se pudieron interpretar", self.date_parse_stats['sin fecha'])
         return df
 
     def read_data(self, file_path):
         # If no file_path, open file dialog
-        if not file_path:
-            file_types = ["Archivos Excel (*.xlsx)"]
-            file_path = webview.windows[0].create_file_dialog(
-                webview.OPEN_DIALOG, allow_multiple=False, file_types=file_types
-            )
-            if isinstance(file_path, (tuple, list)):
-                file_path = file_path[0] if file_path else None
+        response, work = self._task('read_data', {'file_path': file_path})
+        return response if work is None else work(None)
 
-        if file_path:
-            # Read Excel directly and skip first 8 rows if needed. Use engine to be explicit.
-            try:
-                df = pd.read_excel(file_path, skiprows=8, engine='openpyxl')
-            except Exception:
-                # fallback to simple read
-                df = pd.read_excel(file_path, engine='openpyxl')
+    def _load_file(self, file_path, job=None):
+        return self._process_dataframe(self._read_forum(file_path, job=job), parsed=True, job=job)
 
-            return self._process_dataframe(df)
-        else:
-            return {"status": "no_file", "message": "No se ha seleccionado ningún archivo."}
+    def read_data_batch(self, paths=None):
+        """
+        Load several Forum exports (files or directories of .xlsx) as one dataset.
+        Without paths, a file dialog with multiple selection is shown.
+        """
+        response, work = self._task('read_data_batch', {'paths': paths})
+        return response if work is None else work(None)
+
+    def _load_files(self, paths, job=None):
+        from batch_ingest import read_workbooks
+        report(job, 0.0, f"Leyendo {len(paths)} archivos...")
+        with self.perf.stage('batch_read') as stage:
+            df, self.date_parse_stats, key, info = read_workbooks(
+                paths, self.ingest_workers, self.dataset_cache,
+                lambda done, total: report(job, 0.6 * done / total, f"Leyendo archivos... {done}/{total}"),
+            )
+            stage.rows = len(df)
+        df.attrs['file_key'] = key
+        result = self._process_dataframe(df, parsed=True, job=job)
+        if result.get("status") == "ok":
+            result.update(info)
+        return result
 
     def read_file_from_memory(self, filename, base64_content):
         """
         Read an Excel file from base64 content (for drag and drop)
         """
+        response, work = self._task('read_file_from_memory', {'filename': filename, 'content': base64_content})
+        return response if work is None else work(None)
+
+    def _load_memory(self, base64_content, job=None):
         try:
             # Decode base64 content
             file_content = base64.b64decode(base64_content)
@@ -78,105 +152,356 @@ class Api:
             file_bytes = BytesIO(file_content)
             
             # Read Excel from bytes
-            try:
-                df = pd.read_excel(file_bytes, skiprows=8, engine='openpyxl')
-            except Exception:
-                file_bytes.seek(0)  # Reset to beginning
-                df = pd.read_excel(file_bytes, engine='openpyxl')
-            
-            return self._process_dataframe(df)
+            return self._process_dataframe(self._read_forum(file_bytes, file_content, job), parsed=True, job=job)
             
+        except JobCancelled:
+            raise
         except Exception as e:
-            print(f"Error reading file from memory: {e}")
+            log.error("Error reading file from memory: %s", e)
             return {"status": "error", "message": f"Error al leer el archivo: {e}"}
 
-    def _process_dataframe(self, df):
+    def _read_forum(self, source, content=None, job=None):
         """
-        Common DataFrame processing logic used by both read_data and read_file_from_memory
+        Parsed frame (Recibido already as datetime) of a Forum workbook, served
+        from the on-disk cache when the same file was parsed before.
+        `content` are the file bytes when source is an in-memory buffer.
         """
+        from ingest import iter_forum_batches, frame_from_batches
+        report(job, 0.0, "Leyendo el archivo...")
+        key = None
+        if self.dataset_cache is not None or self.export_history is not None:
+            try:
+                key = content_key(content if content is not None else source)
+            except Exception as e:
+                log.warning("could not hash file: %s", e)
+        use_cache = key is not None and self.dataset_cache is not None
+        if use_cache:
+            try:
+                with self.perf.stage('cache_load') as stage:
+                    cached = self.dataset_cache.load(key)
+                    stage.rows = len(cached[0]) if cached is not None else 0
+                if cached is not None:
+                    df, extra = cached
+                    self.date_parse_stats = extra.get('date_formats', {})
+                    df.attrs['file_key'] = key
+                    return df
+            except Exception as e:
+                log.warning("dataset cache unavailable: %s", e)
+                use_cache = False
+
+        # Stream the sheet; the 8-row Forum preamble is detected in the same pass
+        with self.perf.stage('excel_read') as stage:
+            df = frame_from_batches(self._track_batches(iter_forum_batches(source), job))
+            stage.rows = len(df)
+        report(job, 0.6, "Interpretando fechas...")
         df = self._parse_recibido_column(df)
-        self.data = df.copy()
-
-        # Store raw records for quick access in detail views
-        self._store_raw_records()
-
-        # Basic aggregations
-        total_records = len(self.data)
-        presentaciones_count = len(self.data[self.data['Tipo'].str.contains('escrito', case=False, na=False)])
-        proyectos_count = len(self.data[self.data['Tipo'].str.contains('proyecto', case=False, na=False)])
-        oldest_record = self.data['Recibido'].min()
-        oldest_record_formatted = oldest_record.strftime("%d/%m/%Y") if pd.notna(oldest_record) else ""
-        newest_record = self.data['Recibido'].max()
-        unique_exptes_count = self.data['Expte'].nunique()
-        transferencias_count = len(self.data[self.data['Título'].str.contains('transferencia', case=False, na=False)])
-        today_date = datetime.now()
-        days_difference = (today_date - oldest_record).days if pd.notna(oldest_record) else 0
-        today_formatted = today_date.strftime("%d/%m/%Y")
-        
-        # Top titles
-        most_titles_series = self.data['Título'].value_counts().head(10)
-        most_titles = [{"Título": str(k), "Cantidad": int(v)} for k, v in most_titles_series.items()]
-
-        # Presentaciones por Fecha (group by Recibido date)
-        self.data['Recibido_date_str'] = self.data['Recibido'].dt.strftime('%d/%m/%Y')
-        grouped = self.data.groupby('Recibido_date_str')
-        presentaciones_by_date = []
-        for date_str, grp in grouped:
-            escritos = int(grp['Tipo'].str.contains('escrito', case=False, na=False).sum())
-            proyectos = int(grp['Tipo'].str.contains('proyecto', case=False, na=False).sum())
-            total = len(grp)
-            presentaciones_by_date.append({
-                "Fecha": str(date_str), 
-                "Escritos": escritos, 
-                "Proyectos": proyectos, 
-                "Total": int(total)
-            })
-
-        # Compose period
-        period = f"{oldest_record_formatted} a {today_formatted}" if oldest_record_formatted else ""
-
-        # Return structured dict with raw records included
+        if use_cache:
+            try:
+                self.dataset_cache.store(key, df, {'date_formats': self.date_parse_stats})
+            except Exception as e:
+                log.warning("could not cache dataset: %s", e)
+        df.attrs['file_key'] = key
+        return df
+
+    @staticmethod
+    def _track_batches(batches, job):
+        # Report the rows read so far; the total is unknown until the sheet ends
+        rows = 0
+        for batch in batches:
+            yield batch
+            rows += len(next(iter(batch.values()), ()))
+            report(job, message=f"Leyendo el archivo... {rows} filas")
+
+    def _process_dataframe(self, df, parsed=False, job=None):
+        """
+        Common DataFrame processing logic used by both read_data and read_file_from_memory.
+        Accepts a DataFrame or the column batches yielded by iter_forum_batches;
+        parsed=True when Recibido was already parsed (see _read_forum).
+        """
+        import pandas as pd
+        from delta import row_keys
+        from ingest import frame_from_batches
+        from summary import SummaryCounts
+        if not isinstance(df, pd.DataFrame):
+            df = frame_from_batches(df)
+        if not parsed:
+            df = self._parse_recibido_column(df)
+        with self.perf.stage('compact', len(df)):
+            data = self._compact(df)
+
+        # Totals, per-day table and top titles in one aggregation stage,
+        # or only the rows that changed since the previous export
+        report(job, 0.75, "Calculando resumen...")
+        with self.perf.stage('aggregate', len(data)):
+            keys = row_keys(data)
+            delta = self._load_delta(data, keys) if self.incremental_load else None
+            if delta is None:
+                counts = SummaryCounts.from_frame(data)
+            else:
+                counts, delta = delta
+            summary = counts.summary(data['Recibido'])
+
+        file_key = df.attrs.get('file_key')
+        assigned, cursor = self._restore_cursor(data, file_key, keys)
+
+        # The indexes are rebuilt over the whole frame, also after a delta:
+        # only the summary and the records sent to the frontend are incremental
+        report(job, 0.85, "Indexando registros...")
+        with self._lock, self.perf.stage('index', len(data)):
+            self.data = data
+            self._build_indexes()
+            self.dataset_id = uuid.uuid4().hex
+            self.file_key = file_key
+            self._delta_keys = keys
+            self._summary_counts = counts
+            self._row_keys = keys if assigned is not None else None
+            self._assigned = assigned
+            self.last_split_index = cursor['last_index']
+            self.last_assigned_date = cursor.pop('date')
+
+        # Summary only: the records are fetched page by page with get_records_page
         return {
             "status": "ok",
-            "total_records": int(total_records),
-            "unique_exptes_count": int(unique_exptes_count),
-            "presentaciones_count": int(presentaciones_count),
-            "proyectos_count": int(proyectos_count),
-            "oldest_record": str(oldest_record_formatted),
-            "days_difference": int(days_difference),
-            "today_date": str(today_formatted),
-            "transferencias_count": int(transferencias_count),
-            "most_titles": most_titles,
-            "presentaciones_by_date": presentaciones_by_date,
-            "period": str(period),
-            "raw_records": self.raw_records  # Include raw records for detailed views
+            **summary,
+            "date_formats": self.date_parse_stats,
+            "dataset_id": self.dataset_id,
+            "page_size": RECORDS_PAGE_SIZE,
+            "cursor": cursor,
+            "delta": delta
         }
 
-    def _store_raw_records(self):
+    def _load_delta(self, data, keys):
         """
-        Store raw records in a format ready for API responses
+        Apply a newly read frame as the rows added to and removed from the
+        loaded one. Returns (updated SummaryCounts, delta for the frontend), or
+        None when there is no previous dataset or the files overlap too little.
+        The delta lists the removed positions of the previous dataset and the
+        added records with their position in the new one.
         """
-        self.raw_records = []
-        for _, row in self.data.iterrows():
-            # Convert Timestamp to string if present
-            recibido_val = row.get('Recibido')
-            if pd.notna(recibido_val):
-                if isinstance(recibido_val, pd.Timestamp):
-                    recibido_str = recibido_val.strftime('%Y-%m-%d %H:%M:%S')
+        from delta import diff_rows
+        with self._lock:
+            previous, previous_keys = self.data, self._delta_keys
+            previous_counts, previous_id = self._summary_counts, self.dataset_id
+        if previous is None or previous_keys is None or previous_counts is None:
+            return None
+        plan = diff_rows(previous_keys, keys)
+        if plan is None:
+            return None
+        removed, added = plan
+        counts = previous_counts.copy()
+        counts.add(previous.iloc[removed], -1)
+        counts.add(data.iloc[added])
+        records = self._project_records(data.iloc[added], RAW_RECORD_FIELDS)
+        log.info("Incremental load: %d rows removed, %d added", len(removed), len(added))
+        return counts, {
+            "base_dataset_id": previous_id,
+            "removed": removed.tolist(),
+            "added": [[int(position), record] for position, record in zip(added, records)],
+        }
+
+    @staticmethod
+    def _compact(df):
+        """
+        Copy of df with the repetitive text columns as categories: one code per
+        row plus each distinct value once. Recibido stays datetime64; day
+        labels are formatted when records are serialized.
+        """
+        data = df.copy()
+        for col in CATEGORY_COLUMNS:
+            if col in data.columns and data[col].dtype == object:
+                data[col] = data[col].astype('category')
+        return data
+
+    def _restore_cursor(self, data, file_key, keys):
+        """
+        Where exports of a newly loaded frame resume: after the last run of the
+        same file, skipping escritos that an earlier (overlapping) file already
+        assigned. keys are the row_keys of data. Returns (assigned mask, cursor info).
+        """
+        from listados import last_date
+        cursor = {"last_index": 0, "date": None, "last_assigned_date": None, "assigned": 0}
+        if self.export_history is None:
+            return None, cursor
+        try:
+            assigned = self.export_history.assigned_mask(keys)
+            run = self.export_history.last_run(file_key) if file_key else None
+        except Exception as e:
+            log.warning("export history unavailable: %s", e)
+            return None, cursor
+        if run is not None:
+            cursor["last_index"] = min(run["end"], len(data))
+            cursor["date"] = run["last_date"]
+        elif assigned.any():
+            cursor["date"] = last_date(data.loc[assigned, ['Recibido']])
+        if cursor["date"] is not None:
+            cursor["last_assigned_date"] = cursor["date"].strftime('%d/%m/%Y')
+        cursor["assigned"] = int(assigned.sum())
+        return assigned, cursor
+
+    def _commit_export(self, dataset_id, mode, start, end, positions, n_proveyentes, last_assigned_date):
+        """
+        Move the split cursor to `end` once an export is rendered and record its
+        rows, unless another file was loaded meanwhile (positions refer to the
+        dataset the rows were picked from). Returns whether it was committed.
+        """
+        with self._lock:
+            if self.dataset_id != dataset_id:
+                log.warning("Dataset changed during the %s export: split cursor not moved", mode)
+                return False
+            self.last_split_index = end
+            self.last_assigned_date = last_assigned_date
+            self._record_export(mode, start, end, positions, n_proveyentes)
+            self.export_version += 1
+            return True
+
+    def _record_export(self, mode, start, end, positions, n_proveyentes):
+        # Mark the exported rows as assigned, here and in the persistent history
+        if self._assigned is not None:
+            self._assigned[positions] = True
+        if self.export_history is None or self.file_key is None or self._row_keys is None:
+            return
+        try:
+            self.export_history.record_run(self.file_key, mode, start, end, n_proveyentes,
+                                           self.last_assigned_date, self._row_keys[positions])
+        except Exception as e:
+            log.warning("could not record export: %s", e)
+
+    # ============================================================================
+    # RECORD PROJECTION - columnar serialization shared by every records method
+    # ============================================================================
+
+    def _record_columns(self, df, fields):
+        """
+        Compute each requested record field as a whole column (list of Python values).
+        Keeps the exact str() conversions the old row-by-row code produced.
+        """
+        import pandas as pd
+        from summary import format_days
+        n = len(df)
+
+        def text(col):
+            if col in df.columns:
+                return df[col].astype(str)
+            return pd.Series(['N/A'] * n, index=df.index, dtype=object)
+
+        columns = {}
+        tipo = None
+        for field in fields:
+            if field == 'expte':
+                columns[field] = text('Expte').tolist()
+            elif field == 'titulo':
+                columns[field] = text('Título').tolist()
+            elif field in ('tipo', 'tipo_class'):
+                if tipo is None:
+                    tipo = text('Tipo')
+                if field == 'tipo':
+                    columns[field] = tipo.tolist()
                 else:
-                    recibido_str = str(recibido_val)
-            else:
-                recibido_str = None
-                
-            record = {
-                "expte": str(row.get('Expte', 'N/A')),
-                "titulo": str(row.get('Título', 'N/A')),
-                "tipo": str(row.get('Tipo', 'N/A')),
-                "presentante": str(row.get('Apellido', 'N/A')),
-                "fecha": str(row.get('Recibido_date_str', 'N/A')) if 'Recibido_date_str' in row and pd.notna(row.get('Recibido_date_str')) else 'N/A',
-                "recibido": recibido_str
+                    is_escrito = (tipo != 'N/A') & tipo.str.lower().str.contains('escrito', regex=False)
+                    columns[field] = ['escrito' if e else 'proyecto' for e in is_escrito.tolist()]
+            elif field == 'presentante':
+                columns[field] = text('Apellido').tolist()
+            elif field in ('fecha', 'fecha_or_na'):
+                if 'Recibido' not in df.columns:
+                    columns[field] = ['N/A'] * n
+                    continue
+                # Day labels of the slice, formatted once per distinct day
+                fechas = format_days(df['Recibido'])
+                if field == 'fecha':
+                    columns[field] = fechas.astype(str).tolist()
+                else:
+                    # Page records report missing dates as 'N/A' instead of 'nan'
+                    columns[field] = fechas.astype(str).where(fechas.notna(), 'N/A').tolist()
+            elif field == 'recibido':
+                if 'Recibido' not in df.columns:
+                    columns[field] = [None] * n
+                    continue
+                recibido = df['Recibido']
+                if pd.api.types.is_datetime64_any_dtype(recibido):
+                    as_text = recibido.dt.strftime('%Y-%m-%d %H:%M:%S')
+                else:
+                    as_text = recibido.map(
+                        lambda v: v.strftime('%Y-%m-%d %H:%M:%S') if isinstance(v, pd.Timestamp) else str(v)
+                    )
+                columns[field] = as_text.astype(object).where(recibido.notna(), None).tolist()
+        return columns
+
+    def _project_records(self, df, fields=RECORD_FIELDS):
+        """
+        Build the JSON-ready list of record dicts for df in bulk.
+        `fields` maps output keys to the columns computed by _record_columns.
+        """
+        with self.perf.stage('records', len(df)):
+            keys = [key for key, _ in fields]
+            columns = self._record_columns(df, [field for _, field in fields])
+            return [dict(zip(keys, values)) for values in zip(*(columns[field] for _, field in fields))]
+
+    # ============================================================================
+    # SECONDARY INDEXES - rebuilt on every load by _process_dataframe
+    # ============================================================================
+
+    def _build_indexes(self):
+        """
+        Map each value of the INDEXED_COLUMNS to its row positions in self.data,
+        and drop the records cached for the previous dataset. Values are keyed
+        as the records show them (str), so 12345 and '12345' find the same rows.
+        """
+        import numpy as np
+        import pandas as pd
+        from search_index import SearchIndex
+        self._indexes = {}
+        for col in INDEXED_COLUMNS:
+            if col not in self.data.columns or col == 'Recibido':
+                continue
+            codes, uniques = pd.factorize(self.data[col], sort=False)
+            # Distinct values with the same text (12345 and '12345') share one label
+            label_codes, labels = pd.factorize(np.array([str(v) for v in uniques], dtype=object), sort=False)
+            row_labels = np.append(label_codes, -1)[codes]  # missing values (-1) are not indexed
+            positions = pd.Series(row_labels).groupby(row_labels, sort=False).indices
+            self._indexes[col] = {labels[code]: rows for code, rows in positions.items() if code >= 0}
+        if 'Recibido' in self.data.columns:
+            codes, days = pd.factorize(self.data['Recibido'].dt.normalize(), sort=False)
+            positions = pd.Series(codes).groupby(codes, sort=False).indices
+            self._indexes['Recibido'] = {
+                label: positions[code] for code, label in enumerate(days.strftime('%d/%m/%Y'))
             }
-            self.raw_records.append(record)
+        with self._cache_lock:
+            self._records_cache.clear()
+        self._sort_orders = {}
+        self._search_index = SearchIndex(self.data)
+
+    def _snapshot(self):
+        """
+        (dataset_id, data, indexes, search index, sort orders) of the loaded
+        dataset, read together so a load finishing meanwhile cannot mix two datasets.
+        """
+        with self._lock:
+            return self.dataset_id, self.data, self._indexes, self._search_index, self._sort_orders
+
+    def _lookup_records(self, column, value):
+        """
+        Serialized records whose `column` equals `value`, served from the index
+        and kept in a small LRU cache for repeated drill-downs.
+        """
+        value = str(value)  # as _project_records shows it, see _build_indexes
+        dataset_id, data, indexes, _, _ = self._snapshot()
+        key = (dataset_id, column, value)
+        with self._cache_lock:
+            if key in self._records_cache:
+                self._records_cache.move_to_end(key)
+                return self._records_cache[key]
+        if column not in indexes:
+            raise KeyError(column)
+        positions = indexes[column].get(value)
+        if positions is None:
+            records = []
+        else:
+            records = self._project_records(data.iloc[positions])
+        with self._cache_lock:
+            self._records_cache[key] = records
+            while len(self._records_cache) > RECORDS_CACHE_SIZE:
+                self._records_cache.popitem(last=False)
+        return records
 
     # ============================================================================
     # METHODS FOR DETAILED RECORD RETRIEVAL
@@ -190,24 +515,7 @@ class Api:
             return {"status": "error", "message": "No hay datos cargados", "records": []}
         
         try:
-            # Filter records for the given date
-            filtered = self.data[self.data['Recibido_date_str'] == date_str]
-            
-            records = []
-            for _, row in filtered.iterrows():
-                # Determine record type for badge styling
-                tipo = str(row.get('Tipo', 'N/A'))
-                is_escrito = 'escrito' in tipo.lower() if tipo != 'N/A' else False
-                
-                record = {
-                    "expte": str(row.get('Expte', 'N/A')),
-                    "titulo": str(row.get('Título', 'N/A')),
-                    "tipo": tipo,
-                    "tipo_class": "escrito" if is_escrito else "proyecto",
-                    "presentante": str(row.get('Apellido', 'N/A')),
-                    "fecha": str(row.get('Recibido_date_str', 'N/A'))
-                }
-                records.append(record)
+            records = self._lookup_records('Recibido', date_str)
             
             return {
                 "status": "ok",
@@ -215,9 +523,7 @@ class Api:
                 "count": len(records)
             }
         except Exception as e:
-            print(f"Error getting records by date: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error getting records by date: %s", e)
             return {"status": "error", "message": str(e), "records": []}
 
     def get_records_by_title(self, title):
@@ -228,25 +534,8 @@ class Api:
             return {"status": "error", "message": "No hay datos cargados", "records": []}
         
         try:
-            # Filter records with matching title (exact match for the title in most_titles)
-            # This handles the exact titles from the most_titles list
-            filtered = self.data[self.data['Título'] == title]
-            
-            records = []
-            for _, row in filtered.iterrows():
-                # Determine record type for badge styling
-                tipo = str(row.get('Tipo', 'N/A'))
-                is_escrito = 'escrito' in tipo.lower() if tipo != 'N/A' else False
-                
-                record = {
-                    "expte": str(row.get('Expte', 'N/A')),
-                    "titulo": str(row.get('Título', 'N/A')),
-                    "tipo": tipo,
-                    "tipo_class": "escrito" if is_escrito else "proyecto",
-                    "presentante": str(row.get('Apellido', 'N/A')),
-                    "fecha": str(row.get('Recibido_date_str', 'N/A'))
-                }
-                records.append(record)
+            # Exact match for the titles in the most_titles list
+            records = self._lookup_records('Título', title)
             
             return {
                 "status": "ok",
@@ -254,345 +543,389 @@ class Api:
                 "count": len(records)
             }
         except Exception as e:
-            print(f"Error getting records by title: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error getting records by title: %s", e)
             return {"status": "error", "message": str(e), "records": []}
 
-    def search_records(self, query, field=None):
+    def get_records_by_expte(self, expte):
         """
-        Search records across multiple fields or a specific field
+        Get all records of a specific expediente
         """
         if self.data is None:
             return {"status": "error", "message": "No hay datos cargados", "records": []}
         
         try:
-            if field and field in self.data.columns:
-                # Search in specific field
-                mask = self.data[field].astype(str).str.contains(query, case=False, na=False)
+            records = self._lookup_records('Expte', expte)
+            
+            return {
+                "status": "ok",
+                "records": records,
+                "count": len(records)
+            }
+        except Exception as e:
+            log.error("Error getting records by expte: %s", e)
+            return {"status": "error", "message": str(e), "records": []}
+
+    def search_records(self, query, field=None, limit=None, offset=0):
+        """
+        Search records across multiple fields or a specific field.
+        Accent-insensitive, word-prefix matching through the search index;
+        results are ranked and can be paged with limit/offset.
+        """
+        from search_index import SEARCH_FIELDS
+        _, data, _, search_index, _ = self._snapshot()
+        if data is None:
+            return {"status": "error", "message": "No hay datos cargados", "records": []}
+        
+        try:
+            query = '' if query is None else str(query)
+            indexed = [col for col, _ in SEARCH_FIELDS]
+            if field and field in data.columns and field not in indexed:
+                # Column without index: plain literal substring scan
+                mask = data[field].astype(str).str.contains(query, case=False, na=False, regex=False)
+                positions = mask.to_numpy().nonzero()[0]
+                total = len(positions)
+                start = max(offset or 0, 0)
+                positions = positions[start:start + limit if limit else None]
             else:
-                # Search across multiple fields
-                mask = (
-                    self.data['Expte'].astype(str).str.contains(query, case=False, na=False) |
-                    self.data['Título'].astype(str).str.contains(query, case=False, na=False) |
-                    self.data['Apellido'].astype(str).str.contains(query, case=False, na=False) |
-                    self.data['Tipo'].astype(str).str.contains(query, case=False, na=False)
-                )
+                columns = [field] if field in indexed else None
+                positions, total = search_index.search(query, columns, limit=limit, offset=offset)
+            records = self._project_records(data.iloc[positions])
+            
+            return {
+                "status": "ok",
+                "records": records,
+                "total": int(total),
+                "count": len(records)
+            }
+        except Exception as e:
+            log.error("Error searching records: %s", e)
+            return {"status": "error", "message": str(e), "records": []}
+
+    # ============================================================================
+    # SORTED PAGINATION - permutations computed once per load and sort order
+    # ============================================================================
+
+    @staticmethod
+    def _sort_key(data, sort_by):
+        """
+        Integer key per row of data for sort_by plus a mask of rows without a
+        value (always listed last). Expedientes sort by year and then number.
+        """
+        import numpy as np
+        import pandas as pd
+        from search_index import normalize
+        column = data[SORT_COLUMNS[sort_by]]
+        if sort_by == 'recibido':
+            missing = column.isna().to_numpy()
+            return column.to_numpy(dtype='datetime64[ns]').view(np.int64), missing
+
+        codes, uniques = pd.factorize(column, sort=False)
+        if sort_by == 'expte':
+            def order(value):
+                number, _, year = str(value).partition('/')
+                if number.strip().isdigit() and year.strip().isdigit():
+                    return (0, int(year), int(number), '')
+                return (1, 0, 0, normalize(value))
+        else:
+            order = normalize
+        ranks = np.empty(len(uniques), dtype=np.int64)
+        ranks[sorted(range(len(uniques)), key=lambda i: order(uniques[i]))] = np.arange(len(uniques))
+        return np.append(ranks, 0)[codes], codes < 0
+
+    def _sort_order(self, data, sort_orders, sort_by, descending=False):
+        """
+        (permutation, rank) of data for a sort order, cached in sort_orders
+        (the dict of that dataset, see _snapshot); ties keep file order.
+        """
+        import numpy as np
+        cache_key = (sort_by, bool(descending))
+        if cache_key not in sort_orders:
+            key, missing = self._sort_key(data, sort_by)
+            permutation = np.lexsort((-key if descending else key, missing))
+            rank = np.empty_like(permutation)
+            rank[permutation] = np.arange(len(permutation))
+            sort_orders[cache_key] = (permutation, rank)
+        return sort_orders[cache_key]
+
+    def get_all_records(self, limit=None, offset=0, sort_by=None, descending=False, cursor=None):
+        """
+        Get all records with pagination.
+        sort_by: None (file order), 'recibido', 'expte' or 'titulo'.
+        cursor: the next_cursor of the previous page (keyset); takes precedence over offset.
+        Any page costs O(limit) once the sort permutation exists.
+        """
+        _, data, _, _, sort_orders = self._snapshot()
+        if data is None:
+            return {"status": "error", "message": "No hay datos cargados", "records": []}
+        
+        try:
+            if sort_by is not None and sort_by not in SORT_COLUMNS:
+                return {"status": "error", "message": f"Orden no válido: {sort_by}", "records": []}
+            permutation, rank = self._sort_order(data, sort_orders, sort_by, descending) if sort_by else (None, None)
             
-            filtered = self.data[mask]
+            if cursor is not None:
+                # The cursor is the row position of the last record already sent
+                start = int(rank[cursor]) + 1 if rank is not None else int(cursor) + 1
+            else:
+                start = max(offset or 0, 0)
+            stop = min(start + limit, len(data)) if limit else len(data)
+            positions = permutation[start:stop] if permutation is not None else slice(start, stop)
+            records = self._project_records(data.iloc[positions])
             
-            records = []
-            for _, row in filtered.iterrows():
-                tipo = str(row.get('Tipo', 'N/A'))
-                is_escrito = 'escrito' in tipo.lower() if tipo != 'N/A' else False
-                
-                record = {
-                    "expte": str(row.get('Expte', 'N/A')),
-                    "titulo": str(row.get('Título', 'N/A')),
-                    "tipo": tipo,
-                    "tipo_class": "escrito" if is_escrito else "proyecto",
-                    "presentante": str(row.get('Apellido', 'N/A')),
-                    "fecha": str(row.get('Recibido_date_str', 'N/A'))
-                }
-                records.append(record)
+            if stop > start and stop < len(data):
+                next_cursor = int(permutation[stop - 1]) if permutation is not None else stop - 1
+            else:
+                next_cursor = None
             
             return {
                 "status": "ok",
                 "records": records,
-                "count": len(records)
+                "total": len(data),
+                "count": len(records),
+                "offset": start,
+                "next_cursor": next_cursor
             }
         except Exception as e:
-            print(f"Error searching records: {e}")
+            log.error("Error getting all records: %s", e)
             return {"status": "error", "message": str(e), "records": []}
 
-    def get_all_records(self, limit=None, offset=0):
+    def get_records_page(self, dataset_id, offset=0, limit=RECORDS_PAGE_SIZE):
         """
-        Get all records with pagination
+        Cursor over the loaded records for incremental loading in the dashboard.
+        Returns the page at `offset` and the offset of the next one (None at the end).
         """
-        if self.data is None:
+        current_id, data, _, _, _ = self._snapshot()
+        if data is None:
             return {"status": "error", "message": "No hay datos cargados", "records": []}
+        if dataset_id != current_id:
+            # A new file was loaded while the frontend was still paging
+            return {"status": "stale", "message": "El conjunto de datos cambió", "records": []}
         
         try:
-            records = []
-            for idx, row in self.data.iterrows():
-                if offset > 0:
-                    offset -= 1
-                    continue
-                    
-                if limit and len(records) >= limit:
-                    break
-                    
-                tipo = str(row.get('Tipo', 'N/A'))
-                is_escrito = 'escrito' in tipo.lower() if tipo != 'N/A' else False
-                
-                record = {
-                    "expte": str(row.get('Expte', 'N/A')),
-                    "titulo": str(row.get('Título', 'N/A')),
-                    "tipo": tipo,
-                    "tipo_class": "escrito" if is_escrito else "proyecto",
-                    "presentante": str(row.get('Apellido', 'N/A')),
-                    "fecha": str(row.get('Recibido_date_str', 'N/A'))
-                }
-                records.append(record)
+            start = max(offset or 0, 0)
+            stop = min(start + (limit or RECORDS_PAGE_SIZE), len(data))
+            records = self._project_records(data.iloc[start:stop], RAW_RECORD_FIELDS)
             
             return {
                 "status": "ok",
+                "dataset_id": dataset_id,
                 "records": records,
-                "total": len(self.data),
+                "offset": start,
+                "next_offset": stop if stop < len(data) else None,
+                "total": len(data),
                 "count": len(records)
             }
         except Exception as e:
-            print(f"Error getting all records: {e}")
+            log.error("Error getting records page: %s", e)
             return {"status": "error", "message": str(e), "records": []}
 
+    def get_current_dataset(self):
+        """
+        Summary of the loaded dataset shaped like the read_data response (no
+        delta), for a window that opens after the file was loaded (server.py).
+        """
+        from summary import summarize
+        with self._lock:
+            data, counts = self.data, self._summary_counts
+            if data is None:
+                return {"status": "no_data", "message": "No hay datos cargados"}
+            cursor = {
+                "last_index": self.last_split_index,
+                "last_assigned_date": self.last_assigned_date.strftime('%d/%m/%Y') if self.last_assigned_date else None,
+                "assigned": int(self._assigned.sum()) if self._assigned is not None else 0,
+            }
+            dataset_id = self.dataset_id
+        summary = counts.summary(data['Recibido']) if counts is not None else summarize(data)
+        return {
+            "status": "ok",
+            **summary,
+            "date_formats": self.date_parse_stats,
+            "dataset_id": dataset_id,
+            "page_size": RECORDS_PAGE_SIZE,
+            "cursor": cursor,
+            "delta": None
+        }
+
     def get_records_summary(self):
         """
         Get a summary of all records (useful for debugging)
         """
-        if self.data is None:
+        _, data, _, _, _ = self._snapshot()
+        if data is None:
             return {"status": "error", "message": "No hay datos cargados"}
         
         try:
             return {
                 "status": "ok",
-                "total_records": len(self.data),
-                "unique_dates": self.data['Recibido_date_str'].nunique() if 'Recibido_date_str' in self.data else 0,
-                "unique_titles": self.data['Título'].nunique(),
-                "unique_exptes": self.data['Expte'].nunique(),
+                "total_records": len(data),
+                "unique_dates": data['Recibido'].dt.normalize().nunique() if 'Recibido' in data else 0,
+                "unique_titles": data['Título'].nunique(),
+                "unique_exptes": data['Expte'].nunique(),
                 "date_range": {
-                    "min": self.data['Recibido'].min().strftime('%d/%m/%Y') if not self.data['Recibido'].empty else None,
-                    "max": self.data['Recibido'].max().strftime('%d/%m/%Y') if not self.data['Recibido'].empty else None
+                    "min": data['Recibido'].min().strftime('%d/%m/%Y') if not data['Recibido'].empty else None,
+                    "max": data['Recibido'].max().strftime('%d/%m/%Y') if not data['Recibido'].empty else None
                 }
             }
         except Exception as e:
-            print(f"Error getting records summary: {e}")
+            log.error("Error getting records summary: %s", e)
             return {"status": "error", "message": str(e)}
 
     def create_listados(self, data):
-        today_date = datetime.now()
-        # Convert to datetime and calculate days difference
-        data['Recibido_dt'] = pd.to_datetime(data['Recibido'])
-        data['DaysDifference'] = (today_date - data['Recibido_dt']).dt.days
-        # Format date consistently as dd/mm/yy
-        data['Recibido_formatted'] = data['Recibido_dt'].dt.strftime('%d/%m/%y')
-        
-        listados = []
-        for index, row in data.iterrows():
-            fifth_column_string = f"{row['DaysDifference']} días al {today_date.strftime('%d/%m')}"
-            # Use the pre-formatted date
-            listados.append((row['Título'], row['Expte'], row['Recibido_formatted'], row['Apellido'], fifth_column_string))
-        
-        # Clean up temporary columns
-        data.drop(['Recibido_dt', 'Recibido_formatted'], axis=1, inplace=True, errors='ignore')
-        return listados
+        """
+        Listados rows (Título, Expte, dd/mm/yy, Apellido, "N días al dd/mm") of data,
+        without touching it. The exports use the cached table of _listados_table.
+        """
+        from listados import build_listados, listado_rows
+        with self.perf.stage('listados', len(data)):
+            return listado_rows(build_listados(data))
+
+    def _listados_table(self):
+        """
+        Listados table of the loaded dataset, built once per load and per day.
+        Exports slice it from last_split_index and convert only that slice.
+        """
+        from listados import build_listados
+        today = datetime.now()
+        with self._lock:
+            key = (self.dataset_id, today.date())
+            if self._listados is None or self._listados[0] != key:
+                with self.perf.stage('listados', len(self.data)):
+                    self._listados = (key, build_listados(self.data, today))
+            return self._listados[1]
 
     def save_listados_to_excel(self, listados, filename):
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Listados"
-        for listado in listados:
-            ws.append(listado)
-        wb.save(filename)
-
-    def export_excel(self):
-        if self.data is not None:
-            file_types = ["Archivos Excel (*.xlsx)"]
-            default_filename = f"listado_{datetime.now().strftime('%d-%m-%Y_%H-%Mhs')}.xlsx"
-            save_path = webview.windows[0].create_file_dialog(
-                webview.SAVE_DIALOG, allow_multiple=False, file_types=file_types, save_filename=default_filename
-            )
-            if isinstance(save_path, (tuple, list)):
-                save_path = save_path[0] if save_path else None
-            if save_path:
-                listados = self.create_listados(self.data)
-                self.save_listados_to_excel(listados, save_path)
-                return {"status": "ok", "path": save_path}
-            else:
-                return {"status": "cancelled", "message": "Exportación cancelada por el usuario."}
-        else:
-            return {"status": "error", "message": "No hay datos cargados para exportar."}
+        from excel_export import write_listados_excel
+        # Streamed to disk a chunk of rows at a time
+        with self.perf.stage('excel_write', len(listados)):
+            write_listados_excel(listados, filename)
+
+    def export_excel(self, save_path=None):
+        """
+        Without save_path, a save dialog is shown.
+        """
+        response, work = self._task('export_excel', {'save_path': save_path})
+        return response if work is None else work(None)
+
+    def _export_excel_to(self, save_path, job=None):
+        from excel_export import write_listados_table
+        report(job, 0.05, "Preparando listados...")
+        table = self._listados_table()
+        report(job, 0.1, "Guardando Excel...")
+        total = max(len(table), 1)
+        try:
+            with self.perf.stage('excel_write', len(table)):
+                write_listados_table(table, save_path, on_chunk=lambda done: report(job, 0.1 + 0.85 * done / total))
+        except BaseException:
+            # Cancelled or failed mid-write: no truncated .xlsx left behind
+            if os.path.exists(save_path):
+                os.remove(save_path)
+            raise
+        return {"status": "ok", "path": save_path}
 
     def merge_expedientes(self, records):
         """
         Merge records with the same Expediente, counting occurrences and joining Título.
         Returns a list of merged records.
         """
-        merged = {}
-        for row in records:
-            expte = row[1]
-            if expte not in merged:
-                merged[expte] = {
-                    "Título": row[0],
-                    "Expte": expte,
-                    "Recibido": row[2],
-                    "Presentante": row[3],
-                    "Días": row[4],
-                    "count": 1
-                }
-            else:
-                merged[expte]["count"] += 1
-                merged[expte]["Título"] += f" | {row[0]}"
-        result = []
-        for v in merged.values():
-            titulo = v["Título"]
-            if len(titulo) > 42:
-                titulo = titulo[:42] + "..."
-            if v["count"] > 1:
-                otros = v["count"] - 1
-                if otros == 1:
-                    titulo += " (+1 otro escrito)"
-                else:
-                    titulo += f" (+{otros} otros escritos)"
-            result.append([titulo, v["Expte"], v["Recibido"], v["Presentante"], v["Días"]])
-        return result
+        from listados import merge_records
+        with self.perf.stage('merge', len(records)):
+            return merge_records(records)[0]
 
-    def assign_proveyentes(self, records, n_proveyentes):
+    def assign_proveyentes(self, records, n_proveyentes, ages=None):
         """
-        Assign merged records to proveyentes in round-robin, keeping all presentaciones for the same Expediente together.
+        Assign merged records to proveyentes balancing their escritos, keeping all presentaciones for the same Expediente together.
         """
+        return self._balance_proveyentes(records, n_proveyentes, ages)[0]
+
+    def _balance_proveyentes(self, records, n_proveyentes, ages=None):
+        # Merged expedientes weighted by escritos (and age), dealt heaviest first to the least loaded
         merged_records = self.merge_expedientes(records)
-        groups = [[] for _ in range(n_proveyentes)]
-        for idx, record in enumerate(merged_records):
-            groups[idx % n_proveyentes].append(record)
-        return groups
+        with self.perf.stage('balance', len(merged_records)):
+            weights = expediente_weights(records, ages, self.age_weight)
+            bins = balance(weights, n_proveyentes)
+        groups = [[merged_records[i] for i in items] for items in bins]
+        return groups, load_report(weights, bins)
 
-    def export_pdf(self, n_proveyentes):
-        if self.data is None:
-            return {"status": "error", "message": "No hay datos cargados para exportar."}
-        try:
-            file_types = ["Archivos PDF (*.pdf)"]
-            default_filename = f"proveyentes_{datetime.now().strftime('%d-%m-%Y_%H-%Mhs')}.pdf"
-            save_path = webview.windows[0].create_file_dialog(
-                webview.SAVE_DIALOG, allow_multiple=False, file_types=file_types, save_filename=default_filename
-            )
-            if isinstance(save_path, (tuple, list)):
-                save_path = save_path[0] if save_path else None
-            if not save_path:
-                return {"status": "cancelled", "message": "Exportación cancelada por el usuario."}
+    def export_pdf(self, n_proveyentes, per_proveyente=False, save_path=None):
+        """
+        per_proveyente: write one PDF per listado into a chosen folder instead of a single file.
+        save_path: the file (or folder) to write; without it a dialog is shown.
+        """
+        response, work = self._task('export_pdf', {'n_proveyentes': n_proveyentes, 'per_proveyente': per_proveyente,
+                                                   'save_path': save_path})
+        return response if work is None else work(None)
+
+    def _export_pdf_to(self, save_path, n_proveyentes, job=None, per_proveyente=False):
+        # One export at a time, as continuous exports: both move the split cursor and the assigned rows
+        with self._export_lock:
+            return self._write_pdf(save_path, n_proveyentes, job, per_proveyente)
 
-            listados = self.create_listados(self.data)
+    def _write_pdf(self, save_path, n_proveyentes, job, per_proveyente):
+        import numpy as np
+        import pandas as pd
+        from listados import listado_rows, last_date
+        try:
+            report(job, 0.05, "Preparando listados...")
+            # Rows are picked under the lock; the render runs without it
+            with self._lock:
+                dataset_id = self.dataset_id
+                table = self._listados_table()
+            # Always the first listados, so the same export can be repeated
+            # (e.g. after a wrong n_proveyentes); only continuous exports skip assigned escritos
             total_needed = n_proveyentes * 15
-            selected_records = listados[:total_needed]
-            
-            # Validate and fix dates before processing
-            selected_records = self._validate_and_fix_dates(selected_records)
-            
-            # Track last split index and last assigned date
-            self.last_split_index = min(total_needed, len(listados))
-            
-            # Determine last assigned date among selected records
-            try:
-                dates = []
-                for r in selected_records:
-                    try:
-                        dates.append(datetime.strptime(r[2], "%d/%m/%y"))
-                    except:
-                        pass
-                if dates:
-                    self.last_assigned_date = max(dates)
-                else:
-                    self.last_assigned_date = datetime.now()
-            except Exception:
-                self.last_assigned_date = datetime.now()
+            selected = table.iloc[:total_needed]
+            selected_records = listado_rows(selected)
+            ages = None
+            if self.age_weight:
+                ages = (pd.Timestamp.now().normalize() - selected['Recibido']).dt.days.tolist()
 
-            groups = self.assign_proveyentes(selected_records, n_proveyentes)
+            groups, load = self._balance_proveyentes(selected_records, n_proveyentes, ages)
+            report(job, 0.2, "Generando PDF...")
 
             # Build PDF (Fechas repartidas)
-            doc = SimpleDocTemplate(save_path, pagesize=A4)
-            elements = []
-            styles = getSampleStyleSheet()
-            for i, group in enumerate(groups):
-                # Title with tag
-                elements.append(Paragraph(f"Listado {i+1} <small>(Fechas repartidas)</small>", styles['Heading2']))
-                if not group:
-                    elements.append(Paragraph("Sin registros asignados.", styles['Normal']))
-                else:
-                    data = [["Título", "Expediente", "Fecha", "Presentante", "Días corridos"]]
-                    processed_group = []
-                    for row in group:
-                        titulo = row[0]
-                        if len(titulo) > 42:
-                            titulo = titulo[:42] + "..."
-                        presentante = row[3]
-                        if presentante and len(presentante) > 15:
-                            presentante = presentante[:15] + "..."
-                        processed_group.append([titulo, row[1], row[2], presentante, row[4]])
-                    data += processed_group
-                    page_width = A4[0]
-                    col_widths = [
-                        page_width * 0.32,
-                        page_width * 0.17,
-                        page_width * 0.10,
-                        page_width * 0.15,
-                        page_width * 0.15
-                    ]
-                    table = Table(data, repeatRows=1, colWidths=col_widths)
-                    # Striped style for rows
-                    table_style = [
-                        ('BACKGROUND', (0,0), (-1,0), colors.lightgrey),
-                        ('TEXTCOLOR', (0,0), (-1,0), colors.black),
-                        ('ALIGN', (0,0), (0,-1), 'LEFT'),
-                        ('ALIGN', (1,0), (-1,-1), 'CENTER'),
-                        ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-                        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0,1), (0,-1), 7),
-                        ('FONTSIZE', (1,1), (2,-1), 10),
-                        ('FONTSIZE', (3,1), (3,-1), 7),
-                        ('FONTSIZE', (4,1), (4,-1), 10),
-                        ('FONTSIZE', (0,0), (-1,0), 10),
-                        ('BOTTOMPADDING', (0,0), (-1,0), 8),
-                        ('VALIGN', (0,1), (-1,-1), 'TOP'),
-                        ('WORDWRAP', (0,1), (0,-1), 'CJK'),
-                    ]
-                    # Add striped background for rows
-                    for row_idx in range(1, len(data)):
-                        if row_idx % 2 == 1:
-                            table_style.append(('BACKGROUND', (0,row_idx), (-1,row_idx), colors.whitesmoke))
-                    table.setStyle(TableStyle(table_style))
-                    elements.append(table)
-                elements.append(Spacer(1, 18))
-                if (i + 1) % 2 == 0 and (i + 1) < len(groups):
-                    elements.append(PageBreak())
-            doc.build(elements)
-            return {"status": "ok", "path": save_path, "last_assigned_date": self.last_assigned_date.strftime('%d/%m/%Y'), "last_index": self.last_split_index}
+            files = self._build_pdf(save_path, groups, 'repartidas', job, per_proveyente)
+            
+            # Track last split index and last assigned date. The rows are not
+            # marked as assigned: the cursor alone tells continuous exports where to go on
+            last_index = len(selected)
+            last_assigned_date = last_date(selected) or datetime.now()
+            self._commit_export(dataset_id, 'repartidas', 0, last_index, np.empty(0, dtype=np.intp),
+                                n_proveyentes, last_assigned_date)
+            return {"status": "ok", "path": save_path, "files": files, "last_assigned_date": last_assigned_date.strftime('%d/%m/%Y'), "last_index": last_index,
+                    "balance": {key: load[key] for key in ('loads', 'imbalance', 'spread', 'jain')}}
+        except JobCancelled:
+            raise
         except Exception as e:
+            log.exception("Error in export_pdf: %s", e)
             return {"status": "error", "message": f"Error al exportar PDF: {e}"}
 
-    def _validate_and_fix_dates(self, records):
+    def _build_pdf(self, save_path, groups, mode, job=None, per_proveyente=False):
         """
-        Helper method to validate and fix date formats in records
-        Ensures all dates are in dd/mm/yy format
+        Render the groups with pdf_render (in worker processes when there are
+        many) into save_path, or one file per listado into the save_path folder.
+        Returns the files written. A cancelled or failed render leaves no partial files behind.
         """
-        fixed_records = []
-        for record in records:
-            # record[2] should be the date
-            date_str = record[2]
-            try:
-                # Try to parse as dd/mm/yy
-                parsed_date = datetime.strptime(date_str, "%d/%m/%y")
-                # Reformat to ensure consistency
-                fixed_date = parsed_date.strftime("%d/%m/%y")
-                
-                # Create a new record with the fixed date
-                fixed_record = list(record)
-                fixed_record[2] = fixed_date
-                fixed_records.append(tuple(fixed_record))
-            except ValueError:
-                # If parsing fails, try with full year format
-                try:
-                    parsed_date = datetime.strptime(date_str, "%d/%m/%Y")
-                    fixed_date = parsed_date.strftime("%d/%m/%y")
-                    fixed_record = list(record)
-                    fixed_record[2] = fixed_date
-                    fixed_records.append(tuple(fixed_record))
-                except ValueError:
-                    # If all parsing fails, log warning and keep original
-                    print(f"WARNING: Could not parse date: {date_str}, keeping original")
-                    fixed_records.append(record)
-        
-        return fixed_records
+        from pdf_render import render_listados_parallel, render_listados_files, listado_file_names
+        on_progress = lambda done, total: report(job, 0.2 + 0.75 * done / total)
+        if not per_proveyente:
+            files = [save_path]
+        else:
+            prefix = f"{PDF_PREFIXES[mode]}_{datetime.now().strftime('%d-%m-%Y_%H-%Mhs')}"
+            files = [os.path.join(save_path, name) for name in listado_file_names(prefix, len(groups))]
+        try:
+            with self.perf.stage('pdf', sum(len(group) for group in groups)):
+                if per_proveyente:
+                    render_listados_files(files, groups, mode, workers=self.pdf_workers, on_progress=on_progress)
+                else:
+                    render_listados_parallel(save_path, groups, mode, workers=self.pdf_workers, on_progress=on_progress)
+        except BaseException:
+            for path in files:
+                if os.path.exists(path):
+                    os.remove(path)
+            raise
+        return files
 
-    def export_pdf_continuous(self, start_date_str, n_proveyentes, per_list=15):
+    def export_pdf_continuous(self, start_date_str, n_proveyentes, per_list=15, per_proveyente=False, save_path=None):
         """
         Export continuous lists starting from start_date_str, taking records after last_split_index,
         assigning them sequentially to proveyentes (first 15 to listado 1, next 15 to listado 2, etc.),
@@ -604,196 +937,277 @@ class Api:
             start_date_str: Reference date for the title (doesn't modify record dates)
             n_proveyentes: Number of proveyentes (lists to create)
             per_list: Number of records per list BEFORE merging (default 15)
+            per_proveyente: One PDF per listado in a chosen folder instead of a single file
+            save_path: File (or folder) to write; without it a dialog is shown
         """
-        print(f"export_pdf_continuous called with: start_date={start_date_str}, n_proveyentes={n_proveyentes}")
-        
-        if self.data is None:
-            print("ERROR: No data loaded")
-            return {"status": "error", "message": "No hay datos cargados para exportar."}
-        
-        try:
-            # Parse start date for title reference only
+        response, work = self._task('export_pdf_continuous', {
+            'start_date': start_date_str, 'n_proveyentes': n_proveyentes, 'per_list': per_list,
+            'per_proveyente': per_proveyente, 'save_path': save_path
+        })
+        return response if work is None else work(None)
+
+    def _parse_start_date(self, start_date_str):
+        """
+        Reference date of a continuous export (Y-m-d, d/m/Y or d/m/y), None if invalid.
+        """
+        for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%d/%m/%y"):
             try:
-                start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
-                print(f"Reference start date (Y-m-d): {start_date}")
-            except Exception as e:
-                print(f"Failed to parse as Y-m-d: {e}")
-                try:
-                    start_date = datetime.strptime(start_date_str, "%d/%m/%Y")
-                    print(f"Reference start date (d/m/Y): {start_date}")
-                except Exception as e:
-                    print(f"Failed to parse as d/m/Y: {e}")
-                    try:
-                        start_date = datetime.strptime(start_date_str, "%d/%m/%y")
-                        print(f"Reference start date (d/m/y): {start_date}")
-                    except Exception as e:
-                        print(f"Failed to parse as d/m/y: {e}")
-                        return {"status": "error", "message": f"Formato de fecha inválido: {start_date_str}"}
-            
-            # IMPORTANT: Use the same listados that export_pdf uses, but continue from last_split_index
-            listados = self.create_listados(self.data)
-            
-            # Validate and fix all dates in listados to ensure consistency
-            listados = self._validate_and_fix_dates(listados)
-            
-            # Get the starting index from where we left off
-            start_idx = getattr(self, 'last_split_index', 0)
-            print(f"Start index: {start_idx}, total listados: {len(listados)}")
-            
-            # Get remaining records
-            remaining = listados[start_idx:]
-            print(f"Remaining records: {len(remaining)}")
-            
-            if not remaining:
+                start_date = datetime.strptime(start_date_str, fmt)
+                log.debug("Reference start date (%s): %s", fmt, start_date)
+                return start_date
+            except ValueError:
+                pass
+        return None
+
+    def _export_pdf_continuous_to(self, save_path, n_proveyentes, per_list=15, job=None, per_proveyente=False):
+        # One continuous export at a time: each one starts where the previous stopped
+        with self._export_lock:
+            return self._write_pdf_continuous(save_path, n_proveyentes, per_list, job, per_proveyente)
+
+    def _write_pdf_continuous(self, save_path, n_proveyentes, per_list, job, per_proveyente):
+        import numpy as np
+        from listados import last_date, merge_listados, split_listados
+        try:
+            report(job, 0.05, "Preparando listados...")
+            # Rows are picked under the lock; the render runs without it
+            with self._lock:
+                dataset_id = self.dataset_id
+                # IMPORTANT: Use the same listados that export_pdf uses, but continue from last_split_index
+                table = self._listados_table()
+                
+                # Get the starting index from where we left off
+                start_idx = getattr(self, 'last_split_index', 0)
+                log.debug("Start index: %d, total listados: %d", start_idx, len(table))
+                
+                # Escritos already assigned by an earlier file are skipped
+                pending = np.arange(start_idx, len(table))
+                if self._assigned is not None:
+                    pending = pending[~self._assigned[start_idx:]]
+            if not len(pending):
                 return {"status": "error", "message": "No hay más registros para exportar."}
             
             # Calculate how many records we need (n_proveyentes * per_list)
             total_needed = n_proveyentes * per_list
-            print(f"Total needed: {total_needed}")
-            
-            selected_records = remaining[:total_needed]
-            print(f"Selected records: {len(selected_records)}")
-            
-            # Additional validation on selected records
-            selected_records = self._validate_and_fix_dates(selected_records)
             
-            # Distribute records sequentially to each listado
-            # Group 1: records 0-(per_list-1), Group 2: records per_list-(2*per_list-1), etc.
-            sequential_groups = []
-            for i in range(0, len(selected_records), per_list):
-                group = selected_records[i:i + per_list]
-                if group:  # Only add non-empty groups
-                    sequential_groups.append(group)
+            positions = pending[:total_needed]
+            selected = table.iloc[positions]
+            log.debug("Selected records: %d of %d needed (%d already assigned skipped)",
+                      len(selected), total_needed, len(table) - start_idx - len(pending))
             
-            print(f"Created {len(sequential_groups)} sequential groups before merging")
-            
-            # Merge expedientes WITHIN each group
-            processed_groups = []
-            for group_idx, group in enumerate(sequential_groups):
-                print(f"Processing group {group_idx+1} with {len(group)} records before merging")
-                merged_group = self.merge_expedientes(group)
-                print(f"  After merging: {len(merged_group)} records")
-                processed_groups.append(merged_group)
-            
-            # Save PDF dialog
-            file_types = ["Archivos PDF (*.pdf)"]
-            default_filename = f"proveyentes_continuo_{datetime.now().strftime('%d-%m-%Y_%H-%Mhs')}.pdf"
-            print(f"Opening save dialog with default: {default_filename}")
-            
-            save_path = webview.windows[0].create_file_dialog(
-                webview.SAVE_DIALOG, allow_multiple=False, file_types=file_types, save_filename=default_filename
-            )
-            if isinstance(save_path, (tuple, list)):
-                save_path = save_path[0] if save_path else None
+            # Consecutive listados of per_list escritos, expedientes merged WITHIN each one
+            with self.perf.stage('merge', len(selected)):
+                processed_groups = split_listados(merge_listados(selected, per_list))
+            log.debug("Created %d listados", len(processed_groups))
             
-            print(f"Save path: {save_path}")
-            
-            if not save_path:
-                return {"status": "cancelled", "message": "Exportación cancelada por el usuario."}
-            
-            # Build PDF
-            doc = SimpleDocTemplate(save_path, pagesize=A4)
-            elements = []
-            styles = getSampleStyleSheet()
-            
-            for i, group in enumerate(processed_groups):
-                # Title with tag - indicating these are continuous
-                elements.append(Paragraph(f"Listado {i+1} <small>(Fechas continuas)</small>", 
-                                         styles['Heading2']))
-                
-                if not group:
-                    elements.append(Paragraph("Sin registros asignados.", styles['Normal']))
-                else:
-                    data = [["Título", "Expediente", "Fecha", "Presentante", "Días corridos"]]
-                    processed_rows = []
-                    
-                    for row in group:
-                        titulo = row[0]
-                        if len(titulo) > 42:
-                            titulo = titulo[:42] + "..."
-                        presentante = row[3]
-                        if presentante and len(presentante) > 15:
-                            presentante = presentante[:15] + "..."
-                        processed_rows.append([titulo, row[1], row[2], presentante, row[4]])
-                    
-                    data += processed_rows
-                    
-                    # Same table formatting as repartidas version
-                    page_width = A4[0]
-                    col_widths = [
-                        page_width * 0.32,
-                        page_width * 0.17,
-                        page_width * 0.10,
-                        page_width * 0.15,
-                        page_width * 0.15
-                    ]
-                    
-                    table = Table(data, repeatRows=1, colWidths=col_widths)
-                    table_style = [
-                        ('BACKGROUND', (0,0), (-1,0), colors.lightgrey),
-                        ('TEXTCOLOR', (0,0), (-1,0), colors.black),
-                        ('ALIGN', (0,0), (0,-1), 'LEFT'),
-                        ('ALIGN', (1,0), (-1,-1), 'CENTER'),
-                        ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-                        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0,1), (0,-1), 7),
-                        ('FONTSIZE', (1,1), (2,-1), 10),
-                        ('FONTSIZE', (3,1), (3,-1), 7),
-                        ('FONTSIZE', (4,1), (4,-1), 10),
-                        ('FONTSIZE', (0,0), (-1,0), 10),
-                        ('BOTTOMPADDING', (0,0), (-1,0), 8),
-                        ('VALIGN', (0,1), (-1,-1), 'TOP'),
-                        ('WORDWRAP', (0,1), (0,-1), 'CJK'),
-                    ]
-                    
-                    # Striped background
-                    for row_idx in range(1, len(data)):
-                        if row_idx % 2 == 1:
-                            table_style.append(('BACKGROUND', (0,row_idx), (-1,row_idx), colors.whitesmoke))
-                    
-                    table.setStyle(TableStyle(table_style))
-                    elements.append(table)
-                
-                elements.append(Spacer(1, 18))
-                if (i + 1) % 2 == 0 and (i + 1) < len(processed_groups):
-                    elements.append(PageBreak())
+            report(job, 0.2, "Generando PDF...")
             
-            print(f"Building PDF with {len(elements)} elements")
-            doc.build(elements)
+            # Build PDF (Fechas continuas)
+            files = self._build_pdf(save_path, processed_groups, 'continuas', job, per_proveyente)
             
             # Update last_split_index to reflect consumed records
-            self.last_split_index = start_idx + len(selected_records)
+            last_index = int(positions[-1]) + 1
             
             # Get the last date from the selected records for tracking
-            try:
-                dates = []
-                for r in selected_records:
-                    try:
-                        dates.append(datetime.strptime(r[2], "%d/%m/%y"))
-                    except:
-                        pass
-                if dates:
-                    self.last_assigned_date = max(dates)
-                else:
-                    self.last_assigned_date = datetime.now()
-            except Exception:
-                self.last_assigned_date = datetime.now()
+            last_assigned_date = last_date(selected) or datetime.now()
+            self._commit_export(dataset_id, 'continuas', start_idx, last_index, positions, n_proveyentes,
+                                last_assigned_date)
             
-            print(f"Export successful. Last index: {self.last_split_index}")
+            log.info("Continuous export successful. Last index: %d", last_index)
             
             return {
                 "status": "ok", 
                 "path": save_path,
-                "last_assigned_date": self.last_assigned_date.strftime('%d/%m/%Y'),
-                "last_index": self.last_split_index
+                "files": files,
+                "last_assigned_date": last_assigned_date.strftime('%d/%m/%Y'),
+                "last_index": last_index
             }
             
+        except JobCancelled:
+            raise
         except Exception as e:
-            print(f"ERROR in export_pdf_continuous: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error in export_pdf_continuous: %s", e)
             return {"status": "error", "message": f"Error al exportar PDF continuo: {e}"}
 
+    # ============================================================================
+    # BACKGROUND JOBS - long reads and exports off the pywebview bridge thread
+    # ============================================================================
+
+    @staticmethod
+    def _file_dialog(dialog_type, **kwargs):
+        # pywebview is imported on first use: headless callers (cli.py) pass
+        # every path and never load the GUI toolkit
+        import webview
+        return webview.windows[0].create_file_dialog(getattr(webview, dialog_type), **kwargs)
+
+    def _ask_open_path(self):
+        file_types = ["Archivos Excel (*.xlsx)"]
+        file_path = self._file_dialog('OPEN_DIALOG', allow_multiple=False, file_types=file_types)
+        if isinstance(file_path, (tuple, list)):
+            file_path = file_path[0] if file_path else None
+        return file_path
+
+    def _ask_open_paths(self):
+        file_types = ["Archivos Excel (*.xlsx)"]
+        paths = self._file_dialog('OPEN_DIALOG', allow_multiple=True, file_types=file_types)
+        return list(paths or [])
+
+    def _ask_save_path(self, file_types, default_filename):
+        save_path = self._file_dialog(
+            'SAVE_DIALOG', allow_multiple=False, file_types=file_types, save_filename=default_filename
+        )
+        if isinstance(save_path, (tuple, list)):
+            save_path = save_path[0] if save_path else None
+        return save_path
+
+    def _ask_folder(self):
+        folder = self._file_dialog('FOLDER_DIALOG')
+        if isinstance(folder, (tuple, list)):
+            folder = folder[0] if folder else None
+        return folder
+
+    def _task(self, kind, params):
+        """
+        Validate a read/export request and show its file dialog on the calling
+        thread, unless params carry the path (file_path, paths, save_path). Returns (None, work) where work(job) does the rest, or
+        (response, None) when there is nothing to run (error, dialog cancelled).
+        """
+        from batch_ingest import list_workbooks
+        if kind == 'read_data':
+            file_path = params.get('file_path') or self._ask_open_path()
+            if not file_path:
+                return {"status": "no_file", "message": "No se ha seleccionado ningún archivo."}, None
+            return None, lambda job: self._load_file(file_path, job)
+        if kind == 'read_data_batch':
+            paths = list_workbooks(params.get('paths') or self._ask_open_paths())
+            if not paths:
+                return {"status": "no_file", "message": "No se ha seleccionado ningún archivo."}, None
+            return None, lambda job: self._load_files(paths, job)
+        if kind == 'read_file_from_memory':
+            # Dropped file: the content comes with the request, no dialog
+            content = params.get('content')
+            if not content:
+                return {"status": "no_file", "message": "No se ha seleccionado ningún archivo."}, None
+            return None, lambda job: self._load_memory(content, job)
+
+        if kind not in ('export_excel', 'export_pdf', 'export_pdf_continuous'):
+            return {"status": "error", "message": f"Tarea desconocida: {kind}"}, None
+        if kind == 'export_pdf_continuous':
+            log.debug("export_pdf_continuous called with: start_date=%s, n_proveyentes=%s",
+                      params.get('start_date'), params.get('n_proveyentes'))
+        if self.data is None:
+            return {"status": "error", "message": "No hay datos cargados para exportar."}, None
+
+        stamp = datetime.now().strftime('%d-%m-%Y_%H-%Mhs')
+        if kind == 'export_excel':
+            save_path = params.get('save_path') or self._ask_save_path(
+                ["Archivos Excel (*.xlsx)"], f"listado_{stamp}.xlsx")
+            work = lambda job: self._export_excel_to(save_path, job)
+        elif kind == 'export_pdf':
+            n_proveyentes = int(params['n_proveyentes'])
+            per_proveyente = bool(params.get('per_proveyente'))
+            if params.get('save_path'):
+                save_path = params['save_path']
+            elif per_proveyente:
+                save_path = self._ask_folder()
+            else:
+                save_path = self._ask_save_path(["Archivos PDF (*.pdf)"], f"proveyentes_{stamp}.pdf")
+            work = lambda job: self._export_pdf_to(save_path, n_proveyentes, job, per_proveyente)
+        else:
+            start_date_str = params.get('start_date')
+            if self._parse_start_date(start_date_str) is None:
+                return {"status": "error", "message": f"Formato de fecha inválido: {start_date_str}"}, None
+            if self.last_split_index >= len(self.data):
+                return {"status": "error", "message": "No hay más registros para exportar."}, None
+            n_proveyentes = int(params['n_proveyentes'])
+            per_list = int(params.get('per_list') or 15)
+            per_proveyente = bool(params.get('per_proveyente'))
+            if params.get('save_path'):
+                save_path = params['save_path']
+            elif per_proveyente:
+                save_path = self._ask_folder()
+            else:
+                save_path = self._ask_save_path(["Archivos PDF (*.pdf)"], f"proveyentes_continuo_{stamp}.pdf")
+            work = lambda job: self._export_pdf_continuous_to(save_path, n_proveyentes, per_list, job, per_proveyente)
+
+        if not save_path:
+            return {"status": "cancelled", "message": "Exportación cancelada por el usuario."}, None
+        return None, work
+
+    def start_job(self, kind, params=None):
+        """
+        Run read_data, read_data_batch, read_file_from_memory, export_excel,
+        export_pdf or export_pdf_continuous in the background. The file dialog is shown first; then this returns the job_id
+        right away and the frontend follows it with get_job or the
+        window.onJobUpdate push, and can stop it with cancel_job.
+        """
+        try:
+            response, work = self._task(kind, params or {})
+        except Exception as e:
+            log.error("Error starting job %s: %s", kind, e)
+            return {"status": "error", "message": str(e)}
+        if work is None:
+            return response
+        job = self.jobs.submit(kind, work)
+        return {"status": "ok", "job_id": job.id, "kind": kind}
+
+    def get_job(self, job_id):
+        """
+        Progress of a background job; "result" is the operation's response once it ends.
+        """
+        job = self.jobs.get(job_id)
+        if job is None:
+            return {"status": "error", "message": "Tarea no encontrada"}
+        return {"status": "ok", **job.to_dict()}
+
+    def cancel_job(self, job_id):
+        """
+        Ask a running job to stop; it ends at its next progress step.
+        """
+        if not self.jobs.cancel(job_id):
+            return {"status": "error", "message": "La tarea no existe o ya terminó"}
+        return {"status": "ok", "job_id": job_id}
+
+    def _push_job_update(self, update):
+        # Push progress to the frontend; get_job polling works without it
+        webview = sys.modules.get('webview')  # not loaded when running headless
+        if webview is not None and webview.windows:
+            webview.windows[0].evaluate_js(
+                f"window.onJobUpdate && window.onJobUpdate({json.dumps(update, default=str)})"
+            )
+
+    # ============================================================================
+    # PERFORMANCE STATS - per-stage timings recorded by self.perf
+    # ============================================================================
+
+    def get_perf_stats(self, clear=False):
+        """
+        Last pipeline stages (name, seconds, rows, peak MB while a tracemalloc
+        capture runs) and per-stage totals. clear=True empties the buffer.
+        """
+        return {"status": "ok", **self.perf.stats(clear)}
+
+    def start_perf_capture(self, mode='cprofile'):
+        """
+        Profile the following stages with cProfile, or trace their memory with
+        tracemalloc ('tracemalloc'), until stop_perf_capture writes the dump.
+        """
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        extension = 'prof' if mode == 'cprofile' else 'tracemalloc'
+        path = os.path.join(os.path.dirname(default_history_path()), 'perf', f"{mode}_{stamp}.{extension}")
+        try:
+            self.perf.start_capture(mode, path)
+        except (ValueError, RuntimeError) as e:
+            return {"status": "error", "message": str(e)}
+        return {"status": "ok", "mode": mode, "path": path}
+
+    def stop_perf_capture(self):
+        try:
+            path = self.perf.stop_capture()
+        except Exception as e:
+            log.error("Error writing perf capture: %s", e)
+            return {"status": "error", "message": str(e)}
+        return {"status": "ok", "path": path}
+
     # ============================================================================
     # METHOD FOR STATIC HTML EXPORT
     # ============================================================================
@@ -806,15 +1220,7 @@ class Api:
             file_types = ["Archivos HTML (*.html)"]
             default_filename = f"dashboard_{datetime.now().strftime('%Y%m%d_%H%M')}.html"
             
-            save_path = webview.windows[0].create_file_dialog(
-                webview.SAVE_DIALOG, 
-                allow_multiple=False, 
-                file_types=file_types, 
-                save_filename=default_filename
-            )
-            
-            if isinstance(save_path, (tuple, list)):
-                save_path = save_path[0] if save_path else None
+            save_path = self._ask_save_path(file_types, default_filename)
                 
             if not save_path:
                 return {"status": "cancelled", "message": "Exportación cancelada por el usuario."}
@@ -836,9 +1242,7 @@ class Api:
             }
             
         except Exception as e:
-            print(f"Error exporting static HTML: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error exporting static HTML: %s", e)
             return {"status": "error", "message": f"Error al exportar: {str(e)}"}
 
     def open_file(self, file_path):
@@ -854,10 +1258,12 @@ class Api:
             return {"status": "error", "message": str(e)}
 
     def get_window_size(self):
+        import webview
         win = webview.windows[0]
         return {'width': win.width, 'height': win.height}
 
     def set_window_size(self, width, height):
+        import webview
         win = webview.windows[0]
         win.resize(width, height)
         return True
\ No newline at end of file
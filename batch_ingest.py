@@ -0,0 +1,113 @@
+"""
+Several Forum exports (months, juzgados) loaded as one dataset.
+
+Each workbook is parsed on its own in a process pool (the XML parse is
+CPU-bound), going through the dataset cache like a single load. The frames are
+concatenated with the source file in an 'Archivo' column and sorted by
+Recibido. Rows that appear in more than one file (overlapping periods) are
+kept once: their delta.row_keys are compared across files, so an escrito
+repeated inside one export is not lost.
+"""
+import hashlib
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from dataset_cache import content_key
+from delta import row_keys
+from ingest import iter_forum_batches, frame_from_batches, parse_dates
+from jobs import run_in_pool
+
+SOURCE_COLUMN = 'Archivo'
+MAX_WORKERS = 8
+
+log = logging.getLogger(__name__)
+
+
+def list_workbooks(paths):
+    """
+    .xlsx files of `paths` (files or directories, expanded in name order),
+    skipping Excel lock files (~$...) and repeated paths.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            names = sorted(os.listdir(path))
+            found += [os.path.join(path, n) for n in names
+                      if n.lower().endswith('.xlsx') and not n.startswith('~$')]
+        else:
+            found.append(path)
+    return list(dict.fromkeys(os.path.abspath(p) for p in found))
+
+
+def default_workers(n_files):
+    return max(1, min(n_files, MAX_WORKERS, os.cpu_count() or 1))
+
+
+def read_workbook(path, cache=None):
+    """
+    Worker: (frame with Recibido parsed, date format counts, content key) of one
+    workbook, from the dataset cache when it was parsed before.
+    """
+    key = content_key(path)
+    if cache is not None:
+        cached = cache.load(key)
+        if cached is not None:
+            df, extra = cached
+            return df, extra.get('date_formats', {}), key
+    df = frame_from_batches(iter_forum_batches(path))
+    stats = {}
+    if 'Recibido' in df.columns:
+        df['Recibido'], stats = parse_dates(df['Recibido'])
+    if cache is not None:
+        try:
+            cache.store(key, df, {'date_formats': stats})
+        except Exception as e:
+            log.warning("could not cache dataset: %s", e)
+    return df, stats, key
+
+
+def read_workbooks(paths, workers=None, cache=None, on_done=None):
+    """
+    One frame out of several workbooks. Returns (frame, date format counts
+    summed over the files, batch key, {"files": rows per file, "duplicates":
+    rows dropped}); the batch key hashes the content keys, so the same set of
+    files gets the same key.
+    on_done(n_done, n_total) runs per file and may raise to cancel.
+    """
+    workers = workers or default_workers(len(paths))
+    calls = [(read_workbook, (path, cache)) for path in paths]
+    if workers <= 1 or len(paths) <= 1:
+        results = []
+        for done, (fn, args) in enumerate(calls, start=1):
+            results.append(fn(*args))
+            if on_done is not None:
+                on_done(done, len(calls))
+    else:
+        results = run_in_pool(workers, calls, on_done)
+
+    frames, stats, files = [], {}, []
+    for path, (df, file_stats, _) in zip(paths, results):
+        df = df.copy()
+        df[SOURCE_COLUMN] = os.path.basename(path)
+        frames.append(df)
+        for fmt, n in file_stats.items():
+            stats[fmt] = stats.get(fmt, 0) + n
+        files.append({"file": os.path.basename(path), "rows": len(df)})
+    data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    # Keys are numbered per file, so only rows repeated across files collide
+    keys = np.concatenate([row_keys(df) for df in frames]) if frames else np.empty(0, dtype=np.int64)
+    unique = ~pd.Series(keys).duplicated().to_numpy()
+    if not unique.all():
+        data = data[unique]
+    if 'Recibido' in data.columns:
+        data = data.sort_values('Recibido', kind='stable', na_position='last')
+    data = data.reset_index(drop=True)
+
+    digest = hashlib.sha256("\n".join(sorted(key for _, _, key in results)).encode())
+    return data, stats, f"batch-{digest.hexdigest()}", {"files": files, "duplicates": int((~unique).sum())}
@@ -0,0 +1,40 @@
+"""
+Benchmarks for the listados backend. Run from the repository root, e.g.
+
+    python -m benchmarks.bench_ingest 10000 100000
+
+benchmarks.suite times every public Api method and compares against a saved
+JSON baseline:
+
+    python -m benchmarks.suite run --out baseline.json
+    python -m benchmarks.suite compare baseline.json benchmark_results.json
+"""
+import tracemalloc
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+
+def start_peak_memory():
+    """
+    Baseline for peak_memory_mb: max RSS so far, or start tracemalloc where
+    the resource module is missing (Windows).
+    """
+    if resource is not None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    return 0
+
+
+def peak_memory_mb(base):
+    """
+    (MB above base at the peak, "RSS" or "tracemalloc") since start_peak_memory.
+    """
+    if resource is not None:
+        # ru_maxrss is in KB on Linux
+        return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base) / 1024, "RSS"
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1e6, "tracemalloc"
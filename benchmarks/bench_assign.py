@@ -0,0 +1,65 @@
+"""
+Proveyente assignment: the previous round-robin deal vs greedy LPT balancing
+(assignment.balance), on expedientes with skewed escrito counts.
+
+    python -m benchmarks.bench_assign [n_rows]
+
+For each (rows, proveyentes) case the escritos of a synthetic dataset are
+merged by expediente and dealt both ways; reported are the time and the
+fairness of the loads (max/mean imbalance, max-min spread, Jain's index).
+A single expediente heavier than the mean load bounds what any split can do,
+so "vs bound" divides the max load by max(heaviest expediente, mean load).
+A second distribution draws 1-8 escritos per expediente (geometric), the
+typical shape of one day's listados.
+"""
+import sys
+import time
+
+import numpy as np
+
+from assignment import balance, round_robin, load_report
+from benchmarks.synthetic import forum_rows
+
+CASES = [(750, 50), (15_000, 100), (100_000, 500)]
+
+
+def _forum_weights(n_rows):
+    counts = {}
+    for row in forum_rows(n_rows):
+        counts[row[0]] = counts.get(row[0], 0) + 1
+    return [float(c) for c in counts.values()]
+
+
+def _geometric_weights(n_rows, seed=0):
+    counts = np.minimum(np.random.default_rng(seed).geometric(0.45, size=n_rows), 8)
+    n = int(np.searchsorted(np.cumsum(counts), n_rows)) + 1
+    return counts[:n].astype(float).tolist()
+
+
+def _timed(split, *args):
+    start = time.perf_counter()
+    bins = split(*args)
+    return time.perf_counter() - start, bins
+
+
+def run(cases):
+    for (n_rows, n_proveyentes), (label, make) in (
+        (case, dist) for case in cases for dist in (("forum", _forum_weights), ("1-8", _geometric_weights))
+    ):
+        weights = make(n_rows)
+        bound = max(max(weights), sum(weights) / n_proveyentes)
+        print(f"{n_rows} escritos ({label}), {len(weights)} expedientes (max {max(weights):g} escritos), "
+              f"{n_proveyentes} proveyentes")
+        for name, split, args in (
+            ("round-robin", round_robin, (len(weights), n_proveyentes)),
+            ("LPT heap", balance, (weights, n_proveyentes)),
+        ):
+            elapsed, bins = _timed(split, *args)
+            report = load_report(weights, bins)
+            print(f"  {name:<12} {elapsed * 1000:8.2f} ms  imbalance {report['imbalance']:6.2f}  "
+                  f"spread {report['spread']:7.0f}  vs bound {report['max'] / bound:5.2f}  "
+                  f"cv {report['cv']:5.2f}  jain {report['jain']:5.3f}")
+
+
+if __name__ == "__main__":
+    run([(int(sys.argv[1]), n) for n in (50, 500)] if len(sys.argv) > 1 else CASES)
@@ -0,0 +1,57 @@
+"""
+Multi-file ingest: batch_ingest.read_workbooks over 12-50 monthly exports,
+serially and in a process pool.
+
+    python -m benchmarks.bench_batch [rows_per_file]
+
+Consecutive synthetic months overlap by 10% of their rows (an export taken
+before the previous one was fully proveído); every run must drop exactly
+those duplicates. The dataset cache is off so every file is parsed. Scaling
+is bounded by the cores of the machine (reported).
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from batch_ingest import read_workbooks, list_workbooks
+from benchmarks.synthetic import forum_rows, write_forum_workbook
+
+FILE_COUNTS = [12, 24, 50]
+WORKERS = [1, 2, 4, 8]
+OVERLAP = 0.1
+
+
+def _write_months(directory, n_files, rows_per_file):
+    rows = forum_rows(n_files * rows_per_file, days=30 * n_files)
+    overlap = int(rows_per_file * OVERLAP)
+    for i in range(n_files):
+        start = max(0, i * rows_per_file - overlap)
+        write_forum_workbook(os.path.join(directory, f"forum_{i + 1:02d}.xlsx"), 0,
+                             rows=rows[start:(i + 1) * rows_per_file])
+    return overlap * (n_files - 1)
+
+
+def run(rows_per_file):
+    print(f"{rows_per_file} rows per file, {os.cpu_count()} CPUs")
+    for n_files in FILE_COUNTS:
+        directory = tempfile.mkdtemp(prefix="bench_batch_")
+        try:
+            duplicates = _write_months(directory, n_files, rows_per_file)
+            paths = list_workbooks(directory)
+            line = []
+            for workers in WORKERS:
+                start = time.perf_counter()
+                data, _, _, info = read_workbooks(paths, workers=workers)
+                elapsed = time.perf_counter() - start
+                if info["duplicates"] != duplicates or len(data) != n_files * rows_per_file:
+                    raise SystemExit(f"{n_files} archivos: {info['duplicates']} duplicados, se esperaban {duplicates}")
+                line.append(f"{workers}w {elapsed:6.2f}s")
+            print(f"  {n_files:>2} files ({len(data)} rows, {duplicates} duplicates)  " + "  ".join(line))
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
@@ -0,0 +1,38 @@
+"""
+Cold vs warm load: read_data parsing the workbook vs hitting the dataset cache.
+
+    python -m benchmarks.bench_cache [n_rows ...]
+
+Uses a throwaway cache directory so the user's cache is left alone.
+"""
+import sys
+import tempfile
+import time
+
+from backend import Api
+from benchmarks.synthetic import cached_workbook
+from dataset_cache import DatasetCache
+
+DEFAULT_SIZES = [10_000, 100_000]
+
+
+def run(sizes):
+    with tempfile.TemporaryDirectory() as directory:
+        for n_rows in sizes:
+            path = cached_workbook(n_rows)
+            api = Api()
+            api.dataset_cache = DatasetCache(directory)
+            api.incremental_load = False  # the warm load would otherwise report an empty delta
+            start = time.perf_counter()
+            cold = api.read_data(path)
+            cold_t = time.perf_counter() - start
+            start = time.perf_counter()
+            warm = api.read_data(path)
+            warm_t = time.perf_counter() - start
+            if {k: v for k, v in cold.items() if k != "dataset_id"} != {k: v for k, v in warm.items() if k != "dataset_id"}:
+                raise SystemExit("el resumen desde caché difiere del original")
+            print(f"{n_rows:>9} rows  parse {cold_t:6.2f} s   cache {warm_t:6.2f} s  ({cold_t / warm_t:.1f}x)")
+
+
+if __name__ == "__main__":
+    run([int(a) for a in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,59 @@
+"""
+Recibido parsing: previous to_datetime + per-row try_formats vs parse_dates.
+
+    python -m benchmarks.bench_dates [n_rows]
+
+Times a clean column and the same column with a single unparseable cell,
+which used to send the whole column through the per-row fallback.
+"""
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from benchmarks.synthetic import forum_rows
+from ingest import parse_dates
+
+
+def _legacy_parse(values):
+    parsed = pd.to_datetime(values, dayfirst=True, errors='coerce')
+    if parsed.isna().any():
+        def try_formats(val):
+            if pd.isna(val):
+                return pd.NaT
+            for fmt in ("%d/%m/%Y", "%d/%m/%y", "%Y-%m-%d", "%m/%d/%Y"):
+                try:
+                    return datetime.strptime(str(val), fmt)
+                except Exception:
+                    continue
+            try:
+                return pd.to_datetime(val, dayfirst=True, errors='coerce')
+            except:
+                return pd.NaT
+        parsed = values.apply(try_formats)
+    return pd.to_datetime(parsed)
+
+
+def _timed(fn, values):
+    start = time.perf_counter()
+    result = fn(values)
+    return time.perf_counter() - start, result
+
+
+def run(n_rows):
+    clean = pd.Series([row[4] for row in forum_rows(n_rows)], dtype=object)
+    dirty = clean.copy()
+    dirty.iloc[n_rows // 2] = "sin dato"
+    mixed = clean.copy()
+    mixed.iloc[::10] = mixed.iloc[::10].str.slice(0, 10)  # some dd/mm/YYYY without time
+    for name, values in (("limpia", clean), ("1 celda mala", dirty), ("formatos mezclados", mixed)):
+        old_t, old = _timed(_legacy_parse, values)
+        new_t, (new, counts) = _timed(parse_dates, values)
+        same = old.fillna(pd.Timestamp(0)).equals(new.fillna(pd.Timestamp(0)))
+        print(f"{name:<20} previo {old_t * 1000:9.1f} ms   parse_dates {new_t * 1000:8.1f} ms   "
+              f"iguales={same}  {counts}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
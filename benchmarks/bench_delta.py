@@ -0,0 +1,82 @@
+"""
+Reloading the next day's Forum export: full reload (summary + every record
+paged to the dashboard) vs incremental load (delta.diff_rows, SummaryCounts
+and only the changed records).
+
+    python -m benchmarks.bench_delta [n_rows]
+
+The "next day" drops the oldest 3% of escritos (proveídos) and appends 1.5%
+new ones. Reported: backend processing time and the JSON pushed to the
+frontend. Reading the workbook is the same in both modes and not included.
+"""
+import json
+import sys
+import time
+
+import pandas as pd
+
+from backend import Api, RECORDS_PAGE_SIZE
+from benchmarks.synthetic import forum_rows
+from summary import summarize
+
+COLUMNS = ["Expte", "Título", "Tipo", "Apellido", "Recibido"]
+
+
+def _frame(rows):
+    df = pd.DataFrame(rows, columns=COLUMNS)
+    df["Recibido"] = pd.to_datetime(df["Recibido"], format="%d/%m/%Y %H:%M:%S")
+    return df
+
+
+def _api(incremental):
+    api = Api()
+    api.export_history = None
+    api.incremental_load = incremental
+    return api
+
+
+def _pages_bytes(api):
+    # Everything the dashboard fetches after a full load
+    total, offset = 0, 0
+    while offset is not None:
+        page = api.get_records_page(api.dataset_id, offset, RECORDS_PAGE_SIZE)
+        total += len(json.dumps(page))
+        offset = page["next_offset"]
+    return total
+
+
+def run(n_rows):
+    removed, added = int(n_rows * 0.03), int(n_rows * 0.015)
+    rows = forum_rows(n_rows + added)
+    yesterday, today = _frame(rows[:n_rows]), _frame(rows[removed:n_rows + added])
+    print(f"{n_rows} rows yesterday, {removed} proveídos, {added} new")
+
+    api = _api(False)
+    api._process_dataframe(yesterday, parsed=True)
+    start = time.perf_counter()
+    full = api._process_dataframe(today.copy(), parsed=True)
+    full_t = time.perf_counter() - start
+    start = time.perf_counter()
+    full_bytes = len(json.dumps(full)) + _pages_bytes(api)
+    pages_t = time.perf_counter() - start
+
+    api = _api(True)
+    api._process_dataframe(yesterday, parsed=True)
+    start = time.perf_counter()
+    delta = api._process_dataframe(today.copy(), parsed=True)
+    delta_t = time.perf_counter() - start
+    delta_bytes = len(json.dumps(delta))
+    if delta["delta"] is None:
+        raise SystemExit("no se aplicó la carga incremental")
+
+    expected = summarize(api.data)
+    if any(delta[key] != value for key, value in expected.items()):
+        raise SystemExit("el resumen incremental difiere del completo")
+    print(f"  full reload   process {full_t * 1000:7.1f} ms + records pages {pages_t * 1000:7.1f} ms  "
+          f"pushed {full_bytes / 1e6:7.2f} MB")
+    print(f"  incremental   process {delta_t * 1000:7.1f} ms (records included)           "
+          f"pushed {delta_bytes / 1e6:7.2f} MB")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,101 @@
+"""
+Excel export benchmark: the previous in-memory Workbook + ws.append of every
+listado, openpyxl's write-only mode and the streaming writer (excel_export).
+
+    python -m benchmarks.bench_excel [n_rows ...]
+
+Each measurement runs in a fresh interpreter; the listados table is built
+before the memory baseline is taken, so only the writer is measured.
+Defaults to 10k/100k rows.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import start_peak_memory, peak_memory_mb
+
+DEFAULT_SIZES = [10_000, 100_000]
+
+
+def _legacy_write(table, path):
+    from openpyxl import Workbook
+    from listados import listado_rows
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Listados"
+    for listado in listado_rows(table):
+        ws.append(listado)
+    wb.save(path)
+
+
+def _write_only(table, path):
+    from openpyxl import Workbook
+    from listados import listado_rows
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Listados")
+    for start in range(0, len(table), 10_000):
+        for listado in listado_rows(table.iloc[start:start + 10_000]):
+            ws.append(listado)
+    wb.save(path)
+
+
+def _streaming_write(table, path):
+    from excel_export import write_listados_table
+    write_listados_table(table, path)
+
+
+WRITERS = {"workbook": _legacy_write, "write_only": _write_only, "streaming": _streaming_write}
+
+
+def _worker(writer, n_rows):
+    import pandas as pd
+    from benchmarks.synthetic import forum_rows
+    from listados import build_listados
+
+    df = pd.DataFrame(forum_rows(n_rows), columns=["Expte", "Título", "Tipo", "Apellido", "Recibido"])
+    df["Recibido"] = pd.to_datetime(df["Recibido"], format="%d/%m/%Y %H:%M:%S")
+    table = build_listados(df)
+    base_memory = start_peak_memory()
+
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        start = time.perf_counter()
+        WRITERS[writer](table, path)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(path)
+    finally:
+        os.remove(path)
+    peak_mb, memory = peak_memory_mb(base_memory)
+    print(json.dumps({
+        "seconds": elapsed,
+        "peak_mb": peak_mb,
+        "memory": memory,
+        "file_mb": size / 1e6,
+    }))
+
+
+def run(sizes):
+    results = []
+    for n_rows in sizes:
+        for writer in WRITERS:
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_excel", "--worker", writer, str(n_rows)],
+                check=True, capture_output=True, text=True,
+            )
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            result.update({"writer": writer, "n_rows": n_rows})
+            results.append(result)
+            print(f"{n_rows:>9} rows  {writer:<10} {result['seconds']:8.2f} s  "
+                  f"+{result['peak_mb']:8.1f} MB {result['memory']}  {result['file_mb']:6.1f} MB file")
+    return results
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        _worker(sys.argv[2], int(sys.argv[3]))
+    else:
+        run([int(a) for a in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,75 @@
+"""
+Excel ingest benchmark: pandas.read_excel (previous path) vs the streaming reader.
+
+    python -m benchmarks.bench_ingest [n_rows ...]
+
+Each measurement runs in a fresh interpreter so peak memory is comparable
+(RSS where the resource module exists, tracemalloc peak on Windows).
+Defaults to 10k/100k/1M rows; the workbooks are generated once and cached in
+the temp directory.
+"""
+import json
+import subprocess
+import sys
+import time
+
+from benchmarks import start_peak_memory, peak_memory_mb
+from benchmarks.synthetic import cached_workbook
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def _legacy_read(path):
+    import pandas as pd
+    try:
+        return pd.read_excel(path, skiprows=8, engine='openpyxl')
+    except Exception:
+        return pd.read_excel(path, engine='openpyxl')
+
+
+def _streaming_read(path):
+    from ingest import read_forum_excel
+    return read_forum_excel(path)
+
+
+READERS = {"read_excel": _legacy_read, "streaming": _streaming_read}
+
+
+def _worker(reader, path):
+    import pandas  # noqa: F401  (exclude import time and memory from the measure)
+    import openpyxl  # noqa: F401
+    base_memory = start_peak_memory()
+    start = time.perf_counter()
+    df = READERS[reader](path)
+    elapsed = time.perf_counter() - start
+    peak_mb, memory = peak_memory_mb(base_memory)
+    print(json.dumps({
+        "rows": len(df),
+        "seconds": elapsed,
+        "peak_mb": peak_mb,
+        "memory": memory,
+    }))
+
+
+def run(sizes):
+    results = []
+    for n_rows in sizes:
+        path = cached_workbook(n_rows)
+        for reader in READERS:
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_ingest", "--worker", reader, path],
+                check=True, capture_output=True, text=True,
+            )
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            result.update({"reader": reader, "n_rows": n_rows})
+            results.append(result)
+            print(f"{n_rows:>9} rows  {reader:<10} {result['seconds']:8.2f} s  "
+                  f"+{result['peak_mb']:8.1f} MB {result['memory']}")
+    return results
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        _worker(sys.argv[2], sys.argv[3])
+    else:
+        run([int(a) for a in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,76 @@
+"""
+Listados table: the previous create_listados (iterrows + per-row strptime
+validation) vs listados.build_listados, and the cost of an export selection
+once the table is cached.
+
+    python -m benchmarks.bench_listados [n_rows ...]
+
+Checks both produce the same rows first. "today" is pinned to the end of a day,
+where the old elapsed-time day count equals the new calendar-day count.
+"""
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from benchmarks.synthetic import forum_rows
+from listados import build_listados, listado_rows
+
+DEFAULT_SIZES = [10_000, 100_000]
+TODAY = datetime(2025, 6, 30, 23, 59, 59)
+
+
+def _legacy_create_listados(data, today_date):
+    data['Recibido_dt'] = pd.to_datetime(data['Recibido'])
+    data['DaysDifference'] = (today_date - data['Recibido_dt']).dt.days
+    data['Recibido_formatted'] = data['Recibido_dt'].dt.strftime('%d/%m/%y')
+    listados = []
+    for index, row in data.iterrows():
+        fifth_column_string = f"{row['DaysDifference']} días al {today_date.strftime('%d/%m')}"
+        listados.append((row['Título'], row['Expte'], row['Recibido_formatted'], row['Apellido'], fifth_column_string))
+    data.drop(['Recibido_dt', 'Recibido_formatted'], axis=1, inplace=True, errors='ignore')
+    return listados
+
+
+def _legacy_validate(records):
+    fixed = []
+    for record in records:
+        parsed = datetime.strptime(record[2], "%d/%m/%y")
+        fixed_record = list(record)
+        fixed_record[2] = parsed.strftime("%d/%m/%y")
+        fixed.append(tuple(fixed_record))
+    return fixed
+
+
+def run(sizes):
+    for n_rows in sizes:
+        df = pd.DataFrame(forum_rows(n_rows), columns=["Expte", "Título", "Tipo", "Apellido", "Recibido"])
+        df["Recibido"] = pd.to_datetime(df["Recibido"], format="%d/%m/%Y %H:%M:%S")
+
+        start = time.perf_counter()
+        old = _legacy_validate(_legacy_create_listados(df.copy(), TODAY))
+        old_t = time.perf_counter() - start
+
+        start = time.perf_counter()
+        table = build_listados(df, TODAY)
+        build_t = time.perf_counter() - start
+        start = time.perf_counter()
+        new = listado_rows(table)
+        rows_t = time.perf_counter() - start
+        if old != new:
+            raise SystemExit("build_listados difiere de create_listados")
+
+        # A continuous export of 10 proveyentes x 15 from the middle of the file
+        start = time.perf_counter()
+        for _ in range(100):
+            listado_rows(table.iloc[n_rows // 2:n_rows // 2 + 150])
+        slice_t = (time.perf_counter() - start) / 100
+
+        print(f"{n_rows:>9} rows  create_listados+validate {old_t:7.3f}s  "
+              f"build {build_t:6.3f}s  all rows {rows_t:6.3f}s  "
+              f"150-row slice {slice_t * 1e3:6.3f}ms  ({old_t / (build_t + rows_t):5.1f}x)")
+
+
+if __name__ == "__main__":
+    run([int(a) for a in sys.argv[1:]] or DEFAULT_SIZES)
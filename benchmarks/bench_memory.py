@@ -0,0 +1,63 @@
+"""
+Memory of the loaded dataset: object-dtype text columns plus the per-row
+Recibido_date_str labels (previous layout) vs the compact one kept by
+Api._process_dataframe (category columns, datetime64 Recibido, no labels).
+
+    python -m benchmarks.bench_memory [n_rows]
+
+Sizes are pandas' deep memory_usage (every distinct Python string counted
+once per reference, as the object columns hold them). The list of record
+dicts the dashboard used to keep next to the frame (raw_records) is measured
+with tracemalloc on the first 100k rows and scaled linearly.
+"""
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from backend import Api, RAW_RECORD_FIELDS
+from benchmarks.synthetic import forum_rows
+from summary import format_days
+
+SAMPLE_RECORDS = 100_000
+
+
+def _mb(frame):
+    return frame.memory_usage(deep=True).sum() / 1e6
+
+
+def run(n_rows):
+    df = pd.DataFrame(forum_rows(n_rows), columns=["Expte", "Título", "Tipo", "Apellido", "Recibido"])
+    df["Recibido"] = pd.to_datetime(df["Recibido"], format="%d/%m/%Y %H:%M:%S")
+
+    legacy = df.copy()
+    legacy["Recibido_date_str"] = format_days(legacy["Recibido"])
+
+    api = Api()
+    api.export_history = None
+    start = time.perf_counter()
+    api._process_dataframe(df, parsed=True)
+    load_t = time.perf_counter() - start
+
+    sample = api.data.iloc[:min(SAMPLE_RECORDS, n_rows)]
+    tracemalloc.start()
+    records = api._project_records(sample, RAW_RECORD_FIELDS)
+    records_mb = tracemalloc.get_traced_memory()[0] / 1e6 * n_rows / len(sample)
+    tracemalloc.stop()
+    del records
+
+    print(f"{n_rows} rows (load {load_t:.2f}s)")
+    print(f"  object columns + Recibido_date_str  {_mb(legacy):8.1f} MB")
+    print(f"  + raw_records dict list (scaled)     {records_mb:8.1f} MB")
+    print(f"  compact (categories, datetime64)    {_mb(api.data):8.1f} MB")
+    for col in api.data.columns:
+        before = legacy[col].memory_usage(deep=True, index=False) / 1e6
+        after = api.data[col].memory_usage(deep=True, index=False) / 1e6
+        print(f"    {col:<18} {before:8.1f} -> {after:6.1f} MB")
+    print(f"    {'Recibido_date_str':<18} "
+          f"{legacy['Recibido_date_str'].memory_usage(deep=True, index=False) / 1e6:8.1f} -> {0:6.1f} MB")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,83 @@
+"""
+Merging escritos by expediente: the previous merge_expedientes (títulos joined
+with repeated += and truncated afterwards) vs listados.merge_records (títulos
+collected in lists, only the displayed prefix joined) and
+listados.merge_listados (vectorized over the listados table).
+
+    python -m benchmarks.bench_merge [n_rows ...]
+
+The synthetic data is Zipf-skewed, so a few expedientes carry hundreds or
+thousands of filings. Cases: the whole table merged at once ("repartidas")
+and consecutive listados of 15 merged separately ("continuas"). All versions
+must produce the same rows.
+"""
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import forum_rows
+from listados import (
+    build_listados, listado_rows, merge_records, merge_listados, split_listados, truncate, TITLE_LIMIT,
+)
+
+
+def _legacy_merge(records):
+    merged = {}
+    for row in records:
+        expte = row[1]
+        if expte not in merged:
+            merged[expte] = {"Título": row[0], "Expte": expte, "Recibido": row[2],
+                             "Presentante": row[3], "Días": row[4], "count": 1}
+        else:
+            merged[expte]["count"] += 1
+            merged[expte]["Título"] += f" | {row[0]}"
+    result = []
+    for v in merged.values():
+        suffix = ""
+        if v["count"] > 1:
+            otros = v["count"] - 1
+            suffix = " (+1 otro escrito)" if otros == 1 else f" (+{otros} otros escritos)"
+        titulo = truncate(v["Título"], max(TITLE_LIMIT - len(suffix), 20)) + suffix
+        result.append([titulo, v["Expte"], v["Recibido"], v["Presentante"], v["Días"]])
+    return result
+
+
+def _chunks(rows, size=15):
+    return [rows[i:i + size] for i in range(0, len(rows), size)]
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def run(sizes):
+    for n_rows in sizes:
+        df = pd.DataFrame(forum_rows(n_rows), columns=["Expte", "Título", "Tipo", "Apellido", "Recibido"])
+        df["Recibido"] = pd.to_datetime(df["Recibido"], format="%d/%m/%Y %H:%M:%S")
+        table = build_listados(df)
+        print(f"{n_rows} rows, {table['Expte'].nunique()} expedientes, "
+              f"largest {table['Expte'].value_counts().iloc[0]} escritos")
+
+        # Every version starts from the table, as the exports do
+        legacy_t, expected = _timed(lambda: _legacy_merge(listado_rows(table)))
+        lists_t, (merged, _) = _timed(lambda: merge_records(listado_rows(table)))
+        frame_t, frame = _timed(merge_listados, table)
+        if merged != expected or [list(r) for r in listado_rows(frame)] != expected:
+            raise SystemExit("repartidas: resultados distintos")
+        print(f"  repartidas  legacy {legacy_t * 1000:8.1f} ms  lists {lists_t * 1000:8.1f} ms  "
+              f"table {frame_t * 1000:8.1f} ms")
+
+        legacy_t, expected = _timed(lambda: [_legacy_merge(g) for g in _chunks(listado_rows(table))])
+        lists_t, merged = _timed(lambda: [merge_records(g)[0] for g in _chunks(listado_rows(table))])
+        frame_t, groups = _timed(lambda: split_listados(merge_listados(table, 15)))
+        if merged != expected or [[list(r) for r in g] for g in groups] != expected:
+            raise SystemExit("continuas: resultados distintos")
+        print(f"  continuas   legacy {legacy_t * 1000:8.1f} ms  lists {lists_t * 1000:8.1f} ms  "
+              f"table {frame_t * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 500_000])
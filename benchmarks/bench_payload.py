@@ -0,0 +1,52 @@
+"""
+Time to first paint: read_data shipping every record inline vs summary-first.
+
+    python -m benchmarks.bench_payload [n_rows ...]
+
+pywebview marshals the return value with json.dumps before the dashboard can
+render, so the measure is read_data + serialization of what crosses the
+bridge. The inline variant re-adds the full record list the old payload had.
+"""
+import json
+import sys
+import time
+
+from backend import Api, RAW_RECORD_FIELDS
+from benchmarks.synthetic import cached_workbook
+
+DEFAULT_SIZES = [10_000, 100_000]
+
+
+def _first_paint(path, inline):
+    api = Api()
+    start = time.perf_counter()
+    payload = api.read_data(path)
+    if inline:
+        payload["raw_records"] = api._project_records(api.data, RAW_RECORD_FIELDS)
+    body = json.dumps(payload)
+    return api, time.perf_counter() - start, len(body)
+
+
+def _all_pages(api):
+    start = time.perf_counter()
+    offset = 0
+    while offset is not None:
+        page = api.get_records_page(api.dataset_id, offset)
+        json.dumps(page)
+        offset = page["next_offset"]
+    return time.perf_counter() - start
+
+
+def run(sizes):
+    for n_rows in sizes:
+        path = cached_workbook(n_rows)
+        _, inline_t, inline_bytes = _first_paint(path, inline=True)
+        api, summary_t, summary_bytes = _first_paint(path, inline=False)
+        pages_t = _all_pages(api)
+        print(f"{n_rows:>9} rows  inline {inline_t:6.2f} s / {inline_bytes / 1e6:7.2f} MB   "
+              f"summary-first {summary_t:6.2f} s / {summary_bytes / 1e3:7.1f} kB   "
+              f"(records streamed afterwards in {pages_t:.2f} s)")
+
+
+if __name__ == "__main__":
+    run([int(a) for a in sys.argv[1:]] or DEFAULT_SIZES)
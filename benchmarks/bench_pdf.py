@@ -0,0 +1,120 @@
+"""
+PDF listados rendering: the previous per-export ReportLab loop (style sheet,
+TableStyle and one stripe command per row rebuilt for every listado) vs
+pdf_render.render_listados_pdf.
+
+    python -m benchmarks.bench_pdf [n_rows_for_full_dump]
+
+Two cases: 50 proveyentes x 15 escritos ("Fechas repartidas"), and every row
+of the dataset in listados of 15 ("Fechas continuas", defaults to 20k rows).
+Both renderers must produce the same number of pages. Most of the time is
+ReportLab drawing the cells, which neither version can avoid.
+"""
+import re
+import sys
+import time
+from io import BytesIO
+
+import pandas as pd
+
+from backend import Api
+from benchmarks.synthetic import forum_rows
+from listados import build_listados, listado_rows
+from pdf_render import render_listados_pdf
+
+
+def _legacy_render(target, groups, label):
+    from reportlab import rl_config
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+
+    # Previous default: page streams ASCII85-encoded (pdf_render turns it off)
+    use_a85 = rl_config.useA85
+    rl_config.useA85 = 1
+    doc = SimpleDocTemplate(target, pagesize=A4)
+    elements = []
+    styles = getSampleStyleSheet()
+    for i, group in enumerate(groups):
+        elements.append(Paragraph(f"Listado {i+1} <small>({label})</small>", styles['Heading2']))
+        if not group:
+            elements.append(Paragraph("Sin registros asignados.", styles['Normal']))
+        else:
+            data = [["Título", "Expediente", "Fecha", "Presentante", "Días corridos"]]
+            for row in group:
+                titulo = row[0]
+                if len(titulo) > 42:
+                    titulo = titulo[:42] + "..."
+                presentante = row[3]
+                if presentante and len(presentante) > 15:
+                    presentante = presentante[:15] + "..."
+                data.append([titulo, row[1], row[2], presentante, row[4]])
+            page_width = A4[0]
+            col_widths = [page_width * 0.32, page_width * 0.17, page_width * 0.10,
+                          page_width * 0.15, page_width * 0.15]
+            table = Table(data, repeatRows=1, colWidths=col_widths)
+            table_style = [
+                ('BACKGROUND', (0,0), (-1,0), colors.lightgrey),
+                ('TEXTCOLOR', (0,0), (-1,0), colors.black),
+                ('ALIGN', (0,0), (0,-1), 'LEFT'),
+                ('ALIGN', (1,0), (-1,-1), 'CENTER'),
+                ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+                ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0,1), (0,-1), 7),
+                ('FONTSIZE', (1,1), (2,-1), 10),
+                ('FONTSIZE', (3,1), (3,-1), 7),
+                ('FONTSIZE', (4,1), (4,-1), 10),
+                ('FONTSIZE', (0,0), (-1,0), 10),
+                ('BOTTOMPADDING', (0,0), (-1,0), 8),
+                ('VALIGN', (0,1), (-1,-1), 'TOP'),
+                ('WORDWRAP', (0,1), (0,-1), 'CJK'),
+            ]
+            for row_idx in range(1, len(data)):
+                if row_idx % 2 == 1:
+                    table_style.append(('BACKGROUND', (0,row_idx), (-1,row_idx), colors.whitesmoke))
+            table.setStyle(TableStyle(table_style))
+            elements.append(table)
+        elements.append(Spacer(1, 18))
+        if (i + 1) % 2 == 0 and (i + 1) < len(groups):
+            elements.append(PageBreak())
+    try:
+        doc.build(elements)
+    finally:
+        rl_config.useA85 = use_a85
+
+
+def _pages(pdf_bytes):
+    return len(re.findall(rb"/Type /Page\b", pdf_bytes))
+
+
+def _timed(render, *args):
+    out = BytesIO()
+    start = time.perf_counter()
+    render(out, *args)
+    return time.perf_counter() - start, _pages(out.getvalue())
+
+
+def run(n_rows):
+    df = pd.DataFrame(forum_rows(n_rows), columns=["Expte", "Título", "Tipo", "Apellido", "Recibido"])
+    df["Recibido"] = pd.to_datetime(df["Recibido"], format="%d/%m/%Y %H:%M:%S")
+    rows = listado_rows(build_listados(df))
+    api = Api()
+
+    repartidas = api.assign_proveyentes(rows[:50 * 15], 50)
+    continuas = [api.merge_expedientes(rows[i:i + 15]) for i in range(0, len(rows), 15)]
+    cases = [
+        ("50 x 15 repartidas", repartidas, "Fechas repartidas", "repartidas"),
+        (f"{n_rows} filas continuas", continuas, "Fechas continuas", "continuas"),
+    ]
+    for name, groups, label, mode in cases:
+        old_t, old_pages = _timed(_legacy_render, groups, label)
+        new_t, new_pages = _timed(render_listados_pdf, groups, mode)
+        if old_pages != new_pages:
+            raise SystemExit(f"{name}: {old_pages} páginas antes, {new_pages} ahora")
+        print(f"{name:<24} {len(groups):>5} listados {new_pages:>5} pages  "
+              f"legacy {old_t:7.2f}s  shared renderer {new_t:7.2f}s  ({old_t / new_t:4.1f}x)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
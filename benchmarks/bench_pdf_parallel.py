@@ -0,0 +1,78 @@
+"""
+Parallel PDF listados: render_listados_parallel (chunks of pages in a process
+pool, merged with pypdf) and render_listados_files (one PDF per listado) at
+1/2/4/8 workers.
+
+    python -m benchmarks.bench_pdf_parallel [n_rows]
+
+Every row of a synthetic dataset goes into listados of 15 ("Fechas continuas",
+defaults to 50k rows). The merged PDF must have the same page count as the
+serial one. Scaling is bounded by the cores of the machine (reported).
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from backend import Api
+from benchmarks.synthetic import forum_rows
+from listados import build_listados, listado_rows
+from pdf_render import (
+    render_listados_pdf, render_listados_parallel, render_listados_files, listado_file_names, can_merge,
+)
+
+WORKERS = [1, 2, 4, 8]
+
+
+def _page_count(path):
+    from pypdf import PdfReader
+    return len(PdfReader(path).pages)
+
+
+def run(n_rows):
+    if not can_merge():
+        raise SystemExit("pypdf no está instalado: el modo paralelo exporta en serie")
+    df = pd.DataFrame(forum_rows(n_rows), columns=["Expte", "Título", "Tipo", "Apellido", "Recibido"])
+    df["Recibido"] = pd.to_datetime(df["Recibido"], format="%d/%m/%Y %H:%M:%S")
+    rows = listado_rows(build_listados(df))
+    api = Api()
+    groups = [api.merge_expedientes(rows[i:i + 15]) for i in range(0, len(rows), 15)]
+    print(f"{n_rows} rows, {len(groups)} listados, {os.cpu_count()} CPUs")
+
+    directory = tempfile.mkdtemp(prefix="bench_pdf_")
+    try:
+        serial_path = os.path.join(directory, "serial.pdf")
+        start = time.perf_counter()
+        render_listados_pdf(serial_path, groups, 'continuas')
+        serial_t = time.perf_counter() - start
+        pages = _page_count(serial_path)
+        print(f"  serial story           {serial_t:7.2f}s  {pages} pages")
+
+        for workers in WORKERS:
+            path = os.path.join(directory, f"parallel_{workers}.pdf")
+            start = time.perf_counter()
+            # One worker is the serial build (no pool, no merge)
+            render_listados_parallel(path, groups, 'continuas', workers=workers)
+            merged_t = time.perf_counter() - start
+            if _page_count(path) != pages:
+                raise SystemExit(f"{workers} workers: distinta cantidad de páginas")
+
+            files_dir = os.path.join(directory, f"files_{workers}")
+            os.mkdir(files_dir)
+            paths = [os.path.join(files_dir, name) for name in listado_file_names("bench", len(groups))]
+            start = time.perf_counter()
+            render_listados_files(paths, groups, 'continuas', workers=workers)
+            files_t = time.perf_counter() - start
+
+            label = f"{workers} worker{'s' if workers > 1 else ''}"
+            print(f"  {label:<20}  merged {merged_t:7.2f}s ({serial_t / merged_t:4.2f}x)  "
+                  f"one file per listado {files_t:7.2f}s")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
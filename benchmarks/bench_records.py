@@ -0,0 +1,128 @@
+"""
+Record serialization microbenchmark: the previous iterrows() loops vs the
+columnar projection (Api._project_records).
+
+    python -m benchmarks.bench_records [n_rows ...]
+
+Before timing, the outputs of both implementations are compared as JSON and
+the script aborts if they differ by a single byte.
+"""
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend import Api, RAW_RECORD_FIELDS
+from benchmarks.synthetic import forum_rows
+
+DEFAULT_SIZES = [10_000, 100_000]
+
+
+def _with_date_str(data):
+    # The old _process_dataframe stored the day label as a column; records read it from there
+    if 'Recibido' not in data.columns or 'Recibido_date_str' in data.columns:
+        return data
+    data = data.copy()
+    data['Recibido_date_str'] = data['Recibido'].dt.strftime('%d/%m/%Y')
+    return data
+
+
+def _legacy_raw_records(data):
+    data = _with_date_str(data)
+    raw_records = []
+    for _, row in data.iterrows():
+        recibido_val = row.get('Recibido')
+        if pd.notna(recibido_val):
+            if isinstance(recibido_val, pd.Timestamp):
+                recibido_str = recibido_val.strftime('%Y-%m-%d %H:%M:%S')
+            else:
+                recibido_str = str(recibido_val)
+        else:
+            recibido_str = None
+        raw_records.append({
+            "expte": str(row.get('Expte', 'N/A')),
+            "titulo": str(row.get('Título', 'N/A')),
+            "tipo": str(row.get('Tipo', 'N/A')),
+            "presentante": str(row.get('Apellido', 'N/A')),
+            "fecha": str(row.get('Recibido_date_str', 'N/A')) if 'Recibido_date_str' in row and pd.notna(row.get('Recibido_date_str')) else 'N/A',
+            "recibido": recibido_str
+        })
+    return raw_records
+
+
+def _legacy_records(filtered):
+    filtered = _with_date_str(filtered)
+    records = []
+    for _, row in filtered.iterrows():
+        tipo = str(row.get('Tipo', 'N/A'))
+        is_escrito = 'escrito' in tipo.lower() if tipo != 'N/A' else False
+        records.append({
+            "expte": str(row.get('Expte', 'N/A')),
+            "titulo": str(row.get('Título', 'N/A')),
+            "tipo": tipo,
+            "tipo_class": "escrito" if is_escrito else "proyecto",
+            "presentante": str(row.get('Apellido', 'N/A')),
+            "fecha": str(row.get('Recibido_date_str', 'N/A'))
+        })
+    return records
+
+
+def make_frame(n_rows, seed=0):
+    """
+    Processed-looking frame with a sprinkle of missing values in every column.
+    """
+    df = pd.DataFrame(forum_rows(n_rows, seed=seed), columns=["Expte", "Título", "Tipo", "Apellido", "Recibido"])
+    df["Recibido"] = pd.to_datetime(df["Recibido"], format="%d/%m/%Y %H:%M:%S")
+    rng = np.random.default_rng(seed)
+    for col in df.columns:
+        df.loc[rng.random(n_rows) < 0.01, col] = np.nan
+    df.loc[rng.random(n_rows) < 0.01, "Expte"] = 12345
+    return df
+
+
+def check_identical(df):
+    api = Api()
+    cases = {
+        "raw_records": (_legacy_raw_records(df), api._project_records(df, RAW_RECORD_FIELDS)),
+        "raw_records (sin Recibido)": (
+            _legacy_raw_records(df.drop(columns="Recibido")),
+            api._project_records(df.drop(columns="Recibido"), RAW_RECORD_FIELDS),
+        ),
+        "records": (_legacy_records(df), api._project_records(df)),
+        "records (categorías)": (_legacy_records(df), api._project_records(Api._compact(df))),
+        "records (sin Recibido)": (
+            _legacy_records(df.drop(columns="Recibido")),
+            api._project_records(df.drop(columns="Recibido")),
+        ),
+    }
+    for name, (old, new) in cases.items():
+        if json.dumps(old, ensure_ascii=False) != json.dumps(new, ensure_ascii=False):
+            raise SystemExit(f"{name}: la proyección columnar difiere de la versión con iterrows")
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def run(sizes):
+    api = Api()
+    for n_rows in sizes:
+        df = make_frame(n_rows)
+        check_identical(df.head(5000))
+        legacy_df = _with_date_str(df)  # computed at load time before, not per call
+        for name, legacy, columnar in (
+            ("raw_records", _legacy_raw_records, lambda d: api._project_records(d, RAW_RECORD_FIELDS)),
+            ("records", _legacy_records, api._project_records),
+        ):
+            old = _timed(legacy, legacy_df)
+            new = _timed(columnar, df)
+            print(f"{n_rows:>9} rows  {name:<12} iterrows {old / n_rows * 1e6:7.2f} us/row  "
+                  f"columnar {new / n_rows * 1e6:7.2f} us/row  ({old / new:5.1f}x)")
+
+
+if __name__ == "__main__":
+    run([int(a) for a in sys.argv[1:]] or DEFAULT_SIZES)
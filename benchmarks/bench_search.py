@@ -0,0 +1,67 @@
+"""
+search_records latency: the search index vs the previous str.contains scans.
+
+    python -m benchmarks.bench_search [n_rows]
+
+Defaults to 500k records; reports the index build time and per-query latency
+(median and worst of several runs) for a mix of typical dashboard queries.
+"""
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import forum_rows
+from search_index import SearchIndex
+
+QUERIES = [
+    "sentencia", "solicita", "sol", "transferencia", "acuña", "acuna", "PEÑA",
+    "titulo", "1234", "2023", "12/20", "art. 5", "(", "escrito elec", "proyecto de res",
+]
+TARGET_MS = 10
+
+
+def _legacy_search(data, query):
+    mask = (
+        data['Expte'].astype(str).str.contains(query, case=False, na=False) |
+        data['Título'].astype(str).str.contains(query, case=False, na=False) |
+        data['Apellido'].astype(str).str.contains(query, case=False, na=False) |
+        data['Tipo'].astype(str).str.contains(query, case=False, na=False)
+    )
+    return data[mask]
+
+
+def _latency_ms(fn, repeat=7):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), max(times)
+
+
+def run(n_rows):
+    df = pd.DataFrame(forum_rows(n_rows), columns=["Expte", "Título", "Tipo", "Apellido", "Recibido"])
+    start = time.perf_counter()
+    index = SearchIndex(df)
+    print(f"{n_rows} rows, index built in {time.perf_counter() - start:.2f} s "
+          f"({len(index.vocabulary)} tokens)")
+    print(f"{'query':<18}{'matches':>9}{'index p50':>11}{'index max':>11}{'contains':>11}")
+    worst = 0.0
+    for query in QUERIES:
+        _, total = index.search(query, limit=50)
+        p50, p_max = _latency_ms(lambda: index.search(query, limit=50))
+        try:
+            legacy, _ = _latency_ms(lambda: _legacy_search(df, query), repeat=1)
+            legacy = f"{legacy:9.1f}ms"
+        except Exception:
+            legacy = "    error"
+        worst = max(worst, p50)
+        print(f"{query:<18}{total:>9}{p50:>9.2f}ms{p_max:>9.2f}ms{legacy:>11}")
+    status = "OK" if worst < TARGET_MS else "ABOVE TARGET"
+    print(f"worst median latency {worst:.2f} ms (target < {TARGET_MS} ms): {status}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
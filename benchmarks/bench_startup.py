@@ -0,0 +1,82 @@
+"""
+Cold start: import time of each module and time until the window shows.
+
+    python -m benchmarks.bench_startup [repeat]
+
+Every measurement runs in a fresh interpreter (best of `repeat`, default 5).
+"import" is the wall time of `import <module>` alone, with whatever it pulls
+in that was not loaded yet; the heavy libraries it leaves loaded are listed.
+"time to window" launches main.py with webview.create_window/start stubbed
+out and stops at webview.start, the moment pywebview would show the window:
+interpreter start-up, imports and Api(). What main.py leaves for later is
+timed after it: the background prewarm, then the first PDF export's import of
+ReportLab.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = [
+    "webview", "numpy", "pandas", "openpyxl", "reportlab.platypus",
+    "perf", "jobs", "assignment", "dataset_cache", "export_history",
+    "ingest", "summary", "search_index", "delta", "listados", "batch_ingest",
+    "excel_export", "pdf_render", "backend", "main",
+]
+HEAVY = ("numpy", "pandas", "openpyxl", "reportlab", "webview")
+
+_IMPORT = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+_WINDOW = """
+import json, runpy, sys, time
+launched = float(sys.argv[1])
+
+def start(func=None, args=None, **kwargs):
+    shown = time.time()
+    t = time.perf_counter()
+    if func is not None:
+        func()
+    prewarm = time.perf_counter() - t
+    t = time.perf_counter()
+    import pdf_render
+    pdf = time.perf_counter() - t
+    print(json.dumps({"window": shown - launched, "prewarm": prewarm, "pdf_import": pdf}))
+    sys.exit(0)
+
+import webview
+webview.create_window = lambda *args, **kwargs: None
+webview.start = start
+runpy.run_path("main.py", run_name="__main__")
+"""
+
+
+def _child(code, *args):
+    out = subprocess.run([sys.executable, "-c", code, *args], cwd=ROOT, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def run(repeat):
+    print(f"import time (best of {repeat}, fresh interpreter)")
+    for module in MODULES:
+        results = [_child(_IMPORT.format(module=module, heavy=HEAVY)) for _ in range(repeat)]
+        best = min(r["seconds"] for r in results)
+        print(f"  {module:<20} {best * 1000:8.1f} ms  loads {', '.join(results[0]['loaded']) or '-'}")
+
+    runs = [_child(_WINDOW, repr(time.time())) for _ in range(repeat)]
+    best = min(runs, key=lambda r: r["window"])
+    print(f"time to window      {best['window'] * 1000:8.1f} ms (process launch to webview.start)")
+    print(f"  then prewarm      {best['prewarm'] * 1000:8.1f} ms (background thread, window already up)")
+    print(f"  first PDF import  {best['pdf_import'] * 1000:8.1f} ms (ReportLab)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
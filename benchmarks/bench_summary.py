@@ -0,0 +1,74 @@
+"""
+Dashboard aggregation: the previous multi-scan code vs summary.summarize.
+
+    python -m benchmarks.bench_summary [n_rows]
+
+Defaults to 1M synthetic rows. Checks both produce the same numbers (the new
+per-day table is chronological, so it is compared by date).
+"""
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from benchmarks.synthetic import forum_rows
+from summary import format_days, summarize
+
+
+def _legacy_summary(data):
+    presentaciones_count = len(data[data['Tipo'].str.contains('escrito', case=False, na=False)])
+    proyectos_count = len(data[data['Tipo'].str.contains('proyecto', case=False, na=False)])
+    oldest_record = data['Recibido'].min()
+    unique_exptes_count = data['Expte'].nunique()
+    transferencias_count = len(data[data['Título'].str.contains('transferencia', case=False, na=False)])
+    most_titles_series = data['Título'].value_counts().head(10)
+    most_titles = [{"Título": str(k), "Cantidad": int(v)} for k, v in most_titles_series.items()]
+    data['Recibido_date_str'] = data['Recibido'].dt.strftime('%d/%m/%Y')
+    presentaciones_by_date = []
+    for date_str, grp in data.groupby('Recibido_date_str'):
+        presentaciones_by_date.append({
+            "Fecha": str(date_str),
+            "Escritos": int(grp['Tipo'].str.contains('escrito', case=False, na=False).sum()),
+            "Proyectos": int(grp['Tipo'].str.contains('proyecto', case=False, na=False).sum()),
+            "Total": int(len(grp)),
+        })
+    return {
+        "total_records": len(data),
+        "unique_exptes_count": int(unique_exptes_count),
+        "presentaciones_count": presentaciones_count,
+        "proyectos_count": proyectos_count,
+        "oldest_record": oldest_record.strftime("%d/%m/%Y"),
+        "transferencias_count": transferencias_count,
+        "most_titles": most_titles,
+        "presentaciones_by_date": presentaciones_by_date,
+    }
+
+
+def run(n_rows):
+    df = pd.DataFrame(forum_rows(n_rows), columns=["Expte", "Título", "Tipo", "Apellido", "Recibido"])
+    df["Recibido"] = pd.to_datetime(df["Recibido"], format="%d/%m/%Y %H:%M:%S")
+
+    start = time.perf_counter()
+    old = _legacy_summary(df.copy())
+    old_t = time.perf_counter() - start
+
+    start = time.perf_counter()
+    day_labels = format_days(df["Recibido"])
+    new = summarize(df, today=datetime.now())
+    new_t = time.perf_counter() - start
+
+    for key, value in old.items():
+        if key == "presentaciones_by_date":
+            same = sorted(value, key=lambda d: d["Fecha"]) == sorted(new[key], key=lambda d: d["Fecha"])
+        else:
+            same = value == new[key]
+        if not same:
+            raise SystemExit(f"{key}: resultados distintos")
+    assert len(day_labels) == n_rows
+
+    print(f"{n_rows} rows: previous {old_t:.2f} s, summarize {new_t:.2f} s ({old_t / new_t:.1f}x)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,270 @@
+"""
+Benchmark suite: every public Api method, headless, on synthetic Forum
+workbooks of several sizes, with JSON baselines to compare against.
+
+    python -m benchmarks.suite run [--sizes 1000,10000,100000] [--repeat 3] [--out results.json]
+    python -m benchmarks.suite compare baseline.json results.json [--threshold 0.2]
+
+`run` times each case (best of --repeat) per workbook size and writes the
+results as JSON. The pywebview window is replaced by a stub: file dialogs
+answer with the synthetic workbook or paths in a scratch directory, and
+evaluate_js/resize do nothing; without pywebview installed a stub module
+stands in for it. The dataset cache, the export history and perf captures
+also live in the scratch directory. "read_data" is a cold parse;
+"read_data_cached" and "read_data_incremental" reload the same file.
+`compare` prints the ratio of every case present in both files and exits
+with status 1 when one is slower than the baseline by more than --threshold
+(and by more than --min-delta seconds, to ignore noise on very fast cases).
+"""
+import argparse
+import base64
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import types
+from datetime import datetime
+from unittest import mock
+
+try:
+    import webview
+except ImportError:  # headless machine: the Api only needs the dialog constants and the window list
+    webview = types.ModuleType("webview")
+    webview.OPEN_DIALOG, webview.FOLDER_DIALOG, webview.SAVE_DIALOG = 10, 20, 30
+    webview.windows = []
+    sys.modules["webview"] = webview
+
+import backend
+from backend import Api
+from benchmarks.synthetic import cached_workbook
+from dataset_cache import DatasetCache
+from export_history import ExportHistory
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_MIN_DELTA = 0.005
+N_PROVEYENTES = 20
+
+
+class StubWindow:
+    """
+    Stand-in for webview.windows[0]: dialogs return preset paths.
+    """
+
+    def __init__(self, directory, open_paths):
+        self.directory = directory
+        self.open_paths = list(open_paths)
+        self.width, self.height = 1200, 933
+
+    def create_file_dialog(self, dialog_type, allow_multiple=False, file_types=(), save_filename='', directory=''):
+        if dialog_type == webview.OPEN_DIALOG:
+            return tuple(self.open_paths if allow_multiple else self.open_paths[:1])
+        if dialog_type == webview.FOLDER_DIALOG:
+            return (tempfile.mkdtemp(dir=self.directory),)
+        return os.path.join(self.directory, save_filename or "salida")
+
+    def evaluate_js(self, script):
+        return None
+
+    def resize(self, width, height):
+        self.width, self.height = width, height
+
+
+def _wait(api, job_id):
+    while api.get_job(job_id)["state"] in ("pending", "running"):
+        time.sleep(0.005)
+    return api.get_job(job_id)
+
+
+def _read(api, cache=False, incremental=False):
+    # Full parse unless the dataset cache or the delta against the loaded file is allowed
+    saved = api.dataset_cache, api.incremental_load
+    api.dataset_cache = saved[0] if cache else None
+    api.incremental_load = incremental
+    try:
+        return api.read_data(api.bench_path)
+    finally:
+        api.dataset_cache, api.incremental_load = saved
+
+
+def _reset_exports(api):
+    # Every repetition of an export starts from the same cursor, with nothing assigned
+    api.export_history.clear()
+    api.last_split_index = 0
+    api.last_assigned_date = None
+    if api._assigned is not None:
+        api._assigned[:] = False
+
+
+def _perf_capture(api):
+    started = api.start_perf_capture()
+    if started["status"] != "ok":
+        return started
+    api.get_records_summary()
+    return api.stop_perf_capture()
+
+
+def _cancelled_job(api):
+    job_id = api.start_job('read_data', {'file_path': api.bench_path})["job_id"]
+    api.cancel_job(job_id)
+    return _wait(api, job_id)
+
+
+# (name, fn(api)) in the order they run; the Api already holds the workbook
+CASES = [
+    ("read_data", _read),
+    ("read_data_cached", lambda api: _read(api, cache=True)),
+    ("read_data_incremental", lambda api: _read(api, incremental=True)),
+    ("get_current_dataset", lambda api: api.get_current_dataset()),
+    ("read_data_batch", lambda api: api.read_data_batch([api.bench_path, api.bench_path])),
+    ("read_file_from_memory", lambda api: api.read_file_from_memory("forum.xlsx", api.bench_base64)),
+    ("get_records_page", lambda api: api.get_records_page(api.dataset_id, 0)),
+    ("get_records_by_date", lambda api: api.get_records_by_date(api.bench_day)),
+    ("get_records_by_title", lambda api: api.get_records_by_title(api.bench_title)),
+    ("get_records_by_expte", lambda api: api.get_records_by_expte(api.bench_expte)),
+    ("search_records", lambda api: api.search_records("solicita gonz", limit=100)),
+    ("get_all_records", lambda api: api.get_all_records(limit=1000, offset=0)),
+    ("get_all_records_sorted", lambda api: api.get_all_records(limit=1000, sort_by='expte', descending=True)),
+    ("get_records_summary", lambda api: api.get_records_summary()),
+    ("create_listados", lambda api: api.create_listados(api.data)),
+    ("save_listados_to_excel", lambda api: api.save_listados_to_excel(
+        api.bench_listados, os.path.join(api.bench_dir, "listados.xlsx"))),
+    ("export_excel", lambda api: api.export_excel()),
+    ("merge_expedientes", lambda api: api.merge_expedientes(api.bench_listados)),
+    ("assign_proveyentes", lambda api: api.assign_proveyentes(
+        api.bench_listados[:N_PROVEYENTES * 15], N_PROVEYENTES)),
+    ("export_pdf", lambda api: api.export_pdf(N_PROVEYENTES)),
+    ("export_pdf_per_proveyente", lambda api: api.export_pdf(N_PROVEYENTES, True)),
+    ("export_pdf_continuous", lambda api: api.export_pdf_continuous("2025-10-02", N_PROVEYENTES)),
+    ("start_job_export_excel", lambda api: _wait(api, api.start_job('export_excel')["job_id"])),
+    ("get_job", lambda api: api.get_job(api.bench_job_id)),
+    ("cancel_job", _cancelled_job),
+    ("get_perf_stats", lambda api: api.get_perf_stats()),
+    ("perf_capture", _perf_capture),
+    ("prewarm", lambda api: api.prewarm()),  # already imported in-process; bench_startup times it cold
+    ("export_static_html", lambda api: api.export_static_html({"html_content": "<html></html>" * 1000})),
+    ("get_window_size", lambda api: api.get_window_size()),
+    ("set_window_size", lambda api: api.set_window_size(1400, 1000)),
+]
+# open_file launches the system viewer, so it is not timed; perf_capture is
+# start_perf_capture + stop_perf_capture around one call
+
+# Cases that move the split cursor: _reset_exports runs before each repetition
+EXPORT_CASES = ("export_pdf", "export_pdf_per_proveyente", "export_pdf_continuous")
+
+
+def _check(name, result):
+    # Jobs report their outcome in "state"; get_job's own status is always ok
+    status = result.get("state", result.get("status", "ok")) if isinstance(result, dict) else "ok"
+    if status not in ("ok", "done", "cancelled"):
+        raise SystemExit(f"{name}: {result.get('message', result)}")
+
+
+def run_size(n_rows, repeat, directory):
+    path = cached_workbook(n_rows)
+    api = Api()
+    api.dataset_cache = DatasetCache(os.path.join(directory, "cache"))
+    api.export_history = ExportHistory(os.path.join(directory, "historial.sqlite3"))
+    api.bench_dir = directory
+    api.bench_path = path
+    with open(path, "rb") as f:
+        api.bench_base64 = base64.b64encode(f.read()).decode()
+
+    results = {}
+    with mock.patch.object(webview, "windows", [StubWindow(directory, [path])]), \
+            mock.patch.object(backend, "default_history_path", lambda: os.path.join(directory, "historial.sqlite3")):
+        loaded = api.read_data(path)
+        api.bench_day = loaded["presentaciones_by_date"][0]["Fecha"]
+        api.bench_title = loaded["most_titles"][0]["Título"]
+        api.bench_expte = str(api.data["Expte"].iloc[0])
+        api.bench_listados = api.create_listados(api.data)
+        api.bench_job_id = _wait(api, api.start_job("export_excel")["job_id"])["job_id"]
+        for name, fn in CASES:
+            best = None
+            for _ in range(repeat):
+                api._records_cache.clear()  # time the drill-downs, not their LRU
+                if name in EXPORT_CASES:
+                    _reset_exports(api)
+                start = time.perf_counter()
+                result = fn(api)
+                elapsed = time.perf_counter() - start
+                _check(name, result)
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = round(best, 6)
+            print(f"  {name:<28} {best * 1000:10.2f} ms", flush=True)
+    api.jobs.shutdown()
+    return results
+
+
+def run(sizes, repeat, out):
+    directory = tempfile.mkdtemp(prefix="bench_suite_")
+    try:
+        results = {}
+        for n_rows in sizes:
+            print(f"{n_rows} rows")
+            results[str(n_rows)] = run_size(n_rows, repeat, directory)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Resultados en {out}")
+
+
+def compare(baseline_path, current_path, threshold, min_delta):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    with open(current_path, encoding="utf-8") as f:
+        current = json.load(f)["results"]
+    regressions = 0
+    for size in sorted(set(baseline) & set(current), key=int):
+        print(f"{size} rows")
+        for name, before in baseline[size].items():
+            after = current[size].get(name)
+            if after is None:
+                continue
+            ratio = f"{after / before:5.2f}x" if before else "    -"
+            slower = after > before * (1 + threshold) and after - before > min_delta
+            regressions += slower
+            flag = "  REGRESIÓN" if slower else ""
+            print(f"  {name:<28} {before * 1000:10.2f} -> {after * 1000:10.2f} ms  {ratio}{flag}")
+    print(f"{regressions} regresiones (umbral {threshold:.0%})")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="medir y guardar resultados JSON")
+    run_parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                            help="filas por libro, separadas por coma (1000 a 1000000)")
+    run_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    run_parser.add_argument("--out", default="benchmark_results.json")
+    compare_parser = commands.add_parser("compare", help="comparar contra una línea de base")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    compare_parser.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        run([int(size) for size in args.sizes.split(",")], args.repeat, args.out)
+        return 0
+    return compare(args.baseline, args.current, args.threshold, args.min_delta)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Synthetic Forum-shaped workbooks for benchmarking.
+
+The generated sheet mimics the Forum Institucional export: 8 preamble rows,
+then a header with Expte/Título/Tipo/Apellido/Recibido and one row per escrito.
+Expedientes and títulos follow skewed (Zipf-like) distributions, as in real
+courts where a few causes and a few request types concentrate most filings.
+"""
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import numpy as np
+from openpyxl import Workbook
+
+TITULOS = [
+    "Solicita se dicte sentencia",
+    "Acompaña documental",
+    "Solicita libramiento de oficio",
+    "Contesta traslado",
+    "Solicita transferencia de fondos",
+    "Interpone recurso de apelación",
+    "Solicita embargo preventivo",
+    "Denuncia domicilio",
+    "Acredita diligenciamiento de cédula",
+    "Solicita audiencia",
+    "Practica liquidación",
+    "Solicita apertura a prueba",
+    "Presenta alegatos",
+    "Solicita regulación de honorarios",
+    "Desiste de la acción",
+    "Solicita caducidad de instancia",
+    "Adjunta bono ley 5.000",
+    "Solicita se tenga presente",
+    "Acompaña oficio diligenciado",
+    "Solicita certificado",
+]
+TIPOS = ["Escrito", "Escrito electrónico", "Proyecto de providencia", "Proyecto de resolución"]
+APELLIDOS = [
+    "González", "Rodríguez", "Gómez", "Fernández", "López", "Díaz", "Martínez",
+    "Pérez", "Romero", "Sánchez", "Núñez", "Benítez", "Acuña", "Ojeda", "Ibáñez",
+    "Peña", "Muñoz", "Cáceres", "Sotelo", "Zárate",
+]
+PREAMBLE = [
+    ["Poder Judicial de la Provincia de Corrientes"],
+    ["Forum Institucional"],
+    ["Juzgado Civil y Comercial N° 1"],
+    ["Listado de escritos recibidos"],
+    ["Estado: Pendientes de proveer"],
+    [],
+    ["Generado:", datetime(2025, 10, 1, 8, 0).strftime("%d/%m/%Y %H:%M")],
+    [],
+]
+HEADER = ["Expte", "Título", "Tipo", "Apellido", "Recibido"]
+
+
+def _zipf_choice(rng, n_items, size, a=1.3):
+    ranks = np.arange(1, n_items + 1)
+    weights = 1.0 / ranks ** a
+    weights /= weights.sum()
+    return rng.choice(n_items, size=size, p=weights)
+
+
+def forum_rows(n_rows, seed=0, days=365, end=datetime(2025, 10, 1)):
+    """
+    Return the data rows (without preamble/header) of a synthetic Forum export.
+    """
+    rng = np.random.default_rng(seed)
+    n_exptes = max(10, n_rows // 3)
+    expte_numbers = rng.integers(1000, 99999, size=n_exptes)
+    expte_years = rng.integers(2015, 2026, size=n_exptes)
+    exptes = [f"{num}/{year}" for num, year in zip(expte_numbers, expte_years)]
+
+    expte_idx = _zipf_choice(rng, n_exptes, n_rows, a=1.1)
+    titulo_idx = _zipf_choice(rng, len(TITULOS), n_rows)
+    tipo_idx = rng.choice(len(TIPOS), size=n_rows, p=[0.55, 0.2, 0.15, 0.1])
+    apellido_idx = rng.integers(0, len(APELLIDOS), size=n_rows)
+    start = end - timedelta(days=days)
+    seconds = np.sort(rng.integers(0, days * 86400, size=n_rows))
+
+    rows = []
+    for i in range(n_rows):
+        recibido = start + timedelta(seconds=int(seconds[i]))
+        rows.append([
+            exptes[expte_idx[i]],
+            TITULOS[titulo_idx[i]],
+            TIPOS[tipo_idx[i]],
+            APELLIDOS[apellido_idx[i]],
+            recibido.strftime("%d/%m/%Y %H:%M:%S"),
+        ])
+    return rows
+
+
+def write_forum_workbook(path, n_rows, seed=0, preamble=True, rows=None):
+    """
+    Write a Forum-shaped .xlsx with n_rows escritos to path (or the given rows).
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Hoja1")
+    if preamble:
+        for row in PREAMBLE:
+            ws.append(row)
+    ws.append(HEADER)
+    for row in forum_rows(n_rows, seed=seed) if rows is None else rows:
+        ws.append(row)
+    wb.save(path)
+    return path
+
+
+def cached_workbook(n_rows, seed=0, directory=None):
+    """
+    Path to a synthetic workbook with n_rows, generating it only once per size.
+    """
+    directory = directory or os.path.join(tempfile.gettempdir(), "listados_bench")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"forum_{n_rows}_{seed}.xlsx")
+    if not os.path.exists(path):
+        write_forum_workbook(path, n_rows, seed=seed)
+    return path
@@ -0,0 +1,136 @@
+"""
+Headless batch mode: load Forum exports and write the listados without the
+window, e.g. from a scheduled task on a server with no display.
+
+    python cli.py forum.xlsx -n 12 --pdf proveyentes.pdf --excel listado.xlsx
+    python cli.py exports/ -n 12 --modo continuas --pdf hoy.pdf --pdf manana.pdf
+
+Several inputs (files or folders of .xlsx) are loaded as one dataset, as
+with "Unir varios archivos". Every export runs over that single parse. In
+continuous mode each --pdf takes the next batch, resuming where the last
+export of the same file stopped (export history). pywebview is never
+imported: every path is given here, so the Api never opens a dialog.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+from datetime import datetime
+
+from backend import Api, PDF_PREFIXES
+
+# pandas, openpyxl and ReportLab are imported by the Api when a read or an
+# export needs them: argument errors and --help answer at once, and an
+# --excel-only run never loads ReportLab
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python cli.py",
+        description="Genera listados de escritos de uno o varios archivos Forum sin abrir la ventana.",
+    )
+    parser.add_argument("inputs", nargs="+", metavar="ENTRADA",
+                        help="archivos .xlsx de Forum o carpetas que los contienen")
+    parser.add_argument("-n", "--proveyentes", type=int, help="cantidad de proveyentes (listados por PDF)")
+    parser.add_argument("--modo", choices=sorted(PDF_PREFIXES), default="repartidas",
+                        help="fechas repartidas (por defecto) o continuas")
+    parser.add_argument("--pdf", action="append", default=[], metavar="RUTA",
+                        help="PDF a generar; se puede repetir (en modo continuas cada uno toma el lote siguiente)")
+    parser.add_argument("--excel", action="append", default=[], metavar="RUTA",
+                        help="Excel con todos los listados")
+    parser.add_argument("--por-proveyente", action="store_true",
+                        help="un PDF por listado; cada RUTA de --pdf es una carpeta")
+    parser.add_argument("--por-listado", type=int, default=15, help="escritos por listado en modo continuas")
+    parser.add_argument("--desde", default=datetime.now().strftime("%Y-%m-%d"),
+                        help="fecha de referencia de los listados continuos (por defecto hoy)")
+    parser.add_argument("--sin-historial", action="store_true",
+                        help="no retomar ni registrar exportaciones en el historial")
+    parser.add_argument("--sin-cache", action="store_true", help="no usar la caché de archivos ya procesados")
+    parser.add_argument("--json", action="store_true", help="resultado en JSON por la salida estándar")
+    parser.add_argument("-v", "--verbose", action="count", default=0, help="más detalle (-vv: cada etapa)")
+    args = parser.parse_args(argv)
+    if not args.pdf and not args.excel:
+        parser.error("indique al menos una salida (--pdf o --excel)")
+    if (args.pdf and not args.proveyentes) or (args.proveyentes is not None and args.proveyentes < 1):
+        parser.error("--pdf necesita --proveyentes mayor que cero")
+    return args
+
+
+def run_exports(api, args):
+    """
+    The requested exports, in order, over the loaded dataset: [(kind, path, response)].
+    """
+    results = []
+    for path in args.excel:
+        results.append(("excel", path, api.export_excel(save_path=path)))
+    for path in args.pdf:
+        if args.por_proveyente:
+            os.makedirs(path, exist_ok=True)
+        if args.modo == "repartidas":
+            response = api.export_pdf(args.proveyentes, args.por_proveyente, save_path=path)
+        else:
+            response = api.export_pdf_continuous(args.desde, args.proveyentes, args.por_listado,
+                                                 args.por_proveyente, save_path=path)
+        results.append((args.modo, path, response))
+    return results
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    level = {0: logging.WARNING, 1: logging.INFO}.get(args.verbose, logging.DEBUG)
+    logging.basicConfig(level=level, format="%(levelname)s %(name)s: %(message)s")
+
+    api = Api()
+    api.perf.enabled = args.verbose > 1
+    if args.sin_cache:
+        api.dataset_cache = None
+    if args.sin_historial:
+        api.export_history = None
+    try:
+        from batch_ingest import list_workbooks
+        paths = list_workbooks(args.inputs)
+        if not paths:
+            print("No se encontraron archivos .xlsx en las entradas indicadas.", file=sys.stderr)
+            return 2
+        missing = [path for path in paths if not os.path.isfile(path)]
+        if missing:
+            print(f"No existe: {', '.join(missing)}", file=sys.stderr)
+            return 2
+        try:
+            loaded = api.read_data(paths[0]) if len(paths) == 1 else api.read_data_batch(paths)
+        except Exception as e:  # the GUI only offers files that exist; here they may be anything
+            loaded = {"status": "error", "message": str(e)}
+        if loaded.get("status") != "ok":
+            print(f"Error al leer: {loaded.get('message')}", file=sys.stderr)
+            return 1
+        results = run_exports(api, args)
+    finally:
+        api.jobs.shutdown()
+
+    failed = [response for _, _, response in results if response.get("status") != "ok"]
+    if args.json:
+        json.dump({
+            "inputs": paths,
+            "total_records": loaded.get("total_records"),
+            "cursor": loaded.get("cursor"),
+            "exports": [{"kind": kind, "path": path, **response} for kind, path, response in results],
+        }, sys.stdout, ensure_ascii=False, default=str)
+        print()
+    else:
+        print(f"{loaded.get('total_records')} escritos leídos de {len(paths)} archivo(s)")
+        for kind, path, response in results:
+            if response.get("status") != "ok":
+                print(f"  {kind:<10} {path}: ERROR {response.get('message')}")
+                continue
+            detail = f" (hasta el {response['last_assigned_date']})" if "last_assigned_date" in response else ""
+            files = response.get("files") or [path]
+            print(f"  {kind:<10} {path}: {len(files)} archivo(s){detail}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    # PDF and ingest worker processes re-run this module when frozen
+    multiprocessing.freeze_support()
+    sys.exit(main())
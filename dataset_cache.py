@@ -0,0 +1,176 @@
+"""
+On-disk cache of parsed Forum datasets.
+
+Each entry is keyed by the SHA-256 of the .xlsx bytes plus PARSER_VERSION, so
+re-opening the same export (next launch, after a crash...) skips the Excel
+parse entirely. Entries are stored column by column as .npy files, which are
+memory-mapped on load: dates as int64 nanoseconds, numbers as they are, and
+text columns dictionary-encoded (int32 codes + the distinct values in
+meta.json), which come back as categoricals over those codes. Old entries are
+evicted least-recently-used when the cache grows beyond its size budget.
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+# Bump whenever ingest/date parsing changes what a parsed frame looks like
+PARSER_VERSION = 1
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+_CHUNK = 1024 * 1024
+_JSON_TYPES = (str, int, float, bool)
+
+
+def default_cache_dir():
+    """
+    Per-user cache directory (LOCALAPPDATA on Windows, XDG cache elsewhere).
+    LISTADOS_CACHE_DIR overrides it.
+    """
+    if os.environ.get("LISTADOS_CACHE_DIR"):
+        return os.environ["LISTADOS_CACHE_DIR"]
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "ListadoEscritos", "cache")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Caches/ListadoEscritos")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "listado_escritos")
+
+
+def content_key(source):
+    """
+    Cache key for a workbook given as a path or as its bytes.
+    """
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+    else:
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK), b""):
+                digest.update(chunk)
+    return f"{digest.hexdigest()}-v{PARSER_VERSION}"
+
+
+class DatasetCache:
+    """
+    Size-bounded LRU cache of parsed frames, one directory per entry.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def _entry(self, key):
+        return os.path.join(self.directory, key)
+
+    def load(self, key):
+        """
+        Return (DataFrame, extra metadata) for key, or None on a miss.
+        """
+        # Imported here: creating the cache (Api() at startup) must stay cheap
+        import numpy as np
+        import pandas as pd
+
+        entry = self._entry(key)
+        meta_path = os.path.join(entry, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        columns = {}
+        for i, col in enumerate(meta["columns"]):
+            data = np.load(os.path.join(entry, f"col_{i}.npy"), mmap_mode="r")
+            if col["kind"] == "datetime":
+                columns[col["name"]] = pd.Series(data.view("datetime64[ns]"), copy=False)
+            elif col["kind"] == "text":
+                # Categorical straight over the stored codes; code -1 reads as NaN
+                values = pd.Index(col["values"], dtype=object)
+                columns[col["name"]] = pd.Series(pd.Categorical.from_codes(data, values), copy=False)
+            else:
+                columns[col["name"]] = pd.Series(data, copy=False)
+        df = pd.DataFrame(columns, columns=[c["name"] for c in meta["columns"]])
+        # Mark as recently used for the LRU eviction
+        os.utime(meta_path)
+        return df, meta.get("extra", {})
+
+    def store(self, key, df, extra=None):
+        """
+        Write df under key. Frames with values that cannot be encoded
+        (e.g. dates mixed into a text column) are simply not cached.
+        """
+        import numpy as np
+        import pandas as pd
+
+        entry = self._entry(key)
+        if os.path.exists(entry):
+            return False
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f"{entry}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        try:
+            columns = []
+            for i, name in enumerate(df.columns):
+                series = df[name]
+                path = os.path.join(tmp, f"col_{i}.npy")
+                if pd.api.types.is_datetime64_dtype(series):
+                    np.save(path, series.to_numpy(dtype="datetime64[ns]").view(np.int64))
+                    columns.append({"name": name, "kind": "datetime"})
+                elif series.dtype == object or isinstance(series.dtype, pd.CategoricalDtype):
+                    codes, uniques = pd.factorize(series, sort=False)
+                    values = uniques.tolist()
+                    if not all(isinstance(v, _JSON_TYPES) for v in values):
+                        shutil.rmtree(tmp, ignore_errors=True)
+                        return False
+                    np.save(path, codes.astype(np.int32))
+                    columns.append({"name": name, "kind": "text", "values": values})
+                else:
+                    np.save(path, series.to_numpy())
+                    columns.append({"name": name, "kind": "array"})
+            meta = {
+                "parser_version": PARSER_VERSION,
+                "rows": len(df),
+                "created": time.time(),
+                "columns": columns,
+                "extra": extra or {},
+            }
+            with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(tmp, entry)
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self.evict()
+        return True
+
+    def _entries(self):
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for name in os.listdir(self.directory):
+            entry = os.path.join(self.directory, name)
+            meta_path = os.path.join(entry, "meta.json")
+            if not os.path.exists(meta_path):
+                continue
+            size = sum(
+                os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry)
+            )
+            entries.append((os.path.getmtime(meta_path), size, entry))
+        return entries
+
+    def evict(self):
+        """
+        Remove least-recently-used entries until the cache fits max_bytes.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
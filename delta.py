@@ -0,0 +1,56 @@
+"""
+Incremental reload of a newer Forum export of the same backlog.
+
+Daily exports mostly repeat the previous day's pending escritos. Rows are
+matched by a stable key, the (Expte, Título, Recibido) hash of
+export_history.escrito_keys plus the occurrence number for exact
+duplicates. The diff gives the removed rows (proveídos since) and the added
+ones, and only those go through the summary counters and to the frontend.
+The rest of a load still costs as much as a full one: the file is read and
+parsed whole, and the Api rebuilds its hash indexes, Recibido day index and
+search index over the new frame (sort orders are rebuilt on demand).
+"""
+import numpy as np
+import pandas as pd
+
+from export_history import escrito_keys
+
+# Below this share of rows in common a full reload is simpler and as fast
+MIN_OVERLAP = 0.5
+_OCCURRENCE = np.uint64(0x9E3779B97F4A7C15)
+
+
+def row_keys(data, keys=None):
+    """
+    Unique int64 key per row: escrito_keys (pass them if already computed),
+    told apart for repeated rows.
+    """
+    if keys is None:
+        keys = escrito_keys(data)
+    occurrence = pd.Series(keys).groupby(keys, sort=False).cumcount().to_numpy(dtype=np.uint64)
+    return (keys.view(np.uint64) + occurrence * _OCCURRENCE).view(np.int64)
+
+
+def diff_rows(old_keys, new_keys):
+    """
+    (removed, added) row positions between two frames keyed by row_keys:
+    rows of the old frame missing from the new one, and rows of the new frame
+    missing from the old one. None when the frames overlap too little, or when
+    the rows in common are not in the same relative order (the frontend
+    applies the delta by position).
+    """
+    # Old position of every new row (-1 if it is new), through one hash table
+    index = pd.Index(old_keys)
+    if not index.is_unique:  # a 64-bit hash collision: not worth resolving
+        return None
+    positions = index.get_indexer(new_keys)
+    in_old = positions >= 0
+    old_positions = positions[in_old]
+    if not len(new_keys) or len(old_positions) < MIN_OVERLAP * len(new_keys):
+        return None
+    # ... and for the rows in common they must keep increasing
+    if np.any(np.diff(old_positions) <= 0):
+        return None
+    in_new = np.zeros(len(old_keys), dtype=bool)
+    in_new[old_positions] = True
+    return np.flatnonzero(~in_new), np.flatnonzero(~in_old)
@@ -0,0 +1,146 @@
+"""
+Persistent record of the listados already exported, so assignment continues
+where it stopped across restarts and across successive Forum files.
+
+A small SQLite database keeps one row per export run (file content hash,
+consumed index range of the listados table, last Recibido date, number of
+proveyentes) and the key of every escrito assigned so far. The key is the
+(Expte, Título, Recibido) hash plus the occurrence number of identical rows
+(delta.row_keys), so the escritos of an earlier file are recognized in a
+newer, overlapping export without reading the old workbook again, and each
+of two identical escritos is assigned on its own.
+"""
+import os
+import sqlite3
+import sys
+from contextlib import closing
+from datetime import datetime
+
+KEY_COLUMNS = ('Expte', 'Título', 'Recibido')
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    file_key TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    start_index INTEGER NOT NULL,
+    end_index INTEGER NOT NULL,
+    n_proveyentes INTEGER NOT NULL,
+    last_date TEXT,
+    created TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_file ON runs (file_key, id);
+CREATE TABLE IF NOT EXISTS assigned (
+    key INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL
+);
+"""
+
+
+def default_history_path():
+    """
+    Per-user data directory (APPDATA on Windows, XDG data elsewhere).
+    LISTADOS_DATA_DIR overrides it.
+    """
+    if os.environ.get("LISTADOS_DATA_DIR"):
+        base = os.environ["LISTADOS_DATA_DIR"]
+    elif os.name == "nt":
+        base = os.path.join(os.environ.get("APPDATA") or os.path.expanduser("~"), "ListadoEscritos")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support/ListadoEscritos")
+    else:
+        base = os.path.join(os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share"),
+                            "listado_escritos")
+    return os.path.join(base, "historial.sqlite3")
+
+
+def escrito_keys(data):
+    """
+    int64 hash of each row of a loaded frame, from (Expte, Título, Recibido).
+    Identical escritos share it; delta.row_keys tells them apart.
+    """
+    # Imported here: opening the history (Api() at startup) must stay cheap
+    import numpy as np
+    import pandas as pd
+
+    frame = data[list(KEY_COLUMNS)].copy()
+    for col in ('Expte', 'Título'):
+        frame[col] = frame[col].astype(object).where(frame[col].notna(), '').astype(str)
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy().view(np.int64)
+
+
+class ExportHistory:
+    """
+    Export runs and assigned escritos, stored in SQLite at `path`.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_history_path()
+
+    def _connect(self):
+        # One short-lived connection per call: exports run on worker threads
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def record_run(self, file_key, mode, start, end, n_proveyentes, last_date, keys):
+        """
+        Store an export of rows [start, end) of the listados table of file_key,
+        marking `keys` (delta.row_keys of those rows) as assigned.
+        """
+        with closing(self._connect()) as conn, conn:
+            run_id = conn.execute(
+                "INSERT INTO runs (file_key, mode, start_index, end_index, n_proveyentes, last_date, created)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (file_key, mode, int(start), int(end), int(n_proveyentes),
+                 last_date.isoformat() if last_date else None, datetime.now().isoformat(timespec='seconds')),
+            ).lastrowid
+            conn.executemany(
+                "INSERT OR IGNORE INTO assigned (key, run_id) VALUES (?, ?)",
+                ((int(key), run_id) for key in keys),
+            )
+        return run_id
+
+    def last_run(self, file_key):
+        """
+        Latest run of file_key as a dict, None if it was never exported.
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT mode, start_index, end_index, n_proveyentes, last_date, created FROM runs"
+                " WHERE file_key = ? ORDER BY id DESC LIMIT 1",
+                (file_key,),
+            ).fetchone()
+        if row is None:
+            return None
+        mode, start, end, n_proveyentes, last_date, created = row
+        return {
+            "mode": mode,
+            "start": start,
+            "end": end,
+            "n_proveyentes": n_proveyentes,
+            "last_date": datetime.fromisoformat(last_date) if last_date else None,
+            "created": created,
+        }
+
+    def assigned_mask(self, keys):
+        """
+        Boolean array: which of `keys` were assigned by a previous export.
+        """
+        import numpy as np
+
+        with closing(self._connect()) as conn:
+            (n_assigned,) = conn.execute("SELECT COUNT(*) FROM assigned").fetchone()
+            if n_assigned <= len(keys):
+                query = "SELECT key FROM assigned"
+            else:
+                # The table outgrew the frame (it grows with every export): look up only the frame's keys
+                conn.execute("CREATE TEMP TABLE loaded (key INTEGER PRIMARY KEY)")
+                conn.executemany("INSERT INTO loaded (key) VALUES (?)", ((key,) for key in np.unique(keys).tolist()))
+                query = "SELECT key FROM loaded JOIN assigned USING (key)"
+            known = np.fromiter((key for (key,) in conn.execute(query)), dtype=np.int64)
+        return np.isin(keys, known)
+
+    def clear(self):
+        with closing(self._connect()) as conn, conn:
+            conn.executescript("DELETE FROM assigned; DELETE FROM runs;")
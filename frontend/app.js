@@ -116,38 +116,40 @@ function parseSummary(info) {
 }
 
 // ============================================================================
-// Initialize data maps for quick lookups - Updated to store all records
+// Initialize data maps for quick lookups - records arrive page by page
 // ============================================================================
 
 function initializeDataMaps(info) {
+    // A newer export of the loaded file: patch the records already in memory
+    if (info.delta && rawData && rawData.loaded && rawData.datasetId === info.delta.base_dataset_id) {
+        applyRecordsDelta(info.delta);
+        rawData.datasetId = info.dataset_id;
+        return;
+    }
+
     rawData = {
+        datasetId: info.dataset_id || null,
         byDate: new Map(),
         byTitle: new Map(),
-        allRecords: []
+        allRecords: [],
+        loaded: false
     };
     
-    // If we have the full dataset from the backend, use it
+    // Older payloads shipped every record inline
     if (info.raw_records) {
-        rawData.allRecords = info.raw_records;
-        
-        // Build byDate and byTitle maps from raw records
-        info.raw_records.forEach(record => {
-            // Group by date
-            if (!rawData.byDate.has(record.fecha)) {
-                rawData.byDate.set(record.fecha, []);
-            }
-            rawData.byDate.get(record.fecha).push(record);
-            
-            // Group by title
-            if (!rawData.byTitle.has(record.titulo)) {
-                rawData.byTitle.set(record.titulo, []);
-            }
-            rawData.byTitle.get(record.titulo).push(record);
-        });
+        addRecordsToMaps(info.raw_records);
+        rawData.loaded = true;
+        return;
+    }
+    
+    // Summary-first: fetch the records in the background after the first paint
+    if (rawData.datasetId) {
+        loadRecordsIncrementally(rawData.datasetId, info.page_size);
+        return;
     }
     
-    // If we don't have raw records, use presentaciones_by_date as fallback
-    if (info.presentaciones_by_date && rawData.allRecords.length === 0) {
+    // Without records, use presentaciones_by_date as fallback
+    if (info.presentaciones_by_date) {
         info.presentaciones_by_date.forEach(dayData => {
             rawData.byDate.set(dayData.Fecha, {
                 escritos: dayData.Escritos,
@@ -171,6 +173,92 @@ function initializeDataMaps(info) {
     }
 }
 
+function addRecordsToMaps(records) {
+    records.forEach(record => {
+        rawData.allRecords.push(record);
+        groupRecord(record);
+    });
+}
+
+function groupRecord(record) {
+    // Group by date
+    if (!rawData.byDate.has(record.fecha)) {
+        rawData.byDate.set(record.fecha, []);
+    }
+    rawData.byDate.get(record.fecha).push(record);
+    
+    // Group by title
+    if (!rawData.byTitle.has(record.titulo)) {
+        rawData.byTitle.set(record.titulo, []);
+    }
+    rawData.byTitle.get(record.titulo).push(record);
+}
+
+// Drop `records` from the groups of `map` keyed by record[field]
+function ungroupRecords(map, records, field) {
+    const byKey = new Map();
+    records.forEach(record => {
+        if (!byKey.has(record[field])) byKey.set(record[field], new Set());
+        byKey.get(record[field]).add(record);
+    });
+    byKey.forEach((gone, key) => {
+        const group = map.get(key);
+        if (!group) return;
+        const rest = group.filter(record => !gone.has(record));
+        if (rest.length) {
+            map.set(key, rest);
+        } else {
+            map.delete(key);
+        }
+    });
+}
+
+// delta.removed: positions in the previous records; delta.added: [position in the new records, record]
+function applyRecordsDelta(delta) {
+    const removed = new Set(delta.removed);
+    const gone = [];
+    const kept = [];
+    rawData.allRecords.forEach((record, i) => (removed.has(i) ? gone : kept).push(record));
+    ungroupRecords(rawData.byDate, gone, 'fecha');
+    ungroupRecords(rawData.byTitle, gone, 'titulo');
+
+    const all = [];
+    let k = 0;
+    delta.added.forEach(([position, record]) => {
+        while (all.length < position) all.push(kept[k++]);
+        all.push(record);
+        groupRecord(record);
+    });
+    while (k < kept.length) all.push(kept[k++]);
+    rawData.allRecords = all;
+}
+
+async function loadRecordsIncrementally(datasetId, pageSize) {
+    if (!window.pywebview) return;
+    
+    let offset = 0;
+    while (offset !== null && rawData && rawData.datasetId === datasetId) {
+        // Yield first so the dashboard paints before (and between) pages
+        await new Promise(resolve => setTimeout(resolve, 0));
+        let result;
+        try {
+            result = await window.pywebview.api.get_records_page(datasetId, offset, pageSize);
+        } catch (error) {
+            console.error('Error fetching records page:', error);
+            return;
+        }
+        // Stop if the dashboard was cleared or another file was loaded meanwhile
+        if (!result || result.status !== 'ok' || !rawData || rawData.datasetId !== datasetId) {
+            return;
+        }
+        addRecordsToMaps(result.records);
+        offset = result.next_offset;
+    }
+    if (rawData && rawData.datasetId === datasetId) {
+        rawData.loaded = true;
+    }
+}
+
 // ============================================================================
 // Build calendar cache for faster rendering
 // ============================================================================
@@ -2020,6 +2108,117 @@ function showDownloadPopup(filePath, fileType = 'archivo') {
     }, 12000);
 }
 
+// ============================================================================
+// BACKGROUND JOBS - reads and exports run in the backend job pool
+// ============================================================================
+
+const jobListeners = {};
+
+// Called by the backend (evaluate_js) on every progress step of a job
+window.onJobUpdate = function(update) {
+    const listener = jobListeners[update.job_id];
+    if (listener) listener(update);
+};
+
+function showJobProgress(label, onCancel) {
+    const container = document.createElement('div');
+    container.style = `
+        position: fixed;
+        left: 20px;
+        bottom: 20px;
+        z-index: 20000;
+        background: white;
+        color: #1e293b;
+        padding: 16px;
+        border-radius: 12px;
+        box-shadow: 0 10px 30px rgba(0,0,0,0.15);
+        min-width: 320px;
+        border-left: 4px solid #0d6efd;
+    `;
+
+    container.innerHTML = `
+        <div style="display:flex;flex-direction:column;gap:10px;">
+            <div style="display:flex;align-items:center;gap:8px;">
+                <i class="fas fa-spinner fa-spin text-primary"></i>
+                <span style="font-weight:600;">${label}</span>
+            </div>
+            <div class="progress" style="height:8px;">
+                <div class="progress-bar" role="progressbar" style="width:0%"></div>
+            </div>
+            <div class="job-message" style="font-size:0.85rem;color:#64748b;"></div>
+            <div>
+                <button class="btn btn-sm btn-outline-danger">
+                    <i class="fas fa-stop me-1"></i>Cancelar
+                </button>
+            </div>
+        </div>
+    `;
+
+    document.body.appendChild(container);
+
+    const bar = container.querySelector('.progress-bar');
+    const message = container.querySelector('.job-message');
+    const cancelBtn = container.querySelector('button');
+    cancelBtn.onclick = function() {
+        cancelBtn.disabled = true;
+        message.textContent = 'Cancelando...';
+        onCancel();
+    };
+
+    return {
+        update(job) {
+            bar.style.width = `${Math.round((job.progress || 0) * 100)}%`;
+            if (job.message && !cancelBtn.disabled) message.textContent = job.message;
+        },
+        close() {
+            container.remove();
+        }
+    };
+}
+
+// Start a background job and resolve with its result, showing progress meanwhile.
+// `fallback` is the blocking call, for backends without start_job.
+async function runJob(kind, params, label, fallback) {
+    const api = window.pywebview.api;
+    if (typeof api.start_job !== 'function') {
+        return fallback();
+    }
+
+    const started = await api.start_job(kind, params || {});
+    if (!started || started.status !== 'ok' || !started.job_id) {
+        return started;  // dialog cancelled or invalid request: nothing was started
+    }
+
+    const jobId = started.job_id;
+    const progress = showJobProgress(label, () => api.cancel_job(jobId));
+
+    return new Promise(resolve => {
+        let finished = false;
+        let timer = null;
+
+        const onUpdate = job => {
+            if (finished) return;
+            progress.update(job);
+            if (job.state === 'done' || job.state === 'error' || job.state === 'cancelled') {
+                finished = true;
+                clearInterval(timer);
+                delete jobListeners[jobId];
+                progress.close();
+                resolve(job.result || { status: 'error', message: job.message });
+            }
+        };
+
+        jobListeners[jobId] = onUpdate;
+        // Polling too, in case a push is lost or throttled
+        timer = setInterval(async () => {
+            const job = await api.get_job(jobId);
+            if (job && job.status === 'ok') {
+                onUpdate(job);
+            }
+        }, 500);
+    });
+}
+
 // ============================================================================
 // CREATE EXPORT STATIC BUTTON ON LOAD
 // ============================================================================
@@ -2053,18 +2252,33 @@ if (document.readyState === 'loading') {
 // EVENT LISTENERS
 // ============================================================================
 
+function showLoadedData(result) {
+    if (result && result.status === 'ok') {
+        document.getElementById('summary').style.display = 'block';
+        const summary = parseSummary(result);
+        renderDashboard(summary);
+        showActions();
+        updateResumeButton(result.cursor);
+        animateWindowResize(1400, 1000, 400);
+    } else {
+        alert(result.message || 'No se pudo leer el archivo.');
+    }
+}
+
 document.getElementById('selectFileBtn').onclick = async function() {
     if (window.pywebview) {
-        const result = await window.pywebview.api.read_data('');
-        if (result && result.status === 'ok') {
-            document.getElementById('summary').style.display = 'block';
-            const summary = parseSummary(result);
-            renderDashboard(summary);
-            showActions();
-            animateWindowResize(1400, 1000, 400);
-        } else {
-            alert(result.message || 'No se pudo leer el archivo.');
-        }
+        showLoadedData(await runJob('read_data', {}, 'Leyendo archivo',
+            () => window.pywebview.api.read_data('')));
+    } else {
+        alert('pywebview API no disponible');
+    }
+};
+
+// Several exports (months, juzgados) merged into one dataset
+document.getElementById('selectFilesBtn').onclick = async function() {
+    if (window.pywebview) {
+        showLoadedData(await runJob('read_data_batch', {}, 'Leyendo archivos',
+            () => window.pywebview.api.read_data_batch(null)));
     } else {
         alert('pywebview API no disponible');
     }
@@ -2087,7 +2301,8 @@ document.addEventListener('click', function(e) {
 
 document.getElementById('exportBtn').onclick = async function() {
     if (window.pywebview) {
-        const result = await window.pywebview.api.export_excel();
+        const result = await runJob('export_excel', {}, 'Exportando Excel',
+            () => window.pywebview.api.export_excel());
         if (result && result.status === 'ok') {
             showDownloadPopup(result.path, 'Excel');
         } else if (result && result.status === 'error') {
@@ -2098,35 +2313,55 @@ document.getElementById('exportBtn').onclick = async function() {
     }
 };
 
+// Continuous export modal, starting the day after the last assigned date (dd/mm/YYYY)
+function openContinuousModal(lastAssignedDate) {
+    if (lastAssignedDate) {
+        const parts = lastAssignedDate.split('/');
+        if (parts.length === 3) {
+            const d = parts[0].padStart(2,'0'), m = parts[1].padStart(2,'0'), y = parts[2];
+            const dt = new Date(`${y}-${m}-${d}`);
+            const next = new Date(dt.getTime() + 24*60*60*1000);
+            const iso = next.toISOString().slice(0,10);
+            document.getElementById('continuousStartDate').value = iso;
+        }
+    } else {
+        const tomorrow = new Date(Date.now() + 24*60*60*1000).toISOString().slice(0,10);
+        document.getElementById('continuousStartDate').value = tomorrow;
+    }
+    
+    const modalEl = document.getElementById('continuousExportModal');
+    const modal = new bootstrap.Modal(modalEl);
+    modal.show();
+}
+
+// Offer to resume the continuous listados when the loaded file was exported before
+function updateResumeButton(cursor) {
+    const btn = document.getElementById('continueListadosBtn');
+    if (!btn) return;
+    if (cursor && (cursor.last_index > 0 || cursor.assigned > 0)) {
+        btn.title = cursor.assigned + ' escritos ya asignados' +
+            (cursor.last_assigned_date ? ' (hasta ' + cursor.last_assigned_date + ')' : '');
+        btn.onclick = () => openContinuousModal(cursor.last_assigned_date);
+        btn.classList.remove('d-none');
+    } else {
+        btn.classList.add('d-none');
+    }
+}
+
 document.getElementById('exportPdfBtn').onclick = async function() {
     const nProveyentes = parseInt(document.getElementById('proveyentesInput').value);
+    const perProveyente = document.getElementById('perProveyenteInput').checked;
     if (!nProveyentes || nProveyentes < 1) {
         alert('Ingrese un número válido de Proveyentes.');
         return;
     }
 
     if (window.pywebview) {
-        const result = await window.pywebview.api.export_pdf(nProveyentes);
+        const result = await runJob('export_pdf', { n_proveyentes: nProveyentes, per_proveyente: perProveyente },
+            'Exportando PDF', () => window.pywebview.api.export_pdf(nProveyentes, perProveyente));
         if (result && result.status === 'ok') {
-            showDownloadPopup(result.path, 'PDF');
-            
-            if (result.last_assigned_date) {
-                const parts = result.last_assigned_date.split('/');
-                if (parts.length === 3) {
-                    const d = parts[0].padStart(2,'0'), m = parts[1].padStart(2,'0'), y = parts[2];
-                    const dt = new Date(`${y}-${m}-${d}`);
-                    const next = new Date(dt.getTime() + 24*60*60*1000);
-                    const iso = next.toISOString().slice(0,10);
-                    document.getElementById('continuousStartDate').value = iso;
-                }
-            } else {
-                const tomorrow = new Date(Date.now() + 24*60*60*1000).toISOString().slice(0,10);
-                document.getElementById('continuousStartDate').value = tomorrow;
-            }
-            
-            const modalEl = document.getElementById('continuousExportModal');
-            const modal = new bootstrap.Modal(modalEl);
-            modal.show();
+            showDownloadPopup(result.path, perProveyente ? 'Listados PDF' : 'PDF');
+            openContinuousModal(result.last_assigned_date);
         } else {
             alert(result.message || 'Error al exportar PDF.');
         }
@@ -2138,6 +2373,7 @@ document.getElementById('exportPdfBtn').onclick = async function() {
 document.getElementById('doContinuousExportBtn').onclick = async function() {
     const startDate = document.getElementById('continuousStartDate').value;
     const nProveyentes = parseInt(document.getElementById('continuousNumListados').value) || 1;
+    const perProveyente = document.getElementById('continuousPerProveyente').checked;
 
     if (!startDate) {
         alert('Ingrese una fecha de inicio válida.');
@@ -2145,9 +2381,12 @@ document.getElementById('doContinuousExportBtn').onclick = async function() {
     }
 
     if (window.pywebview) {
-        const result = await window.pywebview.api.export_pdf_continuous(startDate, nProveyentes);
+        const result = await runJob('export_pdf_continuous',
+            { start_date: startDate, n_proveyentes: nProveyentes, per_proveyente: perProveyente },
+            'Exportando PDF continuo',
+            () => window.pywebview.api.export_pdf_continuous(startDate, nProveyentes, 15, perProveyente));
         if (result && result.status === 'ok') {
-            showDownloadPopup(result.path, 'PDF');
+            showDownloadPopup(result.path, perProveyente ? 'Listados PDF' : 'PDF');
             const modalEl = document.getElementById('continuousExportModal');
             const modal = bootstrap.Modal.getInstance(modalEl);
             if (modal) modal.hide();
@@ -2215,4 +2454,12 @@ if (window.pywebview) {
 // Make functions globally available for onclick handlers
 window.showDateRecords = showDateRecords;
 window.showTitleRecords = showTitleRecords;
-window.exportStaticDashboard = exportStaticDashboard;
\ No newline at end of file
+window.exportStaticDashboard = exportStaticDashboard;
+
+// Backend stage timings, from the devtools console: getPerfStats()
+window.getPerfStats = async function(clear = false) {
+    const stats = await window.pywebview.api.get_perf_stats(clear);
+    console.table(stats.stages);
+    console.table(stats.totals);
+    return stats;
+};
@@ -0,0 +1,77 @@
+// ============================================================================
+// HTTP STAND-IN FOR window.pywebview.api (server.py)
+// ============================================================================
+// Loaded before app.js when the app is served by server.py: every Api call is
+// a POST to /api/<method>. Files are picked and uploaded from the browser and
+// exports are downloaded, since the server shows no dialogs.
+
+(function() {
+    async function call(method, args) {
+        const response = await fetch('/api/' + method, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ args: args })
+        });
+        return response.json();
+    }
+
+    function readFile(file) {
+        return new Promise((resolve, reject) => {
+            const reader = new FileReader();
+            reader.onload = () => resolve({ name: file.name, content: reader.result.split(',')[1] });
+            reader.onerror = () => reject(reader.error);
+            reader.readAsDataURL(file);
+        });
+    }
+
+    // Excel files chosen in the browser as [{name, content (base64)}]; [] if cancelled
+    function pickFiles(multiple) {
+        return new Promise(resolve => {
+            const input = document.createElement('input');
+            input.type = 'file';
+            input.accept = '.xlsx';
+            input.multiple = multiple;
+            input.onchange = async () => resolve(await Promise.all(Array.from(input.files).map(readFile)));
+            input.oncancel = () => resolve([]);
+            input.click();
+        });
+    }
+
+    const local = {
+        async start_job(kind, params) {
+            params = Object.assign({}, params);
+            if (kind === 'read_data' || kind === 'read_data_batch') {
+                params.uploads = await pickFiles(kind === 'read_data_batch');
+                if (!params.uploads.length) {
+                    return { status: 'no_file', message: 'No se ha seleccionado ningún archivo.' };
+                }
+            }
+            return call('start_job', [kind, params]);
+        },
+
+        open_file(path) {
+            window.open('/descargas?path=' + encodeURIComponent(path), '_blank');
+            return Promise.resolve({ status: 'ok' });
+        }
+    };
+    // Left to app.js' own browser fallbacks
+    const browserOnly = new Set(['export_static_html']);
+
+    window.pywebview = {
+        api: new Proxy(local, {
+            get(target, name) {
+                if (typeof name !== 'string' || browserOnly.has(name)) return target[name];
+                if (!(name in target)) target[name] = (...args) => call(name, args);
+                return target[name];
+            }
+        })
+    };
+
+    // A clerk opening the page later sees the dataset already loaded on the server
+    window.addEventListener('load', async () => {
+        const result = await call('get_current_dataset', []);
+        if (result && result.status === 'ok' && typeof showLoadedData === 'function') {
+            showLoadedData(result);
+        }
+    });
+})();
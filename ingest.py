@@ -0,0 +1,396 @@
+"""
+Streaming reader for the raw Excel exported by Forum Institucional.
+
+The export has a preamble of FORUM_HEADER_ROWS rows (court name, filters, etc.)
+followed by the real header (Expte, Título, Tipo, Apellido, Recibido...).
+Instead of letting pandas build a cell object per value and retrying with a
+second full parse when the preamble is missing, the worksheet XML is parsed
+incrementally in a single pass and emitted as column batches.
+"""
+import math
+import posixpath
+import warnings
+import zipfile
+from datetime import datetime
+from xml.etree.ElementTree import iterparse, parse
+
+import pandas as pd
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel
+
+FORUM_HEADER_ROWS = 8
+FORUM_COLUMNS = ("Expte", "Título", "Tipo", "Apellido", "Recibido")
+DEFAULT_BATCH_SIZE = 50000
+EXCEL_ERRORS = {"#N/A", "#REF!", "#NAME?", "#DIV/0!", "#NULL!", "#NUM!", "#VALUE!"}
+MISSING = float("nan")  # empty cells, as NaN like pandas.read_excel
+
+# Date formats seen in Recibido, day-first ones first (Forum is dd/mm/YYYY)
+RECIBIDO_FORMATS = (
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%Y",
+    "%d/%m/%y %H:%M",
+    "%d/%m/%y",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d",
+    "%m/%d/%Y",
+)
+DATE_SAMPLE_SIZE = 200
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_ROW = _NS + "row"
+_CELL = _NS + "c"
+_VALUE = _NS + "v"
+_TEXT = _NS + "t"
+
+
+# ============================================================================
+# WORKBOOK PARTS
+# ============================================================================
+
+def _first_sheet_path(zf, workbook):
+    # Resolve the first <sheet> of workbook.xml through its relationship
+    sheet = workbook.find(f"{_NS}sheets/{_NS}sheet")
+    rel_id = sheet.get(_REL_NS + "id")
+    rels = parse(zf.open("xl/_rels/workbook.xml.rels")).getroot()
+    for rel in rels.iter(_PKG_REL_NS + "Relationship"):
+        if rel.get("Id") == rel_id:
+            target = rel.get("Target")
+            if target.startswith("/"):
+                return target.lstrip("/")
+            return posixpath.normpath(posixpath.join("xl", target))
+    raise KeyError(f"No se encontró la hoja {rel_id} en el libro")
+
+
+def _epoch(workbook):
+    props = workbook.find(_NS + "workbookPr")
+    if props is not None and props.get("date1904") in ("1", "true"):
+        return CALENDAR_MAC_1904
+    return CALENDAR_WINDOWS_1900
+
+
+def _shared_strings(zf):
+    strings = []
+    if "xl/sharedStrings.xml" not in zf.namelist():
+        return strings
+    with zf.open("xl/sharedStrings.xml") as f:
+        for _, el in iterparse(f):
+            if el.tag == _NS + "si":
+                # Rich text runs are concatenated
+                strings.append("".join(t.text or "" for t in el.iter(_TEXT)))
+                el.clear()
+    return strings
+
+
+def _date_styles(zf):
+    # Indexes of cellXfs whose number format is a date/time format
+    if "xl/styles.xml" not in zf.namelist():
+        return set()
+    root = parse(zf.open("xl/styles.xml")).getroot()
+    custom = {}
+    num_fmts = root.find(_NS + "numFmts")
+    if num_fmts is not None:
+        for fmt in num_fmts:
+            custom[int(fmt.get("numFmtId"))] = fmt.get("formatCode", "")
+    date_styles = set()
+    cell_xfs = root.find(_NS + "cellXfs")
+    if cell_xfs is not None:
+        for idx, xf in enumerate(cell_xfs):
+            fmt_id = int(xf.get("numFmtId", 0))
+            code = custom.get(fmt_id, BUILTIN_FORMATS.get(fmt_id, ""))
+            if code and is_date_format(code):
+                date_styles.add(idx)
+    return date_styles
+
+
+def _column_index(ref):
+    # "AB12" -> 27 (0-based)
+    idx = 0
+    for ch in ref:
+        if ch.isdigit():
+            break
+        idx = idx * 26 + (ord(ch) - 64)
+    return idx - 1
+
+
+def iter_sheet_rows(source):
+    """
+    Yield the rows of the first worksheet as tuples of Python values, including
+    blank rows, with the same cell conversions as openpyxl's values_only mode.
+    """
+    with zipfile.ZipFile(source) as zf:
+        workbook = parse(zf.open("xl/workbook.xml")).getroot()
+        sheet_path = _first_sheet_path(zf, workbook)
+        epoch = _epoch(workbook)
+        strings = _shared_strings(zf)
+        date_styles = _date_styles(zf)
+
+        next_row = 1
+        sheet_data = None
+        with zf.open(sheet_path) as f:
+            for event, el in iterparse(f, events=("start", "end")):
+                if event == "start":
+                    if el.tag == _NS + "sheetData":
+                        sheet_data = el
+                    continue
+                if el.tag != _ROW:
+                    continue
+                row_number = int(el.get("r", next_row))
+                while next_row < row_number:
+                    yield ()
+                    next_row += 1
+                next_row = row_number + 1
+
+                values = []
+                for cell in el.iter(_CELL):
+                    ref = cell.get("r")
+                    if ref is not None:
+                        col = _column_index(ref)
+                        if col > len(values):
+                            values.extend([None] * (col - len(values)))
+                    cell_type = cell.get("t", "n")
+                    if cell_type == "inlineStr":
+                        values.append("".join(t.text or "" for t in cell.iter(_TEXT)))
+                        continue
+                    raw = cell.findtext(_VALUE)
+                    if raw is None:
+                        values.append(None)
+                    elif cell_type == "s":
+                        values.append(strings[int(raw)])
+                    elif cell_type == "n":
+                        if "." in raw or "E" in raw or "e" in raw:
+                            number = float(raw)
+                        else:
+                            number = int(raw)
+                        if int(cell.get("s", 0)) in date_styles:
+                            number = from_excel(number, epoch)
+                        values.append(number)
+                    elif cell_type == "b":
+                        values.append(raw == "1")
+                    elif cell_type == "d":
+                        values.append(datetime.fromisoformat(raw))
+                    elif cell_type == "e":
+                        values.append(None)
+                    else:  # "str": cached result of a formula
+                        values.append(raw)
+                # Drop the parsed row so memory stays flat on big sheets
+                sheet_data.remove(el)
+                yield tuple(values)
+
+
+# ============================================================================
+# FORUM BATCHES
+# ============================================================================
+
+def _convert_value(value):
+    # Same conversions pandas applies to openpyxl cells
+    if value is None or value == "":
+        return MISSING
+    if isinstance(value, float):
+        if math.isnan(value):
+            return MISSING
+        as_int = int(value)
+        return as_int if as_int == value else value
+    if isinstance(value, str) and value in EXCEL_ERRORS:
+        return MISSING
+    return value
+
+
+def _is_header(row):
+    values = {str(v).strip() for v in row if v is not None}
+    return sum(1 for col in FORUM_COLUMNS if col in values) >= 2
+
+
+def _make_header(row):
+    header = []
+    seen = {}
+    for i, value in enumerate(row):
+        name = str(value).strip() if value not in (None, "") else f"Unnamed: {i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        header.append(name)
+    return header
+
+
+def iter_forum_batches(source, batch_size=DEFAULT_BATCH_SIZE, skiprows=FORUM_HEADER_ROWS):
+    """
+    Yield the data rows of a Forum export as typed column batches.
+
+    Each batch is a dict {column name: list of values}. The header row is detected
+    among the first rows, so files with or without the preamble are read in a
+    single pass. `source` can be a path or a binary file-like object.
+    """
+    rows = iter_sheet_rows(source)
+
+    # Buffer the preamble until the header row shows up
+    preamble = []
+    header = None
+    for row in rows:
+        preamble.append(row)
+        if _is_header(row):
+            header = row
+            preamble = []
+            break
+        if len(preamble) > skiprows:
+            break
+    if header is None:
+        # No recognizable header: behave like read_excel(skiprows=8), or take
+        # the first non-blank row when the file is shorter than the preamble.
+        if len(preamble) > skiprows:
+            header = preamble[skiprows]
+            preamble = preamble[skiprows + 1:]
+        else:
+            preamble = [row for row in preamble if any(v not in (None, "") for v in row)]
+            if not preamble:
+                return
+            header = preamble.pop(0)
+
+    columns = _make_header(header)
+    width = len(columns)
+    batch = [[] for _ in range(width)]
+    n_rows = 0
+    emitted = False
+
+    def remaining_rows():
+        yield from preamble
+        yield from rows
+
+    for row in remaining_rows():
+        values = [_convert_value(v) for v in row[:width]]
+        if all(v is MISSING for v in values):
+            # Blank rows are not escritos: skip them instead of counting NaN rows
+            continue
+        if len(values) < width:
+            values.extend([MISSING] * (width - len(values)))
+        for col, value in zip(batch, values):
+            col.append(value)
+        n_rows += 1
+        if n_rows >= batch_size:
+            yield dict(zip(columns, batch))
+            emitted = True
+            batch = [[] for _ in range(width)]
+            n_rows = 0
+    if n_rows or not emitted:
+        # Header-only files still yield the (empty) columns as a schema
+        yield dict(zip(columns, batch))
+
+
+def frame_from_batches(batches):
+    """
+    Concatenate column batches (as yielded by iter_forum_batches) into a DataFrame.
+    """
+    frames = [pd.DataFrame(batch) for batch in batches]
+    if not frames:
+        return pd.DataFrame(columns=list(FORUM_COLUMNS))
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
+
+
+def read_forum_excel(source, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Read a Forum export into a DataFrame using the streaming reader.
+    """
+    return frame_from_batches(iter_forum_batches(source, batch_size=batch_size))
+
+
+# ============================================================================
+# DATE PARSING
+# ============================================================================
+
+def _rank_formats(sample, formats=RECIBIDO_FORMATS):
+    # Formats ordered by how many sampled values they parse; unused ones last
+    hits = {}
+    for fmt in formats:
+        n = 0
+        for value in sample:
+            try:
+                datetime.strptime(value, fmt)
+                n += 1
+            except ValueError:
+                pass
+        hits[fmt] = n
+    return sorted(formats, key=lambda fmt: -hits[fmt])
+
+
+def parse_dates(values, formats=RECIBIDO_FORMATS, sample_size=DATE_SAMPLE_SIZE):
+    """
+    Parse a column of received dates into datetime64.
+
+    Cells that already are dates are taken as is. For text, a sample is used to
+    find the dominant format, the whole column is parsed with that explicit
+    format, and the remaining formats (then pandas' day-first inference) are
+    only tried on the values still unparsed. Returns (parsed Series, counts
+    per format), where counts also include "fecha Excel", "inferido",
+    "sin fecha" (unparseable) and "vacío".
+    """
+    values = pd.Series(values)
+    original_index = values.index
+    values = values.reset_index(drop=True)
+    counts = {}
+    if pd.api.types.is_datetime64_any_dtype(values):
+        counts["fecha Excel"] = int(values.notna().sum())
+        counts["vacío"] = int(values.isna().sum())
+        values.index = original_index
+        return values, counts
+
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    present = values.notna()
+    kind = pd.api.types.infer_dtype(values, skipna=True)
+    if kind == "string":
+        is_text = present
+    else:
+        is_text = present & values.map(lambda v: isinstance(v, str))
+        is_date = present & values.map(lambda v: isinstance(v, datetime))
+        if is_date.any():
+            parsed[is_date] = pd.to_datetime(values[is_date].tolist())
+            counts["fecha Excel"] = int(is_date.sum())
+
+    text = values[is_text]
+    if len(text):
+        step = max(len(text) // sample_size, 1)
+        sample = [v.strip() for v in text.iloc[::step].head(sample_size)]
+        ranked = _rank_formats(sample, formats)
+        result = pd.to_datetime(text, format=ranked[0], errors="coerce")
+        ok = result.notna()
+        if len(text) == len(values) and ok.all():
+            # Fast path: the dominant format parsed the whole column
+            counts[ranked[0]] = len(values)
+            counts["vacío"] = 0
+            result.index = original_index
+            return result, counts
+        parsed[result.index[ok]] = result[ok]
+        counts[ranked[0]] = int(ok.sum())
+        # Every format again, but only on the unparsed residual (stripped)
+        pending = text[~ok].str.strip()
+        for fmt in ranked:
+            if pending.empty:
+                break
+            result = pd.to_datetime(pending, format=fmt, errors="coerce")
+            ok = result.notna()
+            if ok.any():
+                parsed[result.index[ok]] = result[ok]
+                counts[fmt] = counts.get(fmt, 0) + int(ok.sum())
+            pending = pending[~ok]
+        counts = {fmt: n for fmt, n in counts.items() if n}
+
+    # Whatever is left (odd text, numbers...): per-value day-first inference
+    residual = values[present & parsed.isna()]
+    if len(residual):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            result = pd.to_datetime(residual.astype(str), dayfirst=True, errors="coerce", format="mixed")
+        ok = result.notna()
+        if ok.any():
+            parsed[result.index[ok]] = result[ok]
+            counts["inferido"] = int(ok.sum())
+        if (~ok).any():
+            counts["sin fecha"] = int((~ok).sum())
+    counts["vacío"] = int((~present).sum())
+    parsed.index = original_index
+    return parsed, counts
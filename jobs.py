@@ -0,0 +1,175 @@
+"""
+Background jobs for long operations (reading a file, building exports).
+
+pywebview runs every js_api call on its bridge thread, so a long parse or
+ReportLab build used to freeze the UI and queue any other call behind it.
+JobManager runs that work on a small thread pool (threads, because the jobs
+share the loaded DataFrame with the Api) and returns a job id right away.
+The frontend follows the job by polling get_job or through the notify
+callback (pushed with evaluate_js), and can cancel it: cancellation is
+cooperative, checked every time the job reports progress.
+
+CPU-bound pieces of a job (PDF chunks, parsing several workbooks) go to a
+process pool through run_in_pool.
+"""
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+MAX_WORKERS = 2
+KEEP_FINISHED = 50  # finished jobs kept around for get_job
+PUSH_INTERVAL = 0.1  # seconds between progress pushes of the same job
+
+log = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when the user cancelled it."""
+
+
+class Job:
+    def __init__(self, kind, notify=None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.state = "pending"  # pending, running, done, error, cancelled
+        self.progress = 0.0
+        self.message = ""
+        self.result = None
+        self.created = time.time()
+        self.finished = None
+        self._cancel = threading.Event()
+        self._notify = notify
+        self._last_push = 0.0
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def report(self, progress=None, message=None):
+        """
+        Update progress (0..1) and/or the stage message; raises JobCancelled
+        if the job was cancelled meanwhile.
+        """
+        self.check_cancelled()
+        if progress is not None:
+            self.progress = max(0.0, min(float(progress), 1.0))
+        if message is not None:
+            self.message = message
+        self._push(throttle=message is None)
+
+    def _push(self, throttle=False):
+        now = time.monotonic()
+        if throttle and now - self._last_push < PUSH_INTERVAL:
+            return
+        self._last_push = now
+        if self._notify is not None:
+            try:
+                self._notify(self.to_dict())
+            except Exception as e:
+                log.warning("could not notify job update: %s", e)
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "state": self.state,
+            "progress": self.progress,
+            "message": self.message,
+            "result": self.result,
+        }
+
+
+def report(job, progress=None, message=None):
+    """
+    job.report() for code that also runs outside a job (job=None).
+    """
+    if job is not None:
+        job.report(progress, message)
+
+
+class JobManager:
+    def __init__(self, max_workers=MAX_WORKERS, notify=None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.notify = notify
+
+    def submit(self, kind, fn, *args, **kwargs):
+        """
+        Run fn(job, *args, **kwargs) in the pool. Its return value (a dict
+        with a "status", like every Api method) becomes the job result.
+        """
+        job = Job(kind, notify=self.notify)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._forget_old()
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        try:
+            job.check_cancelled()
+            job.state = "running"
+            job._push()
+            result = fn(job, *args, **kwargs)
+            job.result = result
+            job.state = "error" if isinstance(result, dict) and result.get("status") == "error" else "done"
+            job.progress = 1.0
+        except JobCancelled:
+            job.state = "cancelled"
+            job.result = {"status": "cancelled", "message": "Operación cancelada por el usuario."}
+        except Exception as e:
+            log.exception("Job %s (%s) failed", job.id, job.kind)
+            job.state = "error"
+            job.result = {"status": "error", "message": str(e)}
+        job.finished = time.time()
+        job._push()
+
+    def _forget_old(self):
+        finished = [j for j in self._jobs.values() if j.finished is not None]
+        for job in sorted(finished, key=lambda j: j.finished)[:-KEEP_FINISHED or None]:
+            del self._jobs[job.id]
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is None or job.finished is not None:
+            return False
+        job._cancel.set()
+        return True
+
+    def list(self):
+        return [job.to_dict() for job in self._jobs.values()]
+
+    def shutdown(self):
+        for job in self._jobs.values():
+            job._cancel.set()
+        self._executor.shutdown(wait=False)
+
+
+def run_in_pool(workers, calls, on_done=None):
+    """
+    Submit calls [(fn, args)] to a process pool; results in submission order.
+    on_done(n_done, n_total) runs as each call finishes and may raise to cancel
+    the rest.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fn, *args) for fn, args in calls]
+        try:
+            for done, future in enumerate(futures, start=1):
+                future.result()
+                if on_done is not None:
+                    on_done(done, len(futures))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        return [future.result() for future in futures]
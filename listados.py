@@ -0,0 +1,158 @@
+"""
+The listados table behind every export (Excel, PDF repartido and continuo).
+
+One row per escrito, in file order: Título, Expte, Fecha (dd/mm/yy), Presentante
+and "N días al dd/mm". It is built with whole-column operations (dates and day
+counts are formatted once per distinct value) and kept as columns, so an export
+only turns the slice it needs into row tuples. Días corridos are calendar days
+between Recibido and `today`, so the table stays valid for the whole day.
+"""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from summary import format_days
+
+LISTADO_COLUMNS = ('Título', 'Expte', 'Fecha', 'Presentante', 'Días')
+TITLE_LIMIT = 42  # characters of Título shown in the PDF listados
+PRESENTANTE_LIMIT = 15
+
+
+def build_listados(data, today=None):
+    """
+    Listados table of a loaded frame; never modifies `data`.
+    Also carries the normalized 'Recibido' day, used to track the last date assigned.
+    """
+    today = today or datetime.now()
+    recibido = data['Recibido']
+    if not pd.api.types.is_datetime64_any_dtype(recibido):
+        recibido = pd.to_datetime(recibido)
+    day = recibido.dt.normalize()
+
+    fecha = format_days(recibido, '%d/%m/%y')
+    days = (pd.Timestamp(today).normalize() - day).dt.days
+    codes, uniques = pd.factorize(days, sort=False)
+    suffix = f" días al {today.strftime('%d/%m')}"
+    # Rows without a date (-1) read the trailing None
+    dias = np.array([f"{int(d)}{suffix}" for d in uniques] + [None], dtype=object)
+
+    return pd.DataFrame({
+        'Título': data['Título'].to_numpy(),
+        'Expte': data['Expte'].to_numpy(),
+        'Fecha': fecha.where(fecha.notna(), None).to_numpy(),
+        'Presentante': data['Apellido'].to_numpy(),
+        'Días': dias[codes],
+        'Recibido': day.to_numpy(),
+    })
+
+
+def listado_rows(table):
+    """
+    (Título, Expte, Fecha, Presentante, Días) tuples for a slice of the table.
+    """
+    return list(zip(*(table[col].tolist() for col in LISTADO_COLUMNS)))
+
+
+def last_date(table):
+    """
+    Latest Recibido day in a slice of the table, None if it has no dates.
+    """
+    latest = table['Recibido'].max()
+    return latest.to_pydatetime() if pd.notna(latest) else None
+
+
+def truncate(text, limit):
+    """
+    Cut text to `limit` characters plus "..."; non-text values pass through.
+    """
+    if isinstance(text, str) and len(text) > limit:
+        return text[:limit] + "..."
+    return text
+
+
+def merged_title(titles):
+    """
+    Título shown for an expediente merging `titles`: the first ones joined with
+    " | " and cut to fit TITLE_LIMIT with the "(+N otros escritos)" suffix.
+    Only as many parts as fit are joined, however many escritos there are.
+    """
+    otros = len(titles) - 1
+    if otros == 0:
+        return truncate(titles[0], TITLE_LIMIT)
+    suffix = " (+1 otro escrito)" if otros == 1 else f" (+{otros} otros escritos)"
+    limit = max(TITLE_LIMIT - len(suffix), 20)
+    parts = []
+    length = -3
+    for title in titles:
+        title = str(title)
+        parts.append(title)
+        length += 3 + len(title)
+        if length > limit:
+            break
+    return truncate(" | ".join(parts), limit) + suffix
+
+
+def merge_records(records):
+    """
+    Merge (Título, Expte, Fecha, Presentante, Días) rows of the same Expte, in
+    order of first appearance. Returns the merged rows (Fecha, Presentante and
+    Días of the first escrito, merged_title as Título) and, per merged row,
+    the full list of títulos.
+    """
+    merged = {}
+    for row in records:
+        entry = merged.get(row[1])
+        if entry is None:
+            merged[row[1]] = (row, [row[0]])
+        else:
+            entry[1].append(row[0])
+    rows = [[merged_title(titles), first[1], first[2], first[3], first[4]] for first, titles in merged.values()]
+    return rows, [titles for _, titles in merged.values()]
+
+
+def merge_listados(table, per_list=None):
+    """
+    merge_records over a slice of the listados table with whole-column
+    operations. With per_list, rows are first cut into consecutive listados of
+    that many escritos and expedientes merge only within each one ('Listado'
+    column, numbered from 0). Adds 'Escritos' (count) and 'Títulos' (full list).
+    """
+    n = len(table)
+    expte_codes, exptes = pd.factorize(table['Expte'], use_na_sentinel=False)
+    if per_list:
+        listado = np.arange(n) // per_list
+        codes, _ = pd.factorize(listado * (len(exptes) + 1) + expte_codes, sort=False)
+    else:
+        listado = np.zeros(n, dtype=np.int64)
+        codes = expte_codes
+    counts = np.bincount(codes)
+    # First row of each group; codes are 0..k-1, so unique() lists them in code order
+    _, first = np.unique(codes, return_index=True)
+    order = np.argsort(codes, kind='stable')
+    grouped = table['Título'].to_numpy()[order].tolist()
+    ends = np.cumsum(counts).tolist()
+    titles = [grouped[start:end] for start, end in zip([0] + ends, ends)]
+
+    merged = table.iloc[first]
+    return pd.DataFrame({
+        'Título': [merged_title(t) if len(t) > 1 else truncate(t[0], TITLE_LIMIT) for t in titles],
+        'Expte': merged['Expte'].to_numpy(),
+        'Fecha': merged['Fecha'].to_numpy(),
+        'Presentante': merged['Presentante'].to_numpy(),
+        'Días': merged['Días'].to_numpy(),
+        'Listado': listado[first],
+        'Escritos': counts,
+        'Títulos': titles,
+    })
+
+
+def split_listados(merged):
+    """
+    Row lists of each listado of a merge_listados(table, per_list) frame.
+    """
+    rows = listado_rows(merged)
+    if not rows:
+        return []
+    cuts = (np.flatnonzero(np.diff(merged['Listado'].to_numpy())) + 1).tolist()
+    return [rows[start:end] for start, end in zip([0] + cuts, cuts + [len(rows)])]
@@ -1,7 +1,9 @@
+import logging
+import multiprocessing
 import webview
 import os
 import sys
-from backend import Api
+from backend import Api  # light: pandas and ReportLab are imported on first use
 
 
 def resource_path(relative_path):
@@ -13,6 +15,11 @@ def resource_path(relative_path):
 
 
 if __name__ == '__main__':
+    # PDF worker processes re-run this module when frozen with PyInstaller
+    multiprocessing.freeze_support()
+    # LISTADOS_LOG_LEVEL=DEBUG shows every pipeline stage, WARNING only problems
+    logging.basicConfig(level=os.environ.get("LISTADOS_LOG_LEVEL", "INFO").upper(),
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
     api = Api()
     html_path = resource_path("frontend/index.html")
     window = webview.create_window(
@@ -22,4 +29,5 @@ if __name__ == '__main__':
         width=1200,
         height=933
     )
-    webview.start()
\ No newline at end of file
+    # The window shows first; pandas & co. load in the background meanwhile
+    webview.start(api.prewarm)
\ No newline at end of file
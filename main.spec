@@ -14,8 +14,18 @@ datas = [
 ]
 
 # Hidden imports - ensure all reportlab modules are included
+# (backend imports its data and PDF modules lazily, inside the methods)
 hiddenimports = [
     'backend',
+    'ingest',
+    'summary',
+    'search_index',
+    'delta',
+    'listados',
+    'batch_ingest',
+    'excel_export',
+    'pdf_render',
+    'pypdf',
     'pandas',
     'openpyxl',
     'reportlab',
@@ -0,0 +1,185 @@
+"""
+PDF rendering of the proveyente listados, shared by export_pdf ("Fechas
+repartidas") and export_pdf_continuous ("Fechas continuas").
+
+Everything that is the same for every listado is built once at import: the
+paragraph styles, a single TableStyle (the zebra stripes are one ROWBACKGROUNDS
+command instead of a BACKGROUND per row) and the spacer/page-break flowables.
+A listado then costs one heading and one Table, and all groups go into a single
+story built in one pass. Títulos arrive already truncated by merge_expedientes.
+
+With many listados the layout can also be split across a process pool: every
+LISTADOS_PER_PAGE listados start on a new page anyway, so chunks of whole pages
+are rendered as independent PDFs and their pages concatenated with pypdf
+(optional; without it the export renders serially). Each listado can also be
+written to its own file, which needs no merge at all.
+"""
+import os
+from io import BytesIO
+
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+
+from jobs import run_in_pool
+from listados import truncate, PRESENTANTE_LIMIT
+
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:  # optional: only needed to merge pages rendered in parallel
+    PdfReader = PdfWriter = None
+
+PAGE_SIZE = A4
+HEADER = ["Título", "Expediente", "Fecha", "Presentante", "Días corridos"]
+COL_WIDTHS = [PAGE_SIZE[0] * f for f in (0.32, 0.17, 0.10, 0.15, 0.15)]
+LISTADOS_PER_PAGE = 2
+MODES = {'repartidas': "Fechas repartidas", 'continuas': "Fechas continuas"}
+# Below this many listados, starting worker processes costs more than it saves
+PARALLEL_MIN_LISTADOS = 40
+CHUNKS_PER_WORKER = 4
+
+# Page streams are zlib-compressed already; ASCII85 on top only costs time and ~20% size
+rl_config.useA85 = 0
+
+_STYLES = getSampleStyleSheet()
+TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 1), (0, -1), 7),
+    ('FONTSIZE', (1, 1), (2, -1), 10),
+    ('FONTSIZE', (3, 1), (3, -1), 7),
+    ('FONTSIZE', (4, 1), (4, -1), 10),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+    ('VALIGN', (0, 1), (-1, -1), 'TOP'),
+    ('WORDWRAP', (0, 1), (0, -1), 'CJK'),
+    # Odd data rows striped, even ones left blank
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.whitesmoke, None]),
+])
+
+
+def listado_table(group):
+    """
+    Table of one proveyente's merged rows (Título, Expte, Fecha, Presentante, Días).
+    """
+    rows = [HEADER]
+    rows += [
+        [titulo, expte, fecha, truncate(presentante, PRESENTANTE_LIMIT), dias]
+        for titulo, expte, fecha, presentante, dias in group
+    ]
+    return Table(rows, repeatRows=1, colWidths=COL_WIDTHS, style=TABLE_STYLE)
+
+
+def listados_story(groups, mode, first=1):
+    """
+    Flowables of every listado, LISTADOS_PER_PAGE per page, numbered from `first`.
+    """
+    label = MODES[mode]
+    story = []
+    for i, group in enumerate(groups):
+        story.append(Paragraph(f"Listado {first + i} <small>({label})</small>", _STYLES['Heading2']))
+        if not group:
+            story.append(Paragraph("Sin registros asignados.", _STYLES['Normal']))
+        else:
+            story.append(listado_table(group))
+        # New flowables each time: wrapOn/drawOn bind the instance to the canvas being built,
+        # so one shared instance would race between concurrent exports
+        story.append(Spacer(1, 18))
+        if (i + 1) % LISTADOS_PER_PAGE == 0 and (i + 1) < len(groups):
+            story.append(PageBreak())
+    return story
+
+
+def expected_pages(n_groups):
+    return max(1, -(-n_groups // LISTADOS_PER_PAGE))
+
+
+def render_listados_pdf(target, groups, mode, on_page=None, first=1):
+    """
+    Build the PDF of the proveyente groups into target (path or file object).
+    on_page(page_number) runs as each page is drawn.
+    """
+    doc = SimpleDocTemplate(target, pagesize=PAGE_SIZE)
+
+    def page_callback(canvas, doc):
+        if on_page is not None:
+            on_page(doc.page)
+
+    doc.build(listados_story(groups, mode, first), onFirstPage=page_callback, onLaterPages=page_callback)
+
+
+def default_workers():
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def _render_chunk(groups, mode, first):
+    # Worker: one chunk of whole pages as an in-memory PDF
+    out = BytesIO()
+    render_listados_pdf(out, groups, mode, first=first)
+    return out.getvalue()
+
+
+def _render_file(path, group, mode, number):
+    # Worker: one listado to its own file
+    render_listados_pdf(path, [group], mode, first=number)
+    return path
+
+
+def can_merge():
+    return PdfWriter is not None
+
+
+def render_listados_parallel(target, groups, mode, workers=None, on_progress=None):
+    """
+    Same PDF as render_listados_pdf, laid out in a process pool by chunks of
+    whole pages and merged page by page. Falls back to the serial build for few
+    listados, a single worker or without pypdf. on_progress(done, total) runs
+    per chunk (per page when serial).
+    """
+    workers = workers or default_workers()
+    if workers <= 1 or len(groups) < PARALLEL_MIN_LISTADOS or not can_merge():
+        pages = expected_pages(len(groups))
+        on_page = (lambda page: on_progress(min(page, pages), pages)) if on_progress else None
+        render_listados_pdf(target, groups, mode, on_page=on_page)
+        return
+
+    # Chunks are a whole number of pages, so page breaks fall where they do serially
+    n_chunks = workers * CHUNKS_PER_WORKER
+    size = max(1, expected_pages(len(groups)) // n_chunks) * LISTADOS_PER_PAGE
+    calls = [(_render_chunk, (groups[i:i + size], mode, i + 1)) for i in range(0, len(groups), size)]
+    chunks = run_in_pool(workers, calls, on_progress)
+
+    writer = PdfWriter()
+    for chunk in chunks:
+        writer.append(PdfReader(BytesIO(chunk)))
+    writer.write(target)
+
+
+def listado_file_names(prefix, n_listados):
+    """
+    "<prefix>_listado_01.pdf", ... zero-padded so they sort in listado order.
+    """
+    width = max(2, len(str(n_listados)))
+    return [f"{prefix}_listado_{i:0{width}d}.pdf" for i in range(1, n_listados + 1)]
+
+
+def render_listados_files(paths, groups, mode, workers=None, on_progress=None):
+    """
+    Write each listado to its own PDF (paths[i] for groups[i]), in a process
+    pool when there are many. on_progress(done, total) runs per file.
+    """
+    workers = workers or default_workers()
+    if workers <= 1 or len(groups) < PARALLEL_MIN_LISTADOS:
+        for i, (path, group) in enumerate(zip(paths, groups), start=1):
+            _render_file(path, group, mode, i)
+            if on_progress is not None:
+                on_progress(i, len(groups))
+        return
+    calls = [(_render_file, (path, group, mode, i)) for i, (path, group) in enumerate(zip(paths, groups), start=1)]
+    run_in_pool(workers, calls, on_progress)
@@ -0,0 +1,198 @@
+"""
+Per-stage timing of the load and export pipelines.
+
+Api wraps each stage (Excel read, date parse, aggregation, record build,
+listados, merge, PDF, Excel write) in PerfRecorder.stage(); the last
+STATS_SIZE stages are kept in a ring buffer for Api.get_perf_stats. A
+disabled recorder hands out one shared no-op stage, so the instrumentation
+costs an attribute lookup and a call.
+
+Peak memory is only known while a tracemalloc capture runs (tracing every
+allocation slows the pipeline down); otherwise peak_mb is None. A cProfile
+capture profiles every outermost stage, in whichever thread it runs, until
+the capture is stopped and dumped to a file.
+"""
+import cProfile
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+
+log = logging.getLogger(__name__)
+
+STATS_SIZE = 512
+CAPTURE_MODES = ('cprofile', 'tracemalloc')
+
+
+class _NullStage:
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """
+    One timed stage; set .rows inside the block when the count is known late.
+    """
+
+    def __init__(self, recorder, name, rows):
+        self.recorder = recorder
+        self.name = name
+        self.rows = rows
+        self.peak = 0
+
+    def __enter__(self):
+        self.recorder._enter(self)
+        self.started = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        self.recorder._exit(self, seconds, exc[0] is None)
+        return False
+
+
+class PerfRecorder:
+    def __init__(self, size=STATS_SIZE, enabled=True):
+        self.enabled = enabled
+        self._stages = deque(maxlen=size)
+        self._local = threading.local()  # Stack of open stages per thread
+        self._lock = threading.Lock()
+        self._capture = None  # (mode, path) of the running capture
+        self._profiler = None
+        self._profiler_lock = threading.Lock()  # One thread profiled at a time
+
+    def stage(self, name, rows=None):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, rows)
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, stage):
+        stack = self._stack()
+        stage.profiler = None
+        stage.traced = tracemalloc.is_tracing()
+        if stage.traced:
+            # The peak is global: fold the parent's peak so far before resetting it
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            stage.base = current
+            tracemalloc.reset_peak()
+        profiler = self._profiler
+        if not stack and profiler is not None and self._profiler_lock.acquire(blocking=False):
+            try:
+                profiler.enable()
+                stage.profiler = profiler
+            except ValueError:  # another profiler (a debugger) is active
+                self._profiler_lock.release()
+        stack.append(stage)
+
+    def _exit(self, stage, seconds, ok):
+        stack = self._stack()
+        stack.pop()
+        if stage.profiler is not None:
+            stage.profiler.disable()
+            self._profiler_lock.release()
+        peak_mb = None
+        if stage.traced and tracemalloc.is_tracing():
+            stage.peak = max(stage.peak, tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, stage.peak)
+            peak_mb = round(max(stage.peak - stage.base, 0) / 1e6, 3)
+        record = {
+            "stage": stage.name,
+            "started": datetime.fromtimestamp(stage.started).isoformat(timespec="milliseconds"),
+            "seconds": round(seconds, 6),
+            "rows": stage.rows,
+            "peak_mb": peak_mb,
+            "ok": ok,
+            "thread": threading.current_thread().name,
+        }
+        with self._lock:
+            self._stages.append(record)
+        if log.isEnabledFor(logging.DEBUG):
+            peak = f", peak {peak_mb} MB" if peak_mb is not None else ""
+            log.debug("%s: %.1f ms, %s rows%s", stage.name, seconds * 1000, stage.rows, peak)
+
+    def stats(self, clear=False):
+        """
+        The buffered stage records (oldest first) and per-stage totals.
+        """
+        with self._lock:
+            stages = list(self._stages)
+            if clear:
+                self._stages.clear()
+        totals = {}
+        for record in stages:
+            total = totals.setdefault(record["stage"], {"count": 0, "seconds": 0.0, "max_seconds": 0.0, "rows": 0})
+            total["count"] += 1
+            total["seconds"] += record["seconds"]
+            total["max_seconds"] = max(total["max_seconds"], record["seconds"])
+            total["rows"] += record["rows"] or 0
+        for total in totals.values():
+            total["seconds"] = round(total["seconds"], 6)
+            total["mean_seconds"] = round(total["seconds"] / total["count"], 6)
+        return {
+            "enabled": self.enabled,
+            "capture": self._capture[0] if self._capture else None,
+            "stages": stages,
+            "totals": totals,
+        }
+
+    def start_capture(self, mode, path):
+        """
+        Start a cProfile or tracemalloc capture that stop_capture writes to path.
+        """
+        if mode not in CAPTURE_MODES:
+            raise ValueError(f"Modo de captura desconocido: {mode}")
+        if self._capture is not None:
+            raise RuntimeError("Ya hay una captura en curso")
+        if mode == 'cprofile':
+            self._profiler = cProfile.Profile()
+        else:
+            tracemalloc.start()
+        self._capture = (mode, path)
+        log.info("perf capture %s started", mode)
+
+    def stop_capture(self):
+        """
+        End the running capture and dump it: pstats for cProfile (load it with
+        pstats.Stats), a tracemalloc.Snapshot otherwise. Returns the path.
+        """
+        if self._capture is None:
+            raise RuntimeError("No hay una captura en curso")
+        mode, path = self._capture
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        try:
+            if mode == 'cprofile':
+                with self._profiler_lock:  # wait for a profiled stage to end
+                    profiler, self._profiler = self._profiler, None
+                profiler.dump_stats(path)
+            else:
+                snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+                snapshot.dump(path)
+        finally:
+            self._capture = None
+        log.info("perf capture %s written to %s", mode, path)
+        return path
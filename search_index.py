@@ -0,0 +1,146 @@
+"""
+In-memory inverted index for search_records.
+
+The searchable columns (Expte, Título, Apellido, Tipo) repeat a lot: a few
+hundred títulos and tipos and one Expte per handful of escritos. The index is
+therefore built over the distinct values of each column, and every row keeps
+the integer code of its value. A query is tokenized and accent-folded the same
+way as the data; each token is prefix-matched against the sorted vocabulary,
+scored per distinct value, and only then gathered onto the rows.
+"""
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+# (column, weight): a hit in Expte ranks above a hit in Título/Apellido, then Tipo
+SEARCH_FIELDS = (('Expte', 3), ('Título', 2), ('Apellido', 2), ('Tipo', 1))
+EXACT_SCORE = 2  # the query token is a whole word of the value
+PREFIX_SCORE = 1  # the query token only starts a word of the value
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text):
+    """
+    Lowercase and strip accents: "Acuña Peña" -> "acuna pena", "Título" -> "titulo".
+    """
+    text = unicodedata.normalize("NFKD", str(text).lower())
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def tokenize(text):
+    """
+    Split normalized text into alphanumeric words; punctuation is a separator,
+    so "art. 5" -> ["art", "5"] and "1234/2023" -> ["1234", "2023"].
+    """
+    return _TOKEN_RE.findall(normalize(text))
+
+
+class SearchIndex:
+    """
+    Token index over the SEARCH_FIELDS of a DataFrame, queried by row position.
+    """
+
+    def __init__(self, df, fields=SEARCH_FIELDS):
+        self.n_rows = len(df)
+        self.fields = {}
+        vocabulary = set()
+        for column, weight in fields:
+            if column not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[column], sort=False)
+            n_values = len(uniques)
+            # Missing values (-1) point to an extra slot that never matches
+            codes = np.where(codes < 0, n_values, codes).astype(np.int32)
+            postings = defaultdict(list)
+            for value_id, value in enumerate(uniques):
+                for token in set(tokenize(value)):
+                    postings[token].append(value_id)
+            self.fields[column] = {
+                "weight": weight,
+                "codes": codes,
+                "n_values": n_values,
+                "postings": {t: np.array(ids, dtype=np.int32) for t, ids in postings.items()},
+            }
+            vocabulary.update(postings)
+        self.vocabulary = sorted(vocabulary)
+
+    def _prefix_tokens(self, prefix):
+        # Tokens are [a-z0-9]+, so "{" sorts right after every word with this prefix
+        start = bisect_left(self.vocabulary, prefix)
+        end = bisect_left(self.vocabulary, prefix + "{", lo=start)
+        return self.vocabulary[start:end]
+
+    def _value_scores(self, field, token, matches):
+        # Score of every distinct value of `field` for one query token
+        scores = np.zeros(field["n_values"] + 1, dtype=np.int32)
+        postings = field["postings"]
+        prefix_ids = [postings[m] for m in matches if m != token and m in postings]
+        if prefix_ids:
+            scores[np.concatenate(prefix_ids)] = PREFIX_SCORE
+        exact = postings.get(token)
+        if exact is not None:
+            scores[exact] = EXACT_SCORE
+        return scores * field["weight"]
+
+    def search(self, query, columns=None, limit=None, offset=0):
+        """
+        Return (row positions of the requested page, total number of matches).
+
+        Every query token must prefix-match a word in at least one column
+        (AND semantics). Rows are ranked by score, then by original order.
+        A blank query matches every row in original order.
+        """
+        fields = [f for name, f in self.fields.items() if columns is None or name in columns]
+        tokens = sorted(set(tokenize(query)), key=len, reverse=True)
+        offset = max(offset or 0, 0)
+
+        if not tokens:
+            if str(query).strip():
+                # Only punctuation, e.g. "(": nothing to match
+                return np.empty(0, dtype=np.intp), 0
+            stop = offset + limit if limit else None
+            return np.arange(self.n_rows)[offset:stop], self.n_rows
+
+        candidates = None
+        total = None
+        for token in tokens:
+            matches = self._prefix_tokens(token)
+            if not matches:
+                return np.empty(0, dtype=np.intp), 0
+            token_score = None
+            for field in fields:
+                value_scores = self._value_scores(field, token, matches)
+                if not value_scores.any():
+                    continue
+                codes = field["codes"] if candidates is None else field["codes"][candidates]
+                row_scores = value_scores[codes]
+                token_score = row_scores if token_score is None else np.maximum(token_score, row_scores)
+            if token_score is None:
+                return np.empty(0, dtype=np.intp), 0
+            keep = token_score > 0
+            if candidates is None:
+                candidates = np.flatnonzero(keep)
+                total = token_score[keep]
+            else:
+                candidates = candidates[keep]
+                total = total[keep] + token_score[keep]
+            if not len(candidates):
+                return candidates, 0
+
+        # Rank by score descending, ties in original row order, in a single int key
+        key = -total.astype(np.int64) * (self.n_rows + 1) + candidates
+        n_matches = len(candidates)
+        stop = n_matches if not limit else min(offset + limit, n_matches)
+        if offset >= stop:
+            return np.empty(0, dtype=np.intp), n_matches
+        if stop < n_matches:
+            top = np.argpartition(key, stop - 1)[:stop]
+            order = top[np.argsort(key[top])]
+        else:
+            order = np.argsort(key)
+        return candidates[order[offset:stop]], n_matches
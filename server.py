@@ -0,0 +1,451 @@
+"""
+Service mode: one parsed Forum dataset shared by several clerks' browsers.
+
+    python server.py [forum.xlsx ...] [--puerto 8765] [--workers 4] [--salida DIR] [--conservar-dias 7] [--abrir]
+
+A single Api instance holds the dataset; its methods are served as JSON over
+a small asyncio HTTP/1.1 server bound to 127.0.0.1, and frontend/ is served
+from the same origin with frontend/http_api.js standing in for
+window.pywebview.api (every call is a POST to /api/<method>). The calls run on
+a thread pool, so a slow query does not hold the others up. Responses of the
+read-only methods are kept per dataset in an LRU cache, and identical requests
+in flight are computed once.
+
+There are no dialogs: the browser uploads the files it reads, exports are
+written under --salida and downloaded from /descargas. Uploaded workbooks are
+deleted once their load ends; exports are kept --conservar-dias days. Only
+loopback Host and Origin headers are accepted, so other machines and other web
+pages cannot drive the API. pywebview is never imported.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import mimetypes
+import multiprocessing
+import os
+import shutil
+import sys
+import threading
+import time
+import uuid
+import webbrowser
+import zipfile
+from base64 import b64decode
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from io import BytesIO
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from backend import Api, PDF_PREFIXES
+from batch_ingest import list_workbooks
+from export_history import default_history_path
+
+log = logging.getLogger(__name__)
+
+HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 4
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frontend')
+SHIM_TAG = '<script src="http_api.js"></script>'
+MAX_BODY = 512 * 1024 * 1024  # base64 uploads of large workbooks
+RESPONSE_CACHE_SIZE = 512
+LOCAL_HOSTS = ('127.0.0.1', 'localhost', '[::1]')
+# Read-only methods: their responses depend only on the arguments and ListadosServer._state()
+CACHED_METHODS = (
+    'get_current_dataset', 'get_records_by_date', 'get_records_by_title', 'get_records_by_expte',
+    'search_records', 'get_all_records', 'get_records_page', 'get_records_summary',
+)
+EXPOSED_METHODS = CACHED_METHODS + (
+    'read_file_from_memory', 'start_job', 'get_job', 'cancel_job',
+    'export_excel', 'export_pdf', 'export_pdf_continuous',
+    'merge_expedientes', 'assign_proveyentes', 'get_perf_stats',
+)
+EXPORT_KINDS = ('export_excel', 'export_pdf', 'export_pdf_continuous')
+EXPORT_ARGS = {'export_excel': 0, 'export_pdf': 2, 'export_pdf_continuous': 4}
+READ_KINDS = ('read_data', 'read_data_batch')
+FINISHED_STATES = ('done', 'error', 'cancelled')
+DEFAULT_RETENTION_DAYS = 7  # exports under --salida older than this are deleted
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 403: 'Forbidden', 404: 'Not Found',
+               405: 'Method Not Allowed', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def default_output_dir():
+    return os.path.join(os.path.dirname(default_history_path()), 'servidor')
+
+
+def _inside(path, directory):
+    path, directory = os.path.realpath(path), os.path.realpath(directory)
+    return os.path.commonpath([path, directory]) == directory
+
+
+def _is_local(netloc):
+    # Host header or Origin netloc, with or without port
+    host = netloc if netloc.endswith(']') else netloc.rsplit(':', 1)[0]
+    return host in LOCAL_HOSTS
+
+
+class ListadosServer:
+    def __init__(self, api, output_dir, workers=DEFAULT_WORKERS, retention_days=DEFAULT_RETENTION_DAYS):
+        self.api = api
+        self.output_dir = output_dir
+        self.upload_dir = os.path.join(output_dir, 'subidos')
+        self.retention_days = retention_days
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http")
+        self._cache = OrderedDict()  # (method, args, _state()) -> JSON bytes
+        self._pending = {}  # same key -> future of the call in progress
+        self._uploads = {}  # job_id of a read -> folder of its uploaded files
+        self._uploads_lock = threading.Lock()
+        # Uploads left by a previous run are not needed by anyone
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+        os.makedirs(self.upload_dir, exist_ok=True)
+        self._prune_exports()
+        # Delete each upload when its read job ends
+        self._notify = api.jobs.notify
+        api.jobs.notify = self._on_job_update
+
+    # ------------------------------------------------------------------ API
+
+    async def call(self, method, args):
+        """
+        JSON bytes of api.<method>(*args), from the response cache when possible.
+        """
+        if method not in EXPOSED_METHODS:
+            raise HttpError(404, f"Método desconocido: {method}")
+        if method not in CACHED_METHODS:
+            return await self._run(method, args)
+        key = (method, json.dumps(args, sort_keys=True), self._state())
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        if key not in self._pending:
+            self._pending[key] = asyncio.ensure_future(self._run(method, args))
+        try:
+            body = await asyncio.shield(self._pending[key])
+        finally:
+            self._pending.pop(key, None)
+        # A load or an export that finished meanwhile makes the response stale: don't keep it
+        if key[2] == self._state():
+            self._cache[key] = body
+            while len(self._cache) > RESPONSE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return body
+
+    def _state(self):
+        # What the cached responses depend on besides their arguments: the
+        # dataset, the split cursor and assigned rows, and today's date (day counts)
+        return self.api.dataset_id, self.api.last_split_index, self.api.export_version, date.today()
+
+    async def _run(self, method, args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, self._call_api, method, list(args))
+
+    def _call_api(self, method, args):
+        # On a worker thread: storing uploads, the call itself and the JSON encoding
+        args, kwargs, upload = self._with_paths(method, args)
+        result = None
+        try:
+            result = getattr(self.api, method)(*args, **kwargs)
+        finally:
+            if upload is not None:
+                self._track_upload(upload, result)
+        return json.dumps(result, default=str, ensure_ascii=False).encode('utf-8')
+
+    def _with_paths(self, method, args):
+        """
+        (args, kwargs, upload folder or None) for the Api call, with the paths
+        the desktop app would ask for in a dialog: uploaded files for reads,
+        --salida for exports. Paths sent by the client are ignored.
+        """
+        if method == 'start_job':
+            kind = args[0] if args else None
+            params = dict(args[1] or {}) if len(args) > 1 else {}
+            for key in ('file_path', 'paths', 'save_path'):
+                params.pop(key, None)
+            uploads = params.pop('uploads', None) or []
+            folder = None
+            if kind in READ_KINDS:
+                if not uploads:
+                    raise HttpError(400, "En modo servidor los archivos se suben desde el navegador")
+                folder, paths = self._store_uploads(uploads)
+                if kind == 'read_data':
+                    params['file_path'] = paths[0]
+                else:
+                    params['paths'] = paths
+            elif kind in EXPORT_KINDS:
+                params['save_path'] = self._output_path(kind, params.get('per_proveyente'))
+            return [kind, params], {}, folder
+        if method in EXPORT_KINDS:
+            # Arguments before save_path; per_proveyente is the last of them for the PDFs
+            args = args[:EXPORT_ARGS[method]]
+            per_proveyente = method != 'export_excel' and len(args) == EXPORT_ARGS[method] and bool(args[-1])
+            return args, {'save_path': self._output_path(method, per_proveyente)}, None
+        return args, {}, None
+
+    def _store_uploads(self, uploads):
+        # One folder per upload keeps the file names (they label the 'Archivo' column)
+        folder = os.path.join(self.upload_dir, uuid.uuid4().hex)
+        os.makedirs(folder)
+        paths = []
+        for upload in uploads:
+            path = os.path.join(folder, os.path.basename(upload.get('name') or 'forum.xlsx'))
+            with open(path, 'wb') as f:
+                f.write(b64decode(upload.get('content') or ''))
+            paths.append(path)
+        return folder, paths
+
+    def _track_upload(self, folder, started):
+        """
+        Delete the uploaded files once the read job started with them ends
+        (the parsed frame does not need them), or now if no job was started.
+        """
+        job_id = started.get('job_id') if isinstance(started, dict) else None
+        if job_id is None:
+            shutil.rmtree(folder, ignore_errors=True)
+            return
+        with self._uploads_lock:
+            self._uploads[job_id] = folder
+        job = self.api.jobs.get(job_id)
+        if job is None or job.finished is not None:
+            # It ended before the folder was registered
+            self._remove_upload(job_id)
+
+    def _on_job_update(self, update):
+        if self._notify is not None:
+            self._notify(update)
+        if update.get('state') in FINISHED_STATES:
+            self._remove_upload(update.get('job_id'))
+
+    def _remove_upload(self, job_id):
+        with self._uploads_lock:
+            folder = self._uploads.pop(job_id, None)
+        if folder is not None:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    def _prune_exports(self):
+        # Exports older than retention_days, files or per-proveyente folders
+        cutoff = time.time() - self.retention_days * 86400
+        for name in os.listdir(self.output_dir):
+            path = os.path.join(self.output_dir, name)
+            try:
+                if path == self.upload_dir or os.path.getmtime(path) >= cutoff:
+                    continue
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    os.remove(path)
+            except OSError:
+                pass  # removed meanwhile by another call
+
+    def _output_path(self, kind, per_proveyente=False):
+        # Same names as the desktop defaults, plus a suffix: several clerks export at once
+        self._prune_exports()
+        stamp = f"{datetime.now().strftime('%d-%m-%Y_%H-%Mhs')}_{uuid.uuid4().hex[:6]}"
+        if kind == 'export_excel':
+            return os.path.join(self.output_dir, f"listado_{stamp}.xlsx")
+        prefix = PDF_PREFIXES['repartidas' if kind == 'export_pdf' else 'continuas']
+        if per_proveyente:
+            folder = os.path.join(self.output_dir, f"{prefix}_{stamp}")
+            os.makedirs(folder)
+            return folder
+        return os.path.join(self.output_dir, f"{prefix}_{stamp}.pdf")
+
+    # ----------------------------------------------------------------- HTTP
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HttpError as e:
+                    # Malformed or too large: answer, then close (the body was not read)
+                    self._write(writer, e.status, 'application/json', self._error_payload(e), False, {})
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                try:
+                    status, content_type, payload, extra = await self._route(method, target, headers, body)
+                except HttpError as e:
+                    status, content_type, extra = e.status, 'application/json', {}
+                    payload = self._error_payload(e)
+                except Exception as e:
+                    log.exception("Error serving %s %s", method, target)
+                    status, content_type, extra = 500, 'application/json', {}
+                    payload = self._error_payload(e)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                self._write(writer, status, content_type, payload, keep_alive, extra)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _error_payload(error):
+        return json.dumps({"status": "error", "message": str(error)}, ensure_ascii=False).encode('utf-8')
+
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            raise HttpError(400, "Solicitud inválida")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get('content-length') or 0)
+        if length > MAX_BODY:
+            raise HttpError(413, "Archivo demasiado grande")
+        body = await reader.readexactly(length) if length else b''
+        return method, target, headers, body
+
+    @staticmethod
+    def _write(writer, status, content_type, payload, keep_alive, extra):
+        head = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+                f"Content-Type: {content_type}",
+                f"Content-Length: {len(payload)}",
+                "Cache-Control: no-store",
+                f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        head += [f"{name}: {value}" for name, value in extra.items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode('latin-1') + payload)
+
+    async def _route(self, method, target, headers, body):
+        # Another machine (DNS rebinding) or another web page must not reach the API
+        if not _is_local(headers.get('host', '')):
+            raise HttpError(403, "Solo se aceptan conexiones locales")
+        origin = headers.get('origin')
+        if origin and not _is_local(urlsplit(origin).netloc):
+            raise HttpError(403, "Origen no permitido")
+
+        url = urlsplit(target)
+        path = unquote(url.path)
+        if path.startswith('/api/'):
+            if method != 'POST':
+                raise HttpError(405, "Use POST")
+            if not headers.get('content-type', '').startswith('application/json'):
+                raise HttpError(400, "Se espera JSON")
+            try:
+                args = json.loads(body or b'{}').get('args') or []
+            except (ValueError, AttributeError):
+                raise HttpError(400, "JSON inválido")
+            return 200, 'application/json', await self.call(path[len('/api/'):], args), {}
+        if method != 'GET':
+            raise HttpError(405, "Use GET")
+        if path == '/descargas':
+            return await self._download(parse_qs(url.query).get('path', [''])[0])
+        return self._static(path)
+
+    def _static(self, path):
+        relative = path.lstrip('/') or 'index.html'
+        file_path = os.path.join(FRONTEND_DIR, relative)
+        if not _inside(file_path, FRONTEND_DIR) or not os.path.isfile(file_path):
+            raise HttpError(404, "No encontrado")
+        with open(file_path, 'rb') as f:
+            payload = f.read()
+        if relative == 'index.html':
+            # The HTTP stand-in for window.pywebview.api goes before app.js
+            payload = payload.replace(b'<script src="app.js"></script>',
+                                      SHIM_TAG.encode() + b'\n    <script src="app.js"></script>', 1)
+        content_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type.endswith('javascript'):
+            content_type += '; charset=utf-8'
+        return 200, content_type, payload, {}
+
+    async def _download(self, path):
+        """
+        An export written under --salida; a per-proveyente folder comes zipped.
+        """
+        # Only exports: the uploaded workbooks live under output_dir too
+        if (not path or not _inside(path, self.output_dir) or _inside(path, self.upload_dir)
+                or not os.path.exists(path)):
+            raise HttpError(404, "Archivo no encontrado")
+        name = os.path.basename(path.rstrip(os.sep))
+        loop = asyncio.get_running_loop()
+        if os.path.isdir(path):
+            payload = await loop.run_in_executor(self.pool, self._zip_folder, path)
+            name += '.zip'
+        else:
+            payload = await loop.run_in_executor(self.pool, lambda: open(path, 'rb').read())
+        content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        return 200, content_type, payload, {'Content-Disposition': f'attachment; filename="{name}"'}
+
+    @staticmethod
+    def _zip_folder(folder):
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for name in sorted(os.listdir(folder)):
+                zf.write(os.path.join(folder, name), name)
+        return buffer.getvalue()
+
+
+async def serve(server, port):
+    listener = await asyncio.start_server(server.handle, HOST, port)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python server.py",
+        description="Sirve el listado de escritos a los navegadores de este equipo, con un solo archivo cargado.",
+    )
+    parser.add_argument("inputs", nargs="*", metavar="ENTRADA", help="archivos Forum o carpetas a cargar al iniciar")
+    parser.add_argument("--puerto", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="consultas atendidas a la vez")
+    parser.add_argument("--salida", default=default_output_dir(), help="carpeta de las exportaciones y archivos subidos")
+    parser.add_argument("--conservar-dias", type=int, default=DEFAULT_RETENTION_DAYS,
+                        help="días que se conservan las exportaciones en --salida")
+    parser.add_argument("--abrir", action="store_true", help="abrir el navegador al iniciar")
+    parser.add_argument("-v", "--verbose", action="count", default=0)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level={0: logging.WARNING, 1: logging.INFO}.get(args.verbose, logging.DEBUG),
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    api = Api()
+    server = ListadosServer(api, os.path.abspath(args.salida), args.workers, args.conservar_dias)
+    if args.inputs:
+        paths = list_workbooks(args.inputs)
+        if not paths:
+            print("No se encontraron archivos .xlsx en las entradas indicadas.", file=sys.stderr)
+            return 2
+        loaded = api.read_data(paths[0]) if len(paths) == 1 else api.read_data_batch(paths)
+        if loaded.get("status") != "ok":
+            print(f"Error al leer: {loaded.get('message')}", file=sys.stderr)
+            return 1
+        print(f"{loaded['total_records']} escritos cargados de {len(paths)} archivo(s)")
+
+    url = f"http://{HOST}:{args.puerto}/"
+    print(f"Sirviendo en {url} (Ctrl+C para terminar)")
+    if args.abrir:
+        webbrowser.open(url)
+    try:
+        asyncio.run(serve(server, args.puerto))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        api.jobs.shutdown()
+        server.pool.shutdown(wait=False)
+    return 0
+
+
+if __name__ == "__main__":
+    # PDF and ingest worker processes re-run this module when frozen
+    multiprocessing.freeze_support()
+    sys.exit(main())
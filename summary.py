@@ -0,0 +1,180 @@
+"""
+Dashboard aggregation for a loaded Forum dataset.
+
+Everything the summary needs is derived from a handful of whole-column
+operations: Tipo and Título are dictionary-encoded (factorized) and classified
+once per distinct value instead of per row, and the per-day
+Escritos/Proyectos/Total table comes from a single groupby on the normalized
+Recibido date.
+
+SummaryCounts keeps these figures as counters and is the only implementation
+of the summary: summarize() counts a whole frame, and a newer export of the
+same backlog is applied as added/removed rows (see delta.py) instead of
+aggregating the whole frame again.
+"""
+import heapq
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+TOP_TITLES = 10
+
+
+def _contains(uniques, word):
+    # Same matching as Series.str.contains(word, case=False, na=False), per distinct value
+    return pd.Series(uniques, dtype=object).str.contains(word, case=False, na=False).to_numpy()
+
+
+def classify_tipo(tipo):
+    """
+    Return (is_escrito, is_proyecto) row flags for a Tipo column, with the same
+    "contains" semantics as before but evaluated once per distinct Tipo.
+    """
+    codes, uniques = pd.factorize(tipo, sort=False)
+    # Missing Tipo (-1) reads the trailing False
+    escrito = np.append(_contains(uniques, 'escrito'), False)
+    proyecto = np.append(_contains(uniques, 'proyecto'), False)
+    return escrito[codes], proyecto[codes]
+
+
+def format_days(recibido, fmt='%d/%m/%Y'):
+    """
+    Format the date part of a datetime column, calling strftime once per distinct day.
+    """
+    codes, days = pd.factorize(recibido.dt.normalize(), sort=False)
+    labels = np.append(np.asarray(days.strftime(fmt), dtype=object), np.nan)
+    return pd.Series(labels[codes], index=recibido.index, dtype=object)
+
+
+def summarize(df, today=None):
+    """
+    Compute the dashboard summary of a processed frame (Recibido as datetime64).
+    """
+    return SummaryCounts.from_frame(df).summary(df['Recibido'], today)
+
+
+def _summary(recibido, today, total_records, unique_exptes_count, presentaciones_count, proyectos_count,
+             transferencias_count, most_titles, presentaciones_by_date):
+    # Summary dict of SummaryCounts.summary; dates come from the Recibido column
+    oldest_record = recibido.min()
+    newest_record = recibido.max()
+    oldest_record_formatted = oldest_record.strftime("%d/%m/%Y") if pd.notna(oldest_record) else ""
+    newest_record_formatted = newest_record.strftime("%d/%m/%Y") if pd.notna(newest_record) else ""
+    days_difference = (today - oldest_record).days if pd.notna(oldest_record) else 0
+    today_formatted = today.strftime("%d/%m/%Y")
+    period = f"{oldest_record_formatted} a {today_formatted}" if oldest_record_formatted else ""
+
+    return {
+        "total_records": int(total_records),
+        "unique_exptes_count": int(unique_exptes_count),
+        "presentaciones_count": int(presentaciones_count),
+        "proyectos_count": int(proyectos_count),
+        "oldest_record": str(oldest_record_formatted),
+        "newest_record": str(newest_record_formatted),
+        "days_difference": int(days_difference),
+        "today_date": str(today_formatted),
+        "transferencias_count": int(transferencias_count),
+        "most_titles": most_titles,
+        "presentaciones_by_date": presentaciones_by_date,
+        "period": str(period),
+    }
+
+
+def _value_counts(values):
+    # (distinct values, counts) in first-seen order, also for category columns
+    codes, uniques = pd.factorize(values, sort=False)
+    return np.asarray(uniques, dtype=object), np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+
+def _add_counts(counter, counts, sign):
+    # counter += sign * counts, dropping keys that reach zero
+    for key, n in counts.items():
+        n = counter[key] + sign * int(n)
+        if n > 0:
+            counter[key] = n
+        else:
+            del counter[key]
+
+
+class SummaryCounts:
+    """
+    Counters behind the dashboard summary: rows, escritos, proyectos and
+    transferencias, plus per-day, per-Título and per-Expte counts. Rows are
+    added or removed by frame, at a cost proportional to the rows changed.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.escritos = 0
+        self.proyectos = 0
+        self.transferencias = 0
+        self.days = {'Escritos': Counter(), 'Proyectos': Counter(), 'Total': Counter()}
+        self.titles = Counter()
+        self.exptes = Counter()
+
+    @classmethod
+    def from_frame(cls, df):
+        counts = cls()
+        counts.add(df)
+        return counts
+
+    def copy(self):
+        other = SummaryCounts()
+        other.total, other.escritos, other.proyectos = self.total, self.escritos, self.proyectos
+        other.transferencias = self.transferencias
+        other.days = {name: counter.copy() for name, counter in self.days.items()}
+        other.titles = self.titles.copy()
+        other.exptes = self.exptes.copy()
+        return other
+
+    def add(self, df, sign=1):
+        """
+        Count the rows of df in (sign=1) or out (sign=-1).
+        """
+        if not len(df):
+            return
+        is_escrito, is_proyecto = classify_tipo(df['Tipo'])
+        self.total += sign * len(df)
+        self.escritos += sign * int(is_escrito.sum())
+        self.proyectos += sign * int(is_proyecto.sum())
+
+        flags = pd.DataFrame({
+            'day': df['Recibido'].dt.normalize(),
+            'Escritos': is_escrito.astype(np.int64),
+            'Proyectos': is_proyecto.astype(np.int64),
+            'Total': np.ones(len(df), dtype=np.int64),
+        })
+        by_day = flags.groupby('day', sort=False).sum()
+        for name, counter in self.days.items():
+            _add_counts(counter, by_day[name], sign)
+
+        titles, counts = _value_counts(df['Título'])
+        _add_counts(self.titles, dict(zip(titles, counts)), sign)
+        self.transferencias += sign * int(counts[_contains(titles, 'transferencia')].sum())
+        _add_counts(self.exptes, dict(zip(*_value_counts(df['Expte']))), sign)
+
+    def summary(self, recibido, today=None):
+        """
+        Dashboard summary of the frame these counters describe; `recibido` is
+        its Recibido column (for the oldest/newest dates).
+        """
+        presentaciones_by_date = [
+            {"Fecha": day.strftime('%d/%m/%Y'), "Escritos": self.days['Escritos'][day],
+             "Proyectos": self.days['Proyectos'][day], "Total": total}
+            for day, total in sorted(self.days['Total'].items())
+        ]
+        # Ties by título, so the ranking does not depend on row order
+        ranked = heapq.nsmallest(TOP_TITLES, self.titles.items(), key=lambda item: (-item[1], str(item[0])))
+        most_titles = [{"Título": str(t), "Cantidad": n} for t, n in ranked]
+        return _summary(
+            recibido, today or datetime.now(),
+            total_records=self.total,
+            unique_exptes_count=len(self.exptes),
+            presentaciones_count=self.escritos,
+            proyectos_count=self.proyectos,
+            transferencias_count=self.transferencias,
+            most_titles=most_titles,
+            presentaciones_by_date=presentaciones_by_date,
+        )
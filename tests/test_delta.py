@@ -0,0 +1,68 @@
+"""
+Incremental load: delta.diff_rows finds the rows proveídos and the new ones,
+and the summary patched with them equals the one of a full load.
+"""
+import pandas as pd
+import pytest
+
+from backend import Api, RAW_RECORD_FIELDS
+from benchmarks.synthetic import forum_rows
+from delta import diff_rows, row_keys
+from summary import summarize
+
+COLUMNS = ["Expte", "Título", "Tipo", "Apellido", "Recibido"]
+
+
+def frame(rows):
+    df = pd.DataFrame(rows, columns=COLUMNS)
+    df["Recibido"] = pd.to_datetime(df["Recibido"], format="%d/%m/%Y %H:%M:%S")
+    return df
+
+
+def next_day(n_rows=2000, removed=60, added=30):
+    rows = forum_rows(n_rows + added)
+    return frame(rows[:n_rows]), frame(rows[removed:n_rows + added])
+
+
+def test_diff_rows():
+    yesterday, today = next_day()
+    removed, added = diff_rows(row_keys(yesterday), row_keys(today))
+    assert removed.tolist() == list(range(60))
+    assert added.tolist() == list(range(len(today) - 30, len(today)))
+
+
+def test_identical_escritos_are_told_apart():
+    yesterday, _ = next_day()
+    today = pd.concat([yesterday, yesterday.iloc[[5]]], ignore_index=True)
+    removed, added = diff_rows(row_keys(yesterday), row_keys(today))
+    assert removed.tolist() == [] and added.tolist() == [len(yesterday)]
+
+
+def test_little_overlap_or_reordered_rows_need_a_full_load():
+    yesterday, today = next_day()
+    assert diff_rows(row_keys(yesterday), row_keys(frame(forum_rows(2000, seed=9)))) is None
+    assert diff_rows(row_keys(yesterday), row_keys(yesterday.iloc[::-1])) is None
+
+
+@pytest.fixture
+def api():
+    api = Api()
+    api.dataset_cache = None
+    api.export_history = None
+    return api
+
+
+def test_delta_summary_matches_full_load(api):
+    yesterday, today = next_day()
+    api._process_dataframe(yesterday, parsed=True)
+    base_id = api.dataset_id
+    result = api._process_dataframe(today.copy(), parsed=True)
+    delta = result["delta"]
+    assert delta is not None and delta["base_dataset_id"] == base_id
+    assert len(delta["removed"]) == 60 and len(delta["added"]) == 30
+    expected = summarize(api.data)
+    assert {key: result[key] for key in expected} == expected
+    # The added records are those of the new frame at their positions
+    positions = [position for position, _ in delta["added"]]
+    assert [record for _, record in delta["added"]] == api._project_records(
+        api.data.iloc[positions], RAW_RECORD_FIELDS)
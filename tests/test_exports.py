@@ -0,0 +1,55 @@
+"""
+Export cursor: a repartidas export always takes the first listados, so it can
+be repeated (also in a later session over the same history); continuous
+exports go on from its cursor and skip what they already assigned.
+"""
+import pytest
+
+from backend import Api
+from benchmarks.bench_records import make_frame
+from export_history import ExportHistory
+
+
+def load(history_path, n_rows=600):
+    api = Api()
+    api.dataset_cache = None
+    api.export_history = ExportHistory(str(history_path))
+    df = make_frame(n_rows).dropna(subset=['Recibido']).reset_index(drop=True)
+    df.attrs['file_key'] = 'forum-test'
+    assert api._process_dataframe(df, parsed=True)['status'] == 'ok'
+    return api
+
+
+@pytest.fixture
+def history(tmp_path):
+    return tmp_path / 'historial.sqlite'
+
+
+def test_repartidas_can_be_repeated(tmp_path, history):
+    api = load(history)
+    first = api.export_pdf(3, save_path=str(tmp_path / 'a.pdf'))
+    second = api.export_pdf(3, save_path=str(tmp_path / 'b.pdf'))
+    assert first['status'] == second['status'] == 'ok'
+    assert first['last_index'] == second['last_index'] == 45
+    # A wrong n_proveyentes is corrected by exporting again
+    assert api.export_pdf(5, save_path=str(tmp_path / 'c.pdf'))['last_index'] == 75
+    assert api.export_pdf(2, save_path=str(tmp_path / 'd.pdf'))['last_index'] == 30
+    assert not api._assigned.any()
+
+    # Nothing stays assigned for the next session either
+    again = load(history)
+    assert again.last_split_index == 30
+    assert again.export_pdf(3, save_path=str(tmp_path / 'e.pdf'))['last_index'] == 45
+
+
+def test_continuous_goes_on_after_repartidas(tmp_path, history):
+    api = load(history)
+    api.export_pdf(2, save_path=str(tmp_path / 'a.pdf'))
+    first = api.export_pdf_continuous('2025-01-01', 2, save_path=str(tmp_path / 'b.pdf'))
+    assert first['status'] == 'ok' and first['last_index'] == 60
+    second = api.export_pdf_continuous('2025-01-01', 2, save_path=str(tmp_path / 'c.pdf'))
+    assert second['last_index'] == 90
+
+    resumed = load(history)
+    assert resumed.last_split_index == 90
+    assert int(resumed._assigned.sum()) == 60
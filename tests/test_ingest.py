@@ -0,0 +1,70 @@
+"""
+Ingest: the streaming Forum reader must give the frame pandas.read_excel gave,
+and parse_dates the Recibido values of the previous to_datetime + per-row
+fallback. The references are the previous implementations kept in benchmarks/.
+"""
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from benchmarks.bench_dates import _legacy_parse
+from benchmarks.synthetic import HEADER, forum_rows, write_forum_workbook
+from ingest import frame_from_batches, iter_forum_batches, parse_dates, read_forum_excel
+
+
+def irregular_rows():
+    # Empty cells, a numeric Expte and a real Excel date among the text ones
+    rows = forum_rows(300, seed=4)
+    rows[3][1] = None
+    rows[5][0] = 12345
+    rows[7][3] = None
+    rows[9][4] = datetime(2025, 3, 4, 10, 30)
+    return rows
+
+
+@pytest.fixture(params=["synthetic", "irregular"])
+def rows(request):
+    return forum_rows(500) if request.param == "synthetic" else irregular_rows()
+
+
+def test_streaming_matches_read_excel(tmp_path, rows):
+    path = write_forum_workbook(str(tmp_path / "forum.xlsx"), 0, rows=rows)
+    expected = pd.read_excel(path, skiprows=8, engine="openpyxl")
+    pd.testing.assert_frame_equal(read_forum_excel(path), expected, check_dtype=False)
+
+
+def test_streaming_without_preamble(tmp_path, rows):
+    # The header is detected in the same pass, no second parse
+    path = write_forum_workbook(str(tmp_path / "forum.xlsx"), 0, preamble=False, rows=rows)
+    expected = pd.read_excel(path, engine="openpyxl")
+    pd.testing.assert_frame_equal(read_forum_excel(path), expected, check_dtype=False)
+
+
+def test_batches_join_to_the_whole_sheet(tmp_path):
+    path = write_forum_workbook(str(tmp_path / "forum.xlsx"), 1000)
+    batches = list(iter_forum_batches(path, batch_size=64))
+    assert len(batches) > 1
+    frame = frame_from_batches(batches)
+    assert list(frame.columns) == HEADER
+    pd.testing.assert_frame_equal(frame, read_forum_excel(path))
+
+
+def recibido_columns():
+    clean = pd.Series([row[4] for row in forum_rows(2000)], dtype=object)
+    dirty = clean.copy()
+    dirty.iloc[1000] = "sin dato"
+    mixed = clean.copy()
+    mixed.iloc[::10] = mixed.iloc[::10].str.slice(0, 10)  # some dd/mm/YYYY without time
+    missing = clean.copy()
+    missing.iloc[::7] = None
+    return {"clean": clean, "one bad cell": dirty, "mixed formats": mixed, "missing": missing}
+
+
+@pytest.mark.parametrize("name", list(recibido_columns()))
+def test_parse_dates_matches_previous_parse(name):
+    values = recibido_columns()[name]
+    parsed, counts = parse_dates(values)
+    expected = _legacy_parse(values)
+    pd.testing.assert_series_equal(parsed, expected, check_names=False, check_dtype=False)
+    assert sum(counts.values()) == len(values)
@@ -0,0 +1,32 @@
+"""
+Merging escritos by expediente: merge_records and the vectorized
+merge_listados must give the rows of the previous merge_expedientes, for the
+whole table (repartidas) and per listado of 15 (continuas).
+"""
+import pandas as pd
+import pytest
+
+from benchmarks.bench_merge import _chunks, _legacy_merge
+from benchmarks.synthetic import forum_rows
+from listados import build_listados, listado_rows, merge_listados, merge_records, split_listados
+
+
+@pytest.fixture(scope="module", params=[200, 3000])
+def table(request):
+    # Zipf-skewed: a few expedientes carry many escritos and hit the título limit
+    df = pd.DataFrame(forum_rows(request.param), columns=["Expte", "Título", "Tipo", "Apellido", "Recibido"])
+    df["Recibido"] = pd.to_datetime(df["Recibido"], format="%d/%m/%Y %H:%M:%S")
+    return build_listados(df)
+
+
+def test_merge_whole_table(table):
+    expected = _legacy_merge(listado_rows(table))
+    assert merge_records(listado_rows(table))[0] == expected
+    assert [list(row) for row in listado_rows(merge_listados(table))] == expected
+
+
+def test_merge_per_listado(table):
+    expected = [_legacy_merge(group) for group in _chunks(listado_rows(table))]
+    assert [merge_records(group)[0] for group in _chunks(listado_rows(table))] == expected
+    groups = split_listados(merge_listados(table, 15))
+    assert [[list(row) for row in group] for group in groups] == expected
@@ -0,0 +1,66 @@
+"""
+Drill-down lookups (get_records_by_*, search_records, get_all_records) while
+the server's threads load other files: every answer comes from one dataset.
+"""
+import threading
+
+from backend import Api
+from benchmarks.bench_records import make_frame
+
+
+def loaded(df):
+    api = Api()
+    api.dataset_cache = None
+    api.export_history = None
+    api.incremental_load = False
+    assert api._process_dataframe(df.copy(), parsed=True)['status'] == 'ok'
+    return api
+
+
+def test_cached_records_follow_the_loaded_dataset():
+    first, second = make_frame(300, seed=1), make_frame(200, seed=2)
+    api = loaded(first)
+    title = str(first['Título'].dropna().iloc[0])
+    before = api.get_records_by_title(title)['count']
+    api._process_dataframe(second.copy(), parsed=True)
+    assert api.get_records_by_title(title)['count'] == int((second['Título'] == title).sum())
+    assert before == int((first['Título'] == title).sum())
+
+
+def test_lookups_during_loads():
+    frames = [make_frame(400, seed=seed) for seed in range(3)]
+    api = loaded(frames[0])
+    title = str(frames[0]['Título'].dropna().iloc[0])
+    errors = []
+
+    def reload():
+        for i in range(6):
+            api._process_dataframe(frames[i % 3].copy(), parsed=True)
+
+    def drill_down():
+        for _ in range(40):
+            for result in (api.get_records_by_title(title), api.search_records('solicita', limit=20),
+                           api.get_all_records(limit=50, sort_by='expte')):
+                if result['status'] != 'ok':
+                    errors.append(result['message'])
+            by_title = api.get_records_by_title(title)
+            if any(record['titulo'] != title for record in by_title['records']):
+                errors.append('records of another title')
+
+    threads = [threading.Thread(target=reload)] + [threading.Thread(target=drill_down) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def test_expte_found_as_the_records_show_it():
+    df = make_frame(300, seed=3)  # a few numeric 12345 exptes among the text ones
+    df.loc[:4, 'Expte'] = ['12345', 12345, 12345, '100/2024', 100]
+    api = loaded(df)
+    numeric = api.get_records_by_expte(12345)
+    text = api.get_records_by_expte('12345')
+    assert text['count'] == numeric['count'] == int((df['Expte'].astype(str) == '12345').sum())
+    assert {record['expte'] for record in text['records']} == {'12345'}
+    assert api.get_records_by_expte('100')['count'] == int((df['Expte'].astype(str) == '100').sum())
@@ -0,0 +1,131 @@
+"""
+Record serialization: Api._project_records must produce byte for byte the
+JSON of the iterrows() loops it replaced, frozen below as the reference.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend import Api, RAW_RECORD_FIELDS
+from benchmarks.bench_records import make_frame
+
+
+def legacy_raw_records(data):
+    data = with_date_str(data)
+    raw_records = []
+    for _, row in data.iterrows():
+        recibido_val = row.get('Recibido')
+        if pd.notna(recibido_val):
+            if isinstance(recibido_val, pd.Timestamp):
+                recibido_str = recibido_val.strftime('%Y-%m-%d %H:%M:%S')
+            else:
+                recibido_str = str(recibido_val)
+        else:
+            recibido_str = None
+        raw_records.append({
+            "expte": str(row.get('Expte', 'N/A')),
+            "titulo": str(row.get('Título', 'N/A')),
+            "tipo": str(row.get('Tipo', 'N/A')),
+            "presentante": str(row.get('Apellido', 'N/A')),
+            "fecha": str(row.get('Recibido_date_str', 'N/A')) if 'Recibido_date_str' in row and pd.notna(row.get('Recibido_date_str')) else 'N/A',
+            "recibido": recibido_str
+        })
+    return raw_records
+
+
+def legacy_records(filtered):
+    filtered = with_date_str(filtered)
+    records = []
+    for _, row in filtered.iterrows():
+        tipo = str(row.get('Tipo', 'N/A'))
+        is_escrito = 'escrito' in tipo.lower() if tipo != 'N/A' else False
+        records.append({
+            "expte": str(row.get('Expte', 'N/A')),
+            "titulo": str(row.get('Título', 'N/A')),
+            "tipo": tipo,
+            "tipo_class": "escrito" if is_escrito else "proyecto",
+            "presentante": str(row.get('Apellido', 'N/A')),
+            "fecha": str(row.get('Recibido_date_str', 'N/A'))
+        })
+    return records
+
+
+def with_date_str(data):
+    # The old loader stored the day label as a column, derived from Recibido
+    if 'Recibido' not in data.columns:
+        return data
+    data = data.copy()
+    data['Recibido_date_str'] = data['Recibido'].dt.strftime('%d/%m/%Y')
+    return data
+
+
+def small_frame():
+    return pd.DataFrame({
+        "Expte": ["100/2024", np.nan, "100/2024", "7"],
+        "Título": ["Solicita audiencia", "Acompaña documental", np.nan, "Transferencia"],
+        "Tipo": ["Escrito", "Proyecto", "ESCRITO electrónico", np.nan],
+        "Apellido": ["Gómez", np.nan, "Pérez", "Núñez"],
+        "Recibido": pd.to_datetime(["02/01/2025 10:30:00", "02/01/2025 00:00:00", None, "31/12/2024 23:59:59"],
+                                   format="%d/%m/%Y %H:%M:%S"),
+    })
+
+
+def numeric_expte_frame():
+    df = small_frame()
+    df["Expte"] = [12345, 678, 12345, 9]
+    return df
+
+
+def float_expte_frame():
+    df = small_frame()
+    df["Expte"] = [12345.0, np.nan, 12345.0, 9.0]
+    return df
+
+
+FRAMES = {
+    "synthetic": lambda: make_frame(2000),
+    "nan": small_frame,
+    "numeric expte": numeric_expte_frame,
+    "float expte": float_expte_frame,
+    "all dates missing": lambda: small_frame().assign(Recibido=pd.NaT),
+    "empty": lambda: small_frame().iloc[:0],
+}
+MISSING = [None, "Expte", "Título", "Tipo", "Apellido", "Recibido"]
+
+
+def dumps(records):
+    return json.dumps(records, ensure_ascii=False)
+
+
+@pytest.fixture(scope="module")
+def api():
+    return Api()
+
+
+@pytest.mark.parametrize("missing", MISSING)
+@pytest.mark.parametrize("name", FRAMES)
+def test_records_match_iterrows(api, name, missing):
+    df = FRAMES[name]()
+    if missing:
+        df = df.drop(columns=missing)
+    assert dumps(api._project_records(df)) == dumps(legacy_records(df))
+
+
+@pytest.mark.parametrize("missing", MISSING)
+@pytest.mark.parametrize("name", FRAMES)
+def test_raw_records_match_iterrows(api, name, missing):
+    df = FRAMES[name]()
+    if missing:
+        df = df.drop(columns=missing)
+    assert dumps(api._project_records(df, RAW_RECORD_FIELDS)) == dumps(legacy_raw_records(df))
+
+
+@pytest.mark.parametrize("name", FRAMES)
+def test_compacted_frame_matches_iterrows(api, name):
+    # The loaded dataset keeps its text columns as categories
+    df = FRAMES[name]()
+    compact = Api._compact(df)
+    assert dumps(api._project_records(compact)) == dumps(legacy_records(df))
+    assert dumps(api._project_records(compact, RAW_RECORD_FIELDS)) == dumps(legacy_raw_records(df))